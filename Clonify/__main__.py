@@ -7,10 +7,18 @@ from pytgcalls.exceptions import NoActiveGroupCall
 
 import config
 from Clonify import LOGGER, app, userbot
+from Clonify.core.broadcast import broadcast_dispatcher, register_broadcast_client
 from Clonify.core.call import PRO
+from Clonify.core.clones import stop_clones, supervise_clones, sync_clones
+from Clonify.core.leader import node_job, stop_jobs
 from Clonify.misc import sudo
 from Clonify.plugins import ALL_MODULES
 from Clonify.utils.database import get_banned_users, get_gbanned
+from Clonify.utils.database.clonedb import load_clonebots, sync_clonebots
+from Clonify.utils.database.flags import load_flags, sync_flags
+from Clonify.utils.database.indexes import ensure_indexes
+from Clonify.utils.database.stats import flush_stats, stats_flusher
+from Clonify.utils.database.writebehind import flush_all, write_behind_flusher
 from config import BANNED_USERS
 from Clonify.plugins.tools.clone import restart_bots
 
@@ -29,7 +37,16 @@ async def init():
             BANNED_USERS.add(user_id)
     except:
         pass
+    await ensure_indexes()
+    await load_flags()
+    node_job("flags_sync", sync_flags)
+    await load_clonebots()
+    node_job("clone_registry_sync", sync_clonebots)
+    node_job("served_write_behind", write_behind_flusher)
+    node_job("stats_flush", stats_flusher)
     await app.start()
+    register_broadcast_client(0, app)
+    node_job("broadcast_dispatch", broadcast_dispatcher)
     for all_module in ALL_MODULES:
         importlib.import_module("Clonify.plugins" + all_module)
     LOGGER("Clonify.plugins").info("𝐀𝐥𝐥 𝐅𝐞𝐚𝐭𝐮𝐫𝐞𝐬 𝐋𝐨𝐚𝐝𝐞𝐝 𝐁𝐚𝐛𝐲🥳...")
@@ -45,11 +62,17 @@ async def init():
     except:
         pass
     await PRO.decorators()
-    await restart_bots()
+    node_job("clone_launcher", restart_bots)
+    node_job("clone_sync", sync_clones)
+    node_job("clone_supervisor", supervise_clones)
     LOGGER("Clonify").info(
         "╔═════ஜ۩۞۩ஜ════╗\n  ☠︎︎𝗠𝗔𝗗𝗘 𝗕𝗬 𝗡𝗢𝗕𝗜𝗧𝗔☠︎︎\n╚═════ஜ۩۞۩ஜ════╝"
     )
     await idle()
+    await stop_jobs()
+    await stop_clones()
+    await flush_all()
+    await flush_stats()
     await app.stop()
     await userbot.stop()
     LOGGER("Clonify").info("𝗦𝗧𝗢𝗣 𝗠𝗨𝗦𝗜𝗖🎻 𝗕𝗢𝗧..")
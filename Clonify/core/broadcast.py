@@ -0,0 +1,452 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pyrogram.errors import (
+    BadRequest,
+    ChannelPrivate,
+    ChatIdInvalid,
+    FloodWait,
+    Forbidden,
+    InputUserDeactivated,
+    UserDeactivated,
+    UserIsBlocked,
+)
+
+import config
+from Clonify.utils.database import delete_served, get_lang, get_served_batch
+from strings import get_string
+
+from ..logging import LOGGER
+from .leader import singleton_job, stop_job
+from .mongo import mongodb
+from .quotas import clone_quota
+
+broadcastdb = mongodb.broadcasts
+
+BATCH_SIZE = 100
+POLL_INTERVAL = 10
+PROGRESS_INTERVAL = 15
+# seconds between two broadcast messages to the same chat
+PER_CHAT_INTERVAL = 3
+RECENT_LIMIT = 10000
+MAX_ATTEMPTS = 3
+
+# recipients that will never accept a message again, pruned from served lists
+CHAT_GONE_ERRORS = (ChannelPrivate, ChatIdInvalid)
+DEAD_ERRORS = CHAT_GONE_ERRORS + (
+    InputUserDeactivated,
+    UserDeactivated,
+    UserIsBlocked,
+)
+
+ACTION_NAMES = {
+    "message": "ʙʀᴏᴀᴅᴄᴀsᴛ",
+    "ban": "ɢʟᴏʙᴀʟ ʙᴀɴ",
+    "unban": "ɢʟᴏʙᴀʟ ᴜɴʙᴀɴ",
+}
+
+# status -> statuses a job may be moved to it from
+TRANSITIONS = {
+    "paused": ["running"],
+    "running": ["paused"],
+    "cancelled": ["running", "paused"],
+}
+
+# bot_id -> client that sends that bot's broadcasts on this node, 0 is the main bot
+clients = {}
+# bot_id -> RateLimiter shared by all broadcasts of that bot
+limiters = {}
+
+
+class RateLimiter:
+    """Token bucket with a FloodWait pause and a per-chat spacing."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.resume_at = 0.0
+        self.lock = asyncio.Lock()
+        self.recent = OrderedDict()
+
+    def pause(self, seconds: float):
+        self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+    async def acquire(self, chat_id: int):
+        last = self.recent.get(chat_id)
+        if last is not None:
+            wait = last + PER_CHAT_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                wait = self.resume_at - now
+                if wait <= 0:
+                    self.tokens = min(
+                        self.rate, self.tokens + (now - self.updated) * self.rate
+                    )
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    wait = (1 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+        self.recent[chat_id] = time.monotonic()
+        self.recent.move_to_end(chat_id)
+        while len(self.recent) > RECENT_LIMIT:
+            self.recent.popitem(last=False)
+
+
+def register_broadcast_client(bot_id: int, client):
+    clients[bot_id] = client
+
+
+def unregister_broadcast_client(bot_id: int):
+    """Stop sending for a bot this node no longer runs; its jobs stay running
+    in Mongo for whichever node serves it next."""
+    clients.pop(bot_id, None)
+    limiters.pop(bot_id, None)
+
+
+def _schedule(job_id):
+    return singleton_job(f"broadcast:{job_id}", lambda: run_broadcast(job_id))
+
+
+async def start_broadcast(
+    client,
+    bot_id: int,
+    kinds: list,
+    report,
+    text: str = None,
+    from_chat_id: int = None,
+    message_id: int = None,
+    pin: str = None,
+):
+    """Persist a broadcast job and start sending it.
+
+    ``kinds`` is any of ``"chats"``/``"users"`` in sending order, ``report`` is
+    the message that gets edited with progress, and ``pin`` is ``None``,
+    ``"silent"`` or ``"loud"``.
+    """
+    return await _create_job(
+        client,
+        bot_id,
+        kinds,
+        report,
+        action="message",
+        text=text,
+        from_chat_id=from_chat_id,
+        message_id=message_id,
+        pin=pin,
+    )
+
+
+async def start_gban(client, user_id: int, report, unban: bool = False, **meta):
+    """Ban or unban ``user_id`` in every served chat of the main bot.
+
+    ``meta`` is kept on the job for the final report.
+    """
+    return await _create_job(
+        client,
+        0,
+        ["chats"],
+        report,
+        action="unban" if unban else "ban",
+        user_id=user_id,
+        meta=meta,
+    )
+
+
+async def _create_job(client, bot_id: int, kinds: list, report, **fields):
+    clients[bot_id] = client
+    now = datetime.utcnow()
+    job = {
+        "bot_id": bot_id,
+        "status": "running",
+        "kinds": kinds,
+        "phase": 0,
+        "cursor": None,
+        "pin": None,
+        "report_chat": report.chat.id,
+        "report_message": report.id,
+        "sent": {kind: 0 for kind in kinds},
+        "pinned": 0,
+        "failed": 0,
+        "pruned": 0,
+        "retry": [],
+        "retried": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+    job.update(fields)
+    result = await broadcastdb.insert_one(job)
+    _schedule(result.inserted_id)
+    return result.inserted_id
+
+
+async def set_broadcast_status(
+    bot_id: int, status: str, job_id: str = None, actions: tuple = ("message",)
+):
+    """Move the newest matching job of ``bot_id`` to ``status``, or return None.
+
+    Only jobs whose action is in ``actions`` match, so a broadcast command never
+    pauses a global ban and the other way round.
+    """
+    query = {
+        "bot_id": bot_id,
+        "status": {"$in": TRANSITIONS[status]},
+        "action": {"$in": list(actions)},
+    }
+    if job_id:
+        try:
+            query["_id"] = ObjectId(job_id)
+        except InvalidId:
+            return None
+    job = await broadcastdb.find_one_and_update(
+        query,
+        {"$set": {"status": status, "updated_at": datetime.utcnow()}},
+        sort=[("_id", -1)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if job and status == "running":
+        _schedule(job["_id"])
+    return job
+
+
+def progress_text(job: dict) -> str:
+    name = ACTION_NAMES[job.get("action", "message")]
+    text = f"» {name} <code>{job['_id']}</code> : {job['status']}\n"
+    if "chats" in job["sent"]:
+        text += f"\nᴄʜᴀᴛs : {job['sent']['chats']}"
+    if "users" in job["sent"]:
+        text += f"\nᴜsᴇʀs : {job['sent']['users']}"
+    if job["pin"]:
+        text += f"\nᴘɪɴs : {job['pinned']}"
+    text += f"\nғᴀɪʟᴇᴅ : {job['failed']}"
+    if job["pruned"]:
+        text += f"\nʀᴇᴍᴏᴠᴇᴅ : {job['pruned']}"
+    return text
+
+
+async def _report(client, job: dict):
+    try:
+        await client.edit_message_text(
+            job["report_chat"], job["report_message"], progress_text(job)
+        )
+    except Exception:
+        pass
+
+
+async def _deliver(client, job: dict, target: int):
+    action = job.get("action", "message")
+    if action == "ban":
+        return await client.ban_chat_member(target, job["user_id"])
+    if action == "unban":
+        return await client.unban_chat_member(target, job["user_id"])
+    if job["message_id"]:
+        return await client.forward_messages(
+            target, job["from_chat_id"], job["message_id"]
+        )
+    return await client.send_message(target, text=job["text"])
+
+
+async def _send(client, limiter, semaphore, job: dict, kind: str, target: int) -> str:
+    """Deliver ``job`` to one target and classify the outcome.
+
+    ``"retry"`` marks errors that may pass on a later attempt, they get one
+    more try once every phase is done.
+    """
+    # a deactivated user in a ban job is the banned user, not the recipient
+    if job.get("action", "message") == "message":
+        dead = DEAD_ERRORS
+    else:
+        dead = CHAT_GONE_ERRORS
+    async with semaphore:
+        for _ in range(MAX_ATTEMPTS):
+            await limiter.acquire(target)
+            try:
+                m = await _deliver(client, job, target)
+            except FloodWait as fw:
+                limiter.pause(int(fw.value))
+                continue
+            except dead:
+                try:
+                    await delete_served(kind, target, job["bot_id"])
+                except Exception:
+                    pass
+                return "dead"
+            except (BadRequest, Forbidden):
+                return "failed"
+            except Exception:
+                return "retry"
+            if job["pin"] and kind == "chats":
+                try:
+                    await m.pin(disable_notification=job["pin"] != "loud")
+                    return "pinned"
+                except Exception:
+                    pass
+            return "sent"
+        return "retry"
+
+
+def _tally(kind: str, results: list, retrying: bool = False) -> dict:
+    failed = results.count("failed")
+    if retrying:
+        failed += results.count("retry")
+    return {
+        f"sent.{kind}": results.count("sent") + results.count("pinned"),
+        "pinned": results.count("pinned"),
+        "failed": failed,
+        "pruned": results.count("dead"),
+    }
+
+
+async def _finish(client, job: dict):
+    job = await broadcastdb.find_one_and_update(
+        {"_id": job["_id"]},
+        {"$set": {"status": "done", "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    await _report(client, job)
+    try:
+        _ = get_string(await get_lang(job["report_chat"]))
+    except Exception:
+        _ = get_string("en")
+    action = job.get("action", "message")
+    try:
+        if action == "ban":
+            meta = job["meta"]
+            await client.send_message(
+                job["report_chat"],
+                _["gban_6"].format(
+                    meta["bot"],
+                    meta["chat_title"],
+                    meta["chat_id"],
+                    meta["user"],
+                    job["user_id"],
+                    meta["by"],
+                    job["sent"]["chats"],
+                ),
+            )
+        elif action == "unban":
+            await client.send_message(
+                job["report_chat"],
+                _["gban_9"].format(job["meta"]["user"], job["sent"]["chats"]),
+            )
+        elif "chats" in job["kinds"]:
+            await client.send_message(
+                job["report_chat"],
+                _["broad_3"].format(job["sent"]["chats"], job["pinned"]),
+            )
+        if action == "message" and "users" in job["kinds"]:
+            await client.send_message(
+                job["report_chat"], _["broad_4"].format(job["sent"]["users"])
+            )
+    except Exception:
+        pass
+
+
+async def _run(job_id):
+    job = await broadcastdb.find_one({"_id": job_id})
+    client = clients.get(job["bot_id"]) if job else None
+    if client is None:
+        return
+    limiter = limiters.get(job["bot_id"])
+    if limiter is None:
+        limiter = limiters[job["bot_id"]] = RateLimiter(config.BROADCAST_RATE)
+    if job["bot_id"]:
+        limiter.rate = clone_quota(job["bot_id"])["broadcast_rate"]
+    semaphore = asyncio.Semaphore(config.BROADCAST_CONCURRENCY)
+    # show the job id right away, it is what the control commands take
+    await _report(client, job)
+    reported = time.monotonic()
+    while job and job["status"] == "running":
+        if clients.get(job["bot_id"]) is not client:
+            # the bot was stopped or moved to another node, leave the job to it
+            return
+        if job["phase"] >= len(job["kinds"]):
+            if job["retry"] and not job["retried"]:
+                job = await _retry_pass(client, limiter, semaphore, job)
+                continue
+            return await _finish(client, job)
+        kind = job["kinds"][job["phase"]]
+        batch = await get_served_batch(kind, job["bot_id"], job["cursor"], BATCH_SIZE)
+        if not batch:
+            job = await broadcastdb.find_one_and_update(
+                {"_id": job_id},
+                {"$inc": {"phase": 1}, "$set": {"cursor": None}},
+                return_document=ReturnDocument.AFTER,
+            )
+            continue
+        results = await asyncio.gather(
+            *(_send(client, limiter, semaphore, job, kind, t) for t in batch)
+        )
+        retry = [
+            {"kind": kind, "id": t} for t, r in zip(batch, results) if r == "retry"
+        ]
+        # checkpoint only after the whole batch, a crash resends at most one batch
+        job = await broadcastdb.find_one_and_update(
+            {"_id": job_id},
+            {
+                "$set": {"cursor": batch[-1], "updated_at": datetime.utcnow()},
+                "$inc": _tally(kind, results),
+                "$push": {"retry": {"$each": retry}},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if time.monotonic() - reported >= PROGRESS_INTERVAL:
+            reported = time.monotonic()
+            await _report(client, job)
+    if job:
+        await _report(client, job)
+
+
+async def _retry_pass(client, limiter, semaphore, job: dict) -> dict:
+    results = await asyncio.gather(
+        *(
+            _send(client, limiter, semaphore, job, item["kind"], item["id"])
+            for item in job["retry"]
+        )
+    )
+    inc = {}
+    for kind in job["kinds"]:
+        done = [r for item, r in zip(job["retry"], results) if item["kind"] == kind]
+        for key, value in _tally(kind, done, retrying=True).items():
+            inc[key] = inc.get(key, 0) + value
+    return await broadcastdb.find_one_and_update(
+        {"_id": job["_id"]},
+        {
+            "$set": {"retry": [], "retried": True, "updated_at": datetime.utcnow()},
+            "$inc": inc,
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def run_broadcast(job_id):
+    try:
+        await _run(job_id)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        LOGGER(__name__).warning(f"Broadcast {job_id} stopped: {e}")
+    finally:
+        # the dispatcher picks the job up again if it is still running
+        asyncio.create_task(stop_job(f"broadcast:{job_id}"))
+
+
+async def broadcast_dispatcher():
+    """Claim running jobs whose bot is served by this node, e.g. after a restart."""
+    while not await asyncio.sleep(POLL_INTERVAL):
+        try:
+            async for job in broadcastdb.find({"status": "running"}, {"bot_id": 1}):
+                if job["bot_id"] in clients:
+                    _schedule(job["_id"])
+        except Exception as e:
+            LOGGER(__name__).warning(f"Broadcast dispatch failed: {e}")
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+import config
+
+# namespace -> cache, read by /cachestats
+CACHES = {}
+
+
+class AsyncTTLCache:
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = config.CACHE_MAXSIZE,
+        ttl: float = config.CACHE_TTL,
+    ):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.inflight = {}
+        self.hits = 0
+        self.misses = 0
+        CACHES[namespace] = self
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key) -> bool:
+        entry = self.data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def peek(self, key, default=None):
+        entry = self.data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key, value):
+        self.data[key] = (time.monotonic() + self.ttl, value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.data.clear()
+        else:
+            self.data.pop(key, None)
+
+    async def get(self, key, loader):
+        """Return the cached value for ``key``, loading it once on a miss.
+
+        ``None`` and other falsy results are cached like any other value, and
+        concurrent misses on the same key share a single ``loader`` call.
+        """
+        entry = self.data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            self.data.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader(key))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        value = await asyncio.shield(task)
+        if key not in self:
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+def cache_stats() -> dict:
+    return {name: cache.stats() for name, cache in CACHES.items()}
@@ -22,6 +22,7 @@ from Clonify.misc import db
 from Clonify.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    get_assistant_number,
     get_lang,
     get_loop,
     group_assistant,
@@ -34,9 +35,10 @@ from Clonify.utils.database import (
 from Clonify.utils.exceptions import AssistantErr
 from Clonify.utils.formatters import check_duration, seconds_to_min, speed_converter
 from Clonify.utils.inline.play import stream_markup
+from Clonify.utils.mediacache import send_photo
 from Clonify.utils.stream.autoclear import auto_clean
 from strings import get_string
-from Clonify.utils.thumbnails import get_thumb
+from Clonify.utils.thumbcache import get_card
 
 autoend = {}
 counter = {}
@@ -227,6 +229,7 @@ class Call(PyTgCalls):
         link,
         video: Union[bool, str] = None,
         image: Union[bool, str] = None,
+        bot_id: int = 0,
     ):
         assistant = await group_assistant(self, chat_id)
         language = await get_lang(chat_id)
@@ -259,7 +262,9 @@ class Call(PyTgCalls):
             raise AssistantErr(_["call_9"])
         except TelegramServerError:
             raise AssistantErr(_["call_10"])
-        await add_active_chat(chat_id)
+        await add_active_chat(
+            chat_id, await get_assistant_number(chat_id), bot_id=bot_id
+        )
         await music_on(chat_id)
         if video:
             await add_active_video_chat(chat_id)
@@ -383,7 +388,7 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
-                img = await get_thumb(videoid)
+                img = await get_card(videoid, title, user)
                 button = stream_markup(_, chat_id)
                 await mystic.delete()
                 run = await app.send_text(
@@ -416,7 +421,8 @@ class Call(PyTgCalls):
                         text=_["call_6"],
                     )
                 button = telegram_markup(_, chat_id)
-                run = await app.send_photo(
+                run = await send_photo(
+                    app,
                     chat_id=original_chat_id,
                     photo=config.STREAM_IMG_URL,
                     caption=_["stream_2"].format(user),
@@ -445,7 +451,8 @@ class Call(PyTgCalls):
                     )
                 if videoid == "telegram":
                     button = telegram_markup(_, chat_id)
-                    run = await app.send_photo(
+                    run = await send_photo(
+                        app,
                         chat_id=original_chat_id,
                         photo=(
                             config.TELEGRAM_AUDIO_URL
@@ -461,7 +468,8 @@ class Call(PyTgCalls):
                     db[chat_id][0]["markup"] = "tg"
                 elif videoid == "soundcloud":
                     button = telegram_markup(_, chat_id)
-                    run = await app.send_photo(
+                    run = await send_photo(
+                        app,
                         chat_id=original_chat_id,
                         photo=config.SOUNCLOUD_IMG_URL,
                         caption=_["stream_1"].format(
@@ -472,9 +480,10 @@ class Call(PyTgCalls):
                     db[chat_id][0]["mystic"] = run
                     db[chat_id][0]["markup"] = "tg"
                 else:
-                    img = await get_thumb(videoid)
+                    img = await get_card(videoid, title, user)
                     button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
+                    run = await send_photo(
+                        app,
                         chat_id=original_chat_id,
                         photo=img,
                         caption=_["stream_1"].format(
@@ -0,0 +1,429 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from importlib import import_module
+from pathlib import Path
+
+import aiohttp
+from pyrogram import Client
+from pyrogram.errors import (
+    AccessTokenExpired,
+    AccessTokenInvalid,
+    AuthKeyUnregistered,
+    SessionRevoked,
+    UserDeactivated,
+)
+from pyrogram.handlers import RawUpdateHandler
+from pyrogram.handlers.handler import Handler
+
+import config
+from Clonify.utils.database.clonedb import (
+    delete_clone_session,
+    delete_clonebot_token,
+    get_clone_session,
+    get_clonebot,
+    get_clonebots,
+    save_clone_session,
+)
+
+from ..logging import LOGGER
+from .broadcast import register_broadcast_client, unregister_broadcast_client
+from .leader import NODE_ID, acquire_lease, leasedb, release_lease
+from .shards import heartbeat_node, leave_nodes, owns
+
+CLONE_PLUGINS = "Clonify.cplugin"
+TOKEN_CHECK_TIMEOUT = 15
+# runs before every plugin group so each clone update counts as a heartbeat
+HEARTBEAT_GROUP = -1000
+
+REVOKED_ERRORS = (
+    AccessTokenExpired,
+    AccessTokenInvalid,
+    AuthKeyUnregistered,
+    SessionRevoked,
+    UserDeactivated,
+)
+
+# bot_id -> running clone Client on this node
+clones = {}
+# bot_id -> supervisor view of the clone: state, start latency, ping rtt,
+# last update time, error rate and restart bookkeeping
+clone_status = {}
+
+# group -> handlers of every cplugin module, built once and shared by all clones
+_handler_groups = None
+
+# bot_ids whose clone lease this node holds, running or waiting for a retry
+_claimed = set()
+_reconcile_lock = asyncio.Lock()
+
+_start_lock = asyncio.Lock()
+_last_start = {"at": 0.0}
+
+
+async def validate_token(session, token: str):
+    """Bot API getMe for ``token``; None when Telegram rejects the token.
+
+    Network failures raise, so a flaky connection never deletes a clone.
+    """
+    async with session.get(f"https://api.telegram.org/bot{token}/getMe") as resp:
+        if resp.status in (401, 404):
+            return None
+        resp.raise_for_status()
+        return (await resp.json())["result"]
+
+
+async def _stagger():
+    async with _start_lock:
+        wait = _last_start["at"] + config.CLONE_START_INTERVAL - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        _last_start["at"] = time.monotonic()
+
+
+def clone_handlers() -> OrderedDict:
+    """Handler table of the clone plugins, imported in pyrogram's plugin order."""
+    global _handler_groups
+    if _handler_groups is None:
+        groups = {}
+        for path in sorted(Path(CLONE_PLUGINS.replace(".", "/")).rglob("*.py")):
+            if path.stem == "__init__":
+                continue
+            module = import_module(".".join(path.parent.parts + (path.stem,)))
+            for name in vars(module).keys():
+                for handler, group in getattr(getattr(module, name), "handlers", ()):
+                    if isinstance(handler, Handler) and isinstance(group, int):
+                        groups.setdefault(group, []).append(handler)
+        groups.setdefault(HEARTBEAT_GROUP, []).append(RawUpdateHandler(_record_update))
+        _handler_groups = OrderedDict(sorted(groups.items()))
+    return _handler_groups
+
+
+def attach_handlers(client: Client):
+    # pyrogram clears dispatcher.groups on stop, so each clone gets its own
+    # outer dict over the shared handler lists
+    client.dispatcher.groups = OrderedDict(clone_handlers())
+
+
+def _clone_client(token: str, session: str = None) -> Client:
+    # in_memory keeps pyrogram from opening a SQLite session file per clone
+    client = Client(
+        f"clone_{token.split(':', 1)[0]}",
+        config.API_ID,
+        config.API_HASH,
+        bot_token=token,
+        session_string=session,
+        in_memory=True,
+        workers=config.CLONE_WORKERS,
+    )
+    attach_handlers(client)
+    return client
+
+
+async def start_clone(token: str) -> Client:
+    persist = config.CLONE_SESSION_STORE == "mongo"
+    session = await get_clone_session(token) if persist else None
+    await _stagger()
+    client = _clone_client(token, session)
+    try:
+        await client.start()
+    except (AccessTokenExpired, AccessTokenInvalid):
+        raise
+    except Exception as e:
+        if not session:
+            raise
+        # the stored auth key went stale, log in from the token again
+        LOGGER(__name__).warning(f"Dropping stored session of a clone: {e}")
+        await delete_clone_session(token)
+        session = None
+        client = _clone_client(token)
+        await client.start()
+    if persist:
+        exported = await client.export_session_string()
+        if exported != session:
+            await save_clone_session(client.me.id, token, exported)
+    if client.me.id in clones:
+        # re-cloned with a new token, the old client must not linger
+        await _stop_client(client.me.id)
+    clones[client.me.id] = client
+    register_broadcast_client(client.me.id, client)
+    _status(client.me.id).update(state="running", error=None, errors=0, failures=0)
+    return client
+
+
+def _status(bot_id: int) -> dict:
+    return clone_status.setdefault(
+        bot_id,
+        {
+            "state": "starting",
+            "latency": None,
+            "error": None,
+            "rtt": None,
+            "last_update": None,
+            "error_rate": 0.0,
+            "errors": 0,
+            "failures": 0,
+            "restarts": 0,
+            "retry_at": 0.0,
+        },
+    )
+
+
+def _failed(bot_id: int, error: Exception):
+    status = _status(bot_id)
+    status["state"] = "failed"
+    status["error"] = str(error) or repr(error)
+    status["failures"] += 1
+    backoff = config.CLONE_RESTART_BACKOFF * 2 ** (status["failures"] - 1)
+    status["retry_at"] = time.time() + min(backoff, config.CLONE_MAX_BACKOFF)
+    LOGGER(__name__).warning(f"Clone {bot_id} failed to start: {error}")
+
+
+async def _record_update(client, *args):
+    status = clone_status.get(client.me.id) if client.me else None
+    if status is not None:
+        status["last_update"] = time.time()
+
+
+async def _stop_client(bot_id: int):
+    unregister_broadcast_client(bot_id)
+    client = clones.pop(bot_id, None)
+    if client is None:
+        return
+    try:
+        await client.stop()
+    except Exception:
+        pass
+
+
+async def evict_clone(bot_id: int, token: str):
+    """Stop a clone whose token was revoked and drop it from the registry."""
+    await _stop_client(bot_id)
+    await delete_clonebot_token(token)
+    status = _status(bot_id)
+    status["state"] = "revoked"
+    LOGGER(__name__).warning(f"Clone {bot_id} evicted, its token was revoked")
+
+
+async def _launch(session, semaphore, bot: dict):
+    bot_id = bot["bot_id"]
+    async with semaphore:
+        began = time.monotonic()
+        try:
+            valid = await validate_token(session, bot["token"])
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not check token of {bot_id}: {e}")
+            valid = True
+        if not valid:
+            _status(bot_id)["error"] = "invalid token"
+            return await evict_clone(bot_id, bot["token"])
+        if bot_id in clones:
+            return
+        try:
+            await start_clone(bot["token"])
+        except REVOKED_ERRORS:
+            return await evict_clone(bot_id, bot["token"])
+        except Exception as e:
+            return _failed(bot_id, e)
+        _status(bot_id)["latency"] = time.monotonic() - began
+
+
+async def restart_clone(bot_id: int) -> bool:
+    """Stop and start one clone from its registry token, leaving the rest alone."""
+    if bot_id not in _claimed:
+        return False
+    await _stop_client(bot_id)
+    bot = get_clonebot(bot_id)
+    if bot is None:
+        clone_status.pop(bot_id, None)
+        return False
+    _status(bot_id)["state"] = "restarting"
+    try:
+        await start_clone(bot["token"])
+    except REVOKED_ERRORS:
+        await evict_clone(bot_id, bot["token"])
+        return False
+    except Exception as e:
+        _failed(bot_id, e)
+        return False
+    _status(bot_id)["restarts"] += 1
+    return True
+
+
+async def _check_clone(bot_id: int, client: Client):
+    status = _status(bot_id)
+    began = time.monotonic()
+    try:
+        # get_me doubles as the ping and the refresh of the cached identity
+        client.me = await asyncio.wait_for(client.get_me(), config.CLONE_PING_TIMEOUT)
+    except REVOKED_ERRORS:
+        bot = get_clonebot(bot_id)
+        if bot:
+            await evict_clone(bot_id, bot["token"])
+        return
+    except Exception as e:
+        status["errors"] += 1
+        status["error"] = str(e) or repr(e)
+        status["error_rate"] = status["error_rate"] * 0.8 + 0.2
+        if status["errors"] >= config.CLONE_MAX_ERRORS:
+            LOGGER(__name__).warning(f"Clone {bot_id} stopped answering, restarting")
+            await restart_clone(bot_id)
+        return
+    status["rtt"] = time.monotonic() - began
+    status["errors"] = 0
+    status["error_rate"] *= 0.8
+
+
+async def supervise_clones():
+    """Ping every running clone, restart dead ones and retry failed starts."""
+    semaphore = asyncio.Semaphore(config.CLONE_START_CONCURRENCY)
+
+    async def visit(bot_id, status):
+        async with semaphore:
+            client = clones.get(bot_id)
+            if client is not None:
+                await _check_clone(bot_id, client)
+            elif status["state"] == "failed" and status["retry_at"] <= time.time():
+                await restart_clone(bot_id)
+
+    while True:
+        await asyncio.sleep(config.CLONE_HEALTH_INTERVAL)
+        try:
+            await asyncio.gather(
+                *(visit(bot_id, status) for bot_id, status in list(clone_status.items()))
+            )
+        except Exception as e:
+            LOGGER(__name__).warning(f"Clone supervisor pass failed: {e}")
+
+
+async def launch_clones(bots: list = None) -> dict:
+    """Validate and start ``bots`` (every registered clone by default).
+
+    Returns a summary with the number started, the failures and the slowest
+    startup, per-clone numbers stay in ``clone_status``.
+    """
+    bots = get_clonebots() if bots is None else bots
+    semaphore = asyncio.Semaphore(config.CLONE_START_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=TOKEN_CHECK_TIMEOUT)
+    began = time.monotonic()
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        await asyncio.gather(*(_launch(session, semaphore, bot) for bot in bots))
+    statuses = [_status(bot["bot_id"]) for bot in bots]
+    latencies = [
+        s["latency"] for s in statuses if s["state"] == "running" and s["latency"]
+    ]
+    return {
+        "total": len(bots),
+        "started": len([s for s in statuses if s["state"] == "running"]),
+        "failed": {
+            bot["bot_id"]: s["error"]
+            for bot, s in zip(bots, statuses)
+            if s["state"] != "running"
+        },
+        "slowest": max(latencies, default=0.0),
+        "elapsed": time.monotonic() - began,
+    }
+
+
+def _lease(bot_id: int) -> str:
+    return f"clone:{bot_id}"
+
+
+async def _claim(bot_id: int) -> bool:
+    if bot_id not in _claimed and await acquire_lease(_lease(bot_id)):
+        _claimed.add(bot_id)
+    return bot_id in _claimed
+
+
+async def _release(bot_id: int):
+    await _stop_client(bot_id)
+    clone_status.pop(bot_id, None)
+    if bot_id in _claimed:
+        _claimed.discard(bot_id)
+        await release_lease(_lease(bot_id))
+
+
+async def discard_clone(bot_id: int):
+    """Stop a clone started by /clone that never made it into the registry."""
+    await _release(bot_id)
+
+
+async def _renew_claims():
+    if not _claimed:
+        return
+    names = [_lease(bot_id) for bot_id in _claimed]
+    await leasedb.update_many(
+        {"_id": {"$in": names}, "holder": NODE_ID},
+        {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=config.LEASE_TTL)}},
+    )
+    held = {
+        lease["_id"]
+        async for lease in leasedb.find({"_id": {"$in": names}, "holder": NODE_ID})
+    }
+    for bot_id in list(_claimed):
+        if _lease(bot_id) not in held:
+            # the lease expired under us and another node may run it now
+            _claimed.discard(bot_id)
+            await _release(bot_id)
+
+
+async def adopt_clone(client: Client) -> bool:
+    """Keep a clone started by a command here only if this node owns its shard."""
+    bot_id = client.me.id
+    if owns(bot_id) and await _claim(bot_id):
+        return True
+    await _stop_client(bot_id)
+    clone_status.pop(bot_id, None)
+    return False
+
+
+async def reconcile_clones() -> dict:
+    """Start the registered clones this node owns and stop everything else.
+
+    Returns the launch summary of the clones started by this pass.
+    """
+    async with _reconcile_lock:
+        registry = {bot["bot_id"]: bot for bot in get_clonebots()}
+        # clones started by /clone stay unclaimed until adopt_clone decides
+        for bot_id in list(_claimed):
+            if bot_id not in registry or not owns(bot_id):
+                await _release(bot_id)
+        wanted = [
+            bot
+            for bot_id, bot in registry.items()
+            if bot_id not in clones and bot_id not in _claimed and owns(bot_id)
+        ]
+        claimed = [bot for bot in wanted if await _claim(bot["bot_id"])]
+        return await launch_clones(claimed)
+
+
+async def _reconcile():
+    try:
+        await reconcile_clones()
+    except Exception as e:
+        LOGGER(__name__).warning(f"Clone reconcile failed: {e}")
+
+
+async def sync_clones():
+    """Follow the registry and the live nodes, every CLONE_SYNC_INTERVAL."""
+    task = None
+    while True:
+        await asyncio.sleep(config.CLONE_SYNC_INTERVAL)
+        try:
+            await heartbeat_node()
+            await _renew_claims()
+            if not _reconcile_lock.locked() and (task is None or task.done()):
+                task = asyncio.ensure_future(_reconcile())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER(__name__).warning(f"Clone sync pass failed: {e}")
+
+
+async def stop_clones():
+    for bot_id in list(clones):
+        await _stop_client(bot_id)
+    for bot_id in list(_claimed):
+        await _release(bot_id)
+    await leave_nodes()
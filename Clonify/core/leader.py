@@ -0,0 +1,112 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+import config
+
+from ..logging import LOGGER
+from .mongo import mongodb
+
+leasedb = mongodb.leases
+
+NODE_ID = config.NODE_ID or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+# name -> supervising task of every background job started on this node
+JOBS = {}
+# names of the singleton leases this node currently holds
+leader_of = set()
+
+
+async def acquire_lease(name: str, ttl: int = config.LEASE_TTL) -> bool:
+    now = datetime.utcnow()
+    try:
+        lease = await leasedb.find_one_and_update(
+            {
+                "_id": name,
+                "$or": [{"holder": NODE_ID}, {"expires_at": {"$lt": now}}],
+            },
+            {
+                "$set": {
+                    "holder": NODE_ID,
+                    "expires_at": now + timedelta(seconds=ttl),
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # another node holds a live lease, the upsert raced its document
+        return False
+    return bool(lease) and lease["holder"] == NODE_ID
+
+
+async def release_lease(name: str):
+    leader_of.discard(name)
+    await leasedb.delete_one({"_id": name, "holder": NODE_ID})
+
+
+async def _run_singleton(name: str, func, ttl: int):
+    job = None
+    renew = max(ttl / 3, 1)
+    while True:
+        try:
+            held = await acquire_lease(name, ttl)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Lease {name} renewal failed: {e}")
+            held = False
+        if held and (job is None or job.done()):
+            if name not in leader_of:
+                LOGGER(__name__).info(f"{NODE_ID} is now running {name}")
+            leader_of.add(name)
+            job = asyncio.create_task(func())
+        elif not held:
+            if name in leader_of:
+                LOGGER(__name__).info(f"{NODE_ID} lost the lease on {name}")
+            leader_of.discard(name)
+            if job and not job.done():
+                job.cancel()
+            job = None
+        try:
+            await asyncio.sleep(renew)
+        except asyncio.CancelledError:
+            if job and not job.done():
+                job.cancel()
+            raise
+
+
+def singleton_job(name: str, func, ttl: int = config.LEASE_TTL):
+    """Run ``func`` on exactly one node, failing over when its lease expires."""
+    if name not in JOBS:
+        JOBS[name] = asyncio.create_task(_run_singleton(name, func, ttl))
+    return JOBS[name]
+
+
+def node_job(name: str, func):
+    """Run ``func`` on every node, for loops that only touch local state."""
+    if name not in JOBS:
+        JOBS[name] = asyncio.create_task(func())
+    return JOBS[name]
+
+
+async def stop_job(name: str):
+    task = JOBS.pop(name, None)
+    if task:
+        task.cancel()
+    if name in leader_of:
+        await release_lease(name)
+
+
+async def stop_jobs():
+    for task in JOBS.values():
+        task.cancel()
+    JOBS.clear()
+    for name in list(leader_of):
+        try:
+            await release_lease(name)
+        except Exception:
+            pass
@@ -0,0 +1,101 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import config
+from Clonify.misc import db
+from Clonify.utils.database.active import active_calls, bot_load
+from Clonify.utils.database.clonedb import check_bot_premium
+
+QUOTA_TIERS = {
+    "free": {
+        "calls": config.CLONE_MAX_CALLS,
+        "video": config.CLONE_VIDEO,
+        "queue": config.CLONE_MAX_QUEUE,
+        "downloads": config.CLONE_DOWNLOADS,
+        "broadcast_rate": config.CLONE_BROADCAST_RATE,
+    },
+    "premium": {
+        "calls": config.CLONE_PREMIUM_MAX_CALLS,
+        "video": config.CLONE_PREMIUM_VIDEO,
+        "queue": config.CLONE_PREMIUM_MAX_QUEUE,
+        "downloads": config.CLONE_PREMIUM_DOWNLOADS,
+        "broadcast_rate": config.CLONE_PREMIUM_BROADCAST_RATE,
+    },
+}
+
+QUOTA_TEXT = {
+    "calls": "» {0} ɪs ᴀʟʀᴇᴀᴅʏ ᴘʟᴀʏɪɴɢ ɪɴ {1} ᴠᴏɪᴄᴇ ᴄʜᴀᴛs, ᴛʀʏ ᴀɢᴀɪɴ ᴡʜᴇɴ ᴏɴᴇ ᴇɴᴅs.",
+    "video": "» ᴠɪᴅᴇᴏ sᴛʀᴇᴀᴍs ᴀʀᴇ ᴅɪsᴀʙʟᴇᴅ ᴏɴ ᴛʜɪs ᴄʟᴏɴᴇ's ᴛɪᴇʀ.",
+    "queue": "» ᴛʜᴇ ǫᴜᴇᴜᴇ ᴏғ ᴛʜɪs ᴄʜᴀᴛ ɪs ғᴜʟʟ ({1} ᴛʀᴀᴄᴋs), ᴡᴀɪᴛ ғᴏʀ ɪᴛ ᴛᴏ ᴍᴏᴠᴇ.",
+}
+
+# bot_id -> (download limit, semaphore), rebuilt when the tier changes
+_download_slots = {}
+# bot_id -> downloads waiting for a slot
+_download_waiting = {}
+# bot_id -> downloads holding a slot
+_download_active = {}
+
+
+def clone_tier(bot_id: int) -> str:
+    return "premium" if check_bot_premium(bot_id) else "free"
+
+
+def clone_quota(bot_id: int) -> dict:
+    return QUOTA_TIERS[clone_tier(bot_id)]
+
+
+def admit_play(bot_id: int, chat_id: int, video: bool = None) -> str:
+    """Name of the quota a play request in ``chat_id`` would break, else None."""
+    quota = clone_quota(bot_id)
+    if video and not quota["video"]:
+        return "video"
+    if chat_id in active_calls(bot_id=bot_id):
+        if len(db.get(chat_id) or []) >= quota["queue"]:
+            return "queue"
+    elif bot_load(bot_id) >= quota["calls"]:
+        return "calls"
+    return None
+
+
+def quota_text(reason: str, bot_id: int, mention: str) -> str:
+    return QUOTA_TEXT[reason].format(mention, clone_quota(bot_id)[reason])
+
+
+def _slots(bot_id: int) -> asyncio.Semaphore:
+    limit = clone_quota(bot_id)["downloads"]
+    slots = _download_slots.get(bot_id)
+    if slots is None or slots[0] != limit:
+        slots = _download_slots[bot_id] = (limit, asyncio.Semaphore(limit))
+    return slots[1]
+
+
+@asynccontextmanager
+async def download_slot(bot_id: int):
+    """Hold one of the clone's download slots, waiting for a free one."""
+    slots = _slots(bot_id)
+    _download_waiting[bot_id] = _download_waiting.get(bot_id, 0) + 1
+    try:
+        await slots.acquire()
+    finally:
+        _download_waiting[bot_id] -= 1
+    _download_active[bot_id] = _download_active.get(bot_id, 0) + 1
+    try:
+        yield
+    finally:
+        _download_active[bot_id] -= 1
+        slots.release()
+
+
+def clone_usage(bot_id: int) -> dict:
+    quota = clone_quota(bot_id)
+    chats = active_calls(bot_id=bot_id)
+    return {
+        "tier": clone_tier(bot_id),
+        "quota": quota,
+        "calls": len(chats),
+        "video": len(active_calls(bot_id=bot_id, video=True)),
+        "queued": sum(len(db.get(chat_id) or []) for chat_id in chats),
+        "downloads": _download_active.get(bot_id, 0),
+        "waiting": _download_waiting.get(bot_id, 0),
+    }
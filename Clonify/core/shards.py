@@ -0,0 +1,44 @@
+import hashlib
+from datetime import datetime, timedelta
+
+import config
+
+from .leader import NODE_ID
+from .mongo import mongodb
+
+nodedb = mongodb.nodes
+
+# ids of the nodes that heartbeated within NODE_TTL, this node included
+live_nodes = [NODE_ID]
+
+
+async def heartbeat_node() -> list:
+    """Mark this node alive and refresh the list of live nodes."""
+    global live_nodes
+    now = datetime.utcnow()
+    await nodedb.update_one(
+        {"_id": NODE_ID},
+        {"$set": {"expires_at": now + timedelta(seconds=config.NODE_TTL)}},
+        upsert=True,
+    )
+    nodes = [node["_id"] async for node in nodedb.find({"expires_at": {"$gt": now}})]
+    live_nodes = sorted(set(nodes) | {NODE_ID})
+    return live_nodes
+
+
+async def leave_nodes():
+    await nodedb.delete_one({"_id": NODE_ID})
+
+
+def _weight(node: str, key) -> int:
+    digest = hashlib.blake2b(f"{node}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def owner_of(key) -> str:
+    # rendezvous hashing, a node joining or leaving only moves its own share
+    return max(live_nodes, key=lambda node: _weight(node, key))
+
+
+def owns(key) -> bool:
+    return owner_of(key) == NODE_ID
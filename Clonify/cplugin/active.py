@@ -5,8 +5,7 @@ from unidecode import unidecode
 from Clonify import app
 from Clonify.misc import SUDOERS
 from Clonify.utils.database import (
-    get_active_chats,
-    get_active_video_chats,
+    active_calls,
     remove_active_chat,
     remove_active_video_chat,
 )
@@ -14,8 +13,8 @@ from Clonify.utils.database import (
 
 @Client.on_message(filters.command(["ac", "activevc", "activevoice"]))
 async def start(client: Client, message: Message):
-    ac_audio = str(len(await get_active_chats()))
-    ac_video = str(len(await get_active_video_chats()))
+    ac_audio = str(len(active_calls(bot_id=client.me.id)))
+    ac_video = str(len(active_calls(bot_id=client.me.id, video=True)))
     await message.reply_text(
         f"✫ <b><u>ᴀᴄᴛɪᴠᴇ ᴄʜᴀᴛs ɪɴғᴏ</u></b> :\n\nᴠᴏɪᴄᴇ : {ac_audio}\nᴠɪᴅᴇᴏ  : {ac_video}",
         reply_markup=InlineKeyboardMarkup(
@@ -1,16 +1,15 @@
-import asyncio
-
 from pyrogram import filters, Client
 from pyrogram.enums import ChatMembersFilter
-from pyrogram.errors import FloodWait
 
 from Clonify import app
-from Clonify.misc import SUDOERS
-from Clonify.utils.database import (
-    get_client,
-    get_served_chats_clone,
-    get_served_users_clone,
+from Clonify.core.broadcast import (
+    progress_text,
+    register_broadcast_client,
+    set_broadcast_status,
+    start_broadcast,
 )
+from Clonify.misc import SUDOERS
+from Clonify.utils.database import get_client
 from Clonify.utils.decorators.language import language
 from Clonify.utils.formatters import alpha_to_int
 from config import adminlist
@@ -18,7 +17,7 @@ import random
 from typing import Dict, List, Union
 
 from Clonify import userbot
-from Clonify.core.mongo import mongodb, pymongodb
+from Clonify.core.mongo import mongodb
 from Clonify.utils.database.clonedb import get_owner_id_from_db, check_bot_premium
 from config import SUPPORT_CHAT, OWNER_ID
 
@@ -30,7 +29,6 @@ blacklist_chatdb = mongodb.blacklistChat
 blockeddb = mongodb.blockedusers
 chatsdbc = mongodb.chatsc
 channeldb = mongodb.cplaymode
-clonebotdb = pymongodb.clonebotdb
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
 langdb = mongodb.language
@@ -138,7 +136,11 @@ async def delete_authuser_clone(chat_id: int, name: str) -> bool:
     return False
 
 # Broadcast command
-IS_BROADCASTING = False
+BROADCAST_COMMANDS = {
+    "pausebroadcast": "paused",
+    "resumebroadcast": "running",
+    "cancelbroadcast": "cancelled",
+}
 
 
 @Client.on_message(filters.command(["broadcast"]))
@@ -146,7 +148,7 @@ IS_BROADCASTING = False
 async def broadcast_message(client, message, _):
 
     # Get bot ID
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # get owner info
@@ -156,110 +158,67 @@ async def broadcast_message(client, message, _):
     if message.from_user.id not in OWNERS:
         return await message.reply_text(_["c_brod_1"].format(SUPPORT_CHAT))
 
-    global IS_BROADCASTING
-
     # Check if bot has premium
-    a = await client.get_me()
-    premium_status = check_bot_premium(a.id)
+    premium_status = check_bot_premium(bot_id)
     if premium_status is None:
         return await message.reply_text("Bot ID not found!")
     elif not premium_status:
         if message.from_user.id != OWNER_ID:
             return await message.reply_text("Premium not found!")
-        else:
-            pass
 
     # Get the message content
+    query = None
     if message.reply_to_message:
         x = message.reply_to_message.id
         y = message.chat.id
     else:
         if len(message.command) < 2:
-            IS_BROADCASTING = False
             return await message.reply_text(_["broad_2"])
         query = message.text.split(None, 1)[1]
-        if "-pin" in query:
-            query = query.replace("-pin", "")
-        if "-nobot" in query:
-            query = query.replace("-nobot", "")
-        if "-pinloud" in query:
-            query = query.replace("-pinloud", "")
-        if "-user" in query:
-            query = query.replace("-user", "")
-        if query == "":
-            IS_BROADCASTING = False
+        for flag in ["-pinloud", "-pin", "-nobot", "-user"]:
+            query = query.replace(flag, "")
+        if query.strip() == "":
             return await message.reply_text(_["broad_8"])
-        
-    # Start broadcasting
-    IS_BROADCASTING = True
-    await message.reply_text(_["broad_1"])
 
-    # Broadcast to chats
+    kinds = []
     if "-nobot" not in message.text:
-        sent, pin = 0, 0
-        served_chats = await get_served_chats_clone(bot_id)
-        for chat in served_chats:
-            try:
-                chat_id = int(chat["chat_id"])
-                m = (
-                    await client.forward_messages(chat_id, y, x)
-                    if message.reply_to_message
-                    else await client.send_message(chat_id, text=query)
-                )
-                if "-pin" in message.text:
-                    try:
-                        await m.pin(disable_notification=True)
-                        pin += 1
-                    except:
-                        pass
-                elif "-pinloud" in message.text:
-                    try:
-                        await m.pin(disable_notification=False)
-                        pin += 1
-                    except:
-                        pass
-                sent += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                continue
-
-        try:
-            await message.reply_text(_["broad_3"].format(sent, pin))
-        except:
-            pass
-
-    # Broadcast to users
+        kinds.append("chats")
     if "-user" in message.text:
-        susr = 0
-        served_users = await get_served_users_clone(bot_id)
-        for user in served_users:
-            try:
-                user_id = int(user["user_id"])
-                m = (
-                    await client.forward_messages(user_id, y, x)
-                    if message.reply_to_message
-                    else await client.send_message(user_id, text=query)
-                )
-                susr += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                pass
-
-        try:
-            await message.reply_text(_["broad_4"].format(susr))
-        except:
-            pass
-
-# Zeo
-
-    IS_BROADCASTING = False
+        kinds.append("users")
+    if not kinds:
+        return
+    if "-pinloud" in message.text:
+        pin = "loud"
+    elif "-pin" in message.text:
+        pin = "silent"
+    else:
+        pin = None
+
+    # Start broadcasting, progress is edited into this message
+    report = await message.reply_text(_["broad_1"])
+    await start_broadcast(
+        client,
+        bot_id,
+        kinds,
+        report,
+        text=query,
+        from_chat_id=y if message.reply_to_message else None,
+        message_id=x if message.reply_to_message else None,
+        pin=pin,
+    )
+
+
+@Client.on_message(
+    filters.command(["pausebroadcast", "resumebroadcast", "cancelbroadcast"])
+)
+async def broadcast_control(client, message):
+    bot_id = client.me.id
+    if message.from_user.id not in [OWNER_ID, get_owner_id_from_db(bot_id)]:
+        return
+    register_broadcast_client(bot_id, client)
+    status = BROADCAST_COMMANDS[message.command[0].lower()]
+    job_id = message.command[1] if len(message.command) > 1 else None
+    job = await set_broadcast_status(bot_id, status, job_id)
+    if not job:
+        return await message.reply_text("» ɴᴏ ᴍᴀᴛᴄʜɪɴɢ ʙʀᴏᴀᴅᴄᴀsᴛ ғᴏᴜɴᴅ.")
+    await message.reply_text(progress_text(job))
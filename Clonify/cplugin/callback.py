@@ -13,6 +13,8 @@ from pyrogram import filters, Client
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, CallbackQuery
 from Clonify import YouTube, app
 from Clonify.core.call import PRO
+from Clonify.core.leader import node_job
+from Clonify.core.quotas import download_slot
 from Clonify.misc import SUDOERS, db
 from Clonify.utils.database import (
     get_active_chats,
@@ -53,7 +55,8 @@ from Clonify.utils.inline import (
     panel_markup_1,
 )
 from Clonify.utils.stream.autoclear import auto_clean
-from Clonify.utils.thumbnails import get_thumb
+from Clonify.utils.mediacache import reply_photo
+from Clonify.utils.thumbcache import get_card
 from config import (
     BANNED_USERS,
     SOUNCLOUD_IMG_URL,
@@ -196,7 +199,7 @@ upvoters = {}
 @languageCB
 async def del_back_playlist(client, CallbackQuery, _):
 
-    bot = await client.get_me()
+    bot = client.me
 
     C_BOT_OWNER_ID = get_owner_id_from_db(bot.id)
 
@@ -206,7 +209,7 @@ async def del_back_playlist(client, CallbackQuery, _):
     C_BOT_SUPPORT_CHANNEL = await get_cloned_support_channel(bot.id)
     C_SUPPORT_CHANNEL = f"https://t.me/{C_BOT_SUPPORT_CHANNEL}"
 
-    cusername = (await client.get_me()).username
+    cusername = client.me.username
     callback_data = CallbackQuery.data.strip()
     callback_request = callback_data.split(None, 1)[1]
     command, chat = callback_request.split("|")
@@ -454,8 +457,9 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
             button = stream_markup2(_, chat_id)
-            img = await get_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
+            img = await get_card(videoid, title, user)
+            run = await reply_photo(
+                CallbackQuery.message,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{cusername}?start=info_{videoid}",
@@ -473,12 +477,13 @@ async def del_back_playlist(client, CallbackQuery, _):
                 _["call_7"], disable_web_page_preview=True
             )
             try:
-                file_path, direct = await YouTube.download(
-                    videoid,
-                    mystic,
-                    videoid=True,
-                    video=status,
-                )
+                async with download_slot(client.me.id):
+                    file_path, direct = await YouTube.download(
+                        videoid,
+                        mystic,
+                        videoid=True,
+                        video=status,
+                    )
             except:
                 return await mystic.edit_text(_["call_6"])
             try:
@@ -490,8 +495,9 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 return await mystic.edit_text(_["call_6"])
             button = stream_markup(_, chat_id)
-            img = await get_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
+            img = await get_card(videoid, title, user)
+            run = await reply_photo(
+                CallbackQuery.message,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{cusername}?start=info_{videoid}",
@@ -511,7 +517,8 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
             button = stream_markup2(_, chat_id)
-            run = await CallbackQuery.message.reply_photo(
+            run = await reply_photo(
+                CallbackQuery.message,
                 photo=STREAM_IMG_URL,
                 caption=_["stream_2"].format(user),
                 reply_markup=InlineKeyboardMarkup(button),
@@ -535,7 +542,8 @@ async def del_back_playlist(client, CallbackQuery, _):
                 return await CallbackQuery.message.reply_text(_["call_6"])
             if videoid == "telegram":
                 button = stream_markup2(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                run = await reply_photo(
+                    CallbackQuery.message,
                     photo=(
                         TELEGRAM_AUDIO_URL
                         if str(streamtype) == "audio"
@@ -550,7 +558,8 @@ async def del_back_playlist(client, CallbackQuery, _):
                 db[chat_id][0]["markup"] = "tg"
             elif videoid == "soundcloud":
                 button = stream_markup2(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                run = await reply_photo(
+                    CallbackQuery.message,
                     photo=(
                         SOUNCLOUD_IMG_URL
                         if str(streamtype) == "audio"
@@ -565,8 +574,9 @@ async def del_back_playlist(client, CallbackQuery, _):
                 db[chat_id][0]["markup"] = "tg"
             else:
                 button = stream_markup(_, chat_id)
-                img = await get_thumb(videoid)
-                run = await CallbackQuery.message.reply_photo(
+                img = await get_card(videoid, title, user)
+                run = await reply_photo(
+                    CallbackQuery.message,
                     photo=img,
                     caption=_["stream_1"].format(
                         f"https://t.me/{cusername}?start=info_{videoid}",
@@ -722,4 +732,4 @@ async def markup_timer():
                 continue
 
 
-asyncio.create_task(markup_timer())
+node_job("clone_markup_timer", markup_timer)
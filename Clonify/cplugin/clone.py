@@ -11,6 +11,7 @@ from config import PING_IMG_URL, STREAMI_PICS
 from .utils import StartTime
 from Clonify.utils import get_readable_time
 from Clonify.utils.decorators.language import language
+from Clonify.utils.mediacache import reply_photo
 
 APP_LINK = f"https://t.me/varshaamusicbot"
 
@@ -18,10 +19,11 @@ APP_LINK = f"https://t.me/varshaamusicbot"
 @Client.on_message(filters.command("clone"))
 @language
 async def ping_clone(client: Client, message: Message, _):
-    bot = await client.get_me()
+    bot = client.me
 
 
-    hmm = await message.reply_photo(
+    hmm = await reply_photo(
+        message,
         photo=random.choice(STREAMI_PICS), caption=_["NO_CLONE_MSG"],
         reply_markup=InlineKeyboardMarkup(
             [
@@ -30,7 +30,7 @@ async def helper_private(
     client: app, update: Union[types.Message, types.CallbackQuery]
 ):
     
-    bot = await client.get_me()
+    bot = client.me
 
     C_BOT_OWNER_ID = get_owner_id_from_db(bot.id)
 
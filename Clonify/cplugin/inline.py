@@ -14,7 +14,7 @@ from config import BANNED_USERS
 async def inline_query_handler(client, query):
     text = query.query.strip().lower()
     answers = []
-    cname = (await client.get_me()).mention
+    cname = client.me.mention
     if text.strip() == "":
         try:
             await client.answer_inline_query(query.id, results=answer, cache_time=10)
@@ -51,6 +51,7 @@ async def play_live_stream(client, CallbackQuery, _):
                 video,
                 streamtype="live",
                 forceplay=ffplay,
+                client=client,
             )
         except Exception as e:
             ex_type = type(e).__name__
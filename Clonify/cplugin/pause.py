@@ -9,7 +9,7 @@ import random
 from typing import Dict, List, Union
 
 from Clonify import userbot
-from Clonify.core.mongo import mongodb, pymongodb
+from Clonify.core.mongo import mongodb
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -19,7 +19,6 @@ blacklist_chatdb = mongodb.blacklistChat
 blockeddb = mongodb.blockedusers
 chatsdb = mongodb.chats
 channeldb = mongodb.cplaymode
-clonebotdb = pymongodb.clonebotdb
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
 langdb = mongodb.language
@@ -9,11 +9,12 @@ from config import SUPPORT_CHAT, PING_IMG_URL
 from .utils import StartTime
 from Clonify.utils import get_readable_time
 from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel
+from Clonify.utils.mediacache import reply_photo
 
 
 @Client.on_message(filters.command("ping"))
 async def ping_clone(client: Client, message: Message):
-    bot = await client.get_me()
+    bot = client.me
 
     C_BOT_OWNER_ID = get_owner_id_from_db(bot.id)
 
@@ -23,7 +24,8 @@ async def ping_clone(client: Client, message: Message):
     C_BOT_SUPPORT_CHANNEL = await get_cloned_support_channel(bot.id)
     C_SUPPORT_CHANNEL = f"https://t.me/{C_BOT_SUPPORT_CHANNEL}"
 
-    hmm = await message.reply_photo(
+    hmm = await reply_photo(
+        message,
         photo=PING_IMG_URL, caption=f"{bot.mention} ɪs ᴘɪɴɢɪɴɢ..."
     )
     upt = int(time.time() - StartTime)
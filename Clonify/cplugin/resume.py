@@ -8,7 +8,7 @@ from Clonify.utils.decorators import AdminRightsCheck
 from Clonify.utils.inline import close_markup
 from config import BANNED_USERS
 from Clonify import userbot
-from Clonify.core.mongo import mongodb, pymongodb
+from Clonify.core.mongo import mongodb
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -18,7 +18,6 @@ blacklist_chatdb = mongodb.blacklistChat
 blockeddb = mongodb.blockedusers
 chatsdb = mongodb.chats
 channeldb = mongodb.cplaymode
-clonebotdb = pymongodb.clonebotdb
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
 langdb = mongodb.language
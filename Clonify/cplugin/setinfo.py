@@ -6,18 +6,24 @@ from Clonify import app
 from Clonify.misc import SUDOERS
 from Clonify.utils.decorators.language import language
 
-from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel, check_bot_premium
+from Clonify.utils.database.clonedb import (
+    check_bot_premium,
+    get_cloned_support_channel,
+    get_cloned_support_chat,
+    get_log_channel,
+    get_logging_status,
+    get_owner_id_from_db,
+    update_clonebot,
+)
 from config import SUPPORT_CHAT, OWNER_ID
 
-from Clonify.utils.database import clonebotdb
-
 
 #set clone bot support channel
 @Client.on_message(filters.command("setchannel"))
 @language
 async def set_channel(client: Client, message: Message, _):
 
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # premium check --------------
@@ -48,8 +54,7 @@ async def set_channel(client: Client, message: Message, _):
     if channel.startswith("@"):
         channel = channel[1:] 
 
-    result = clonebotdb.update_one({"bot_id": bot_id}, {"$set": {"channel": channel}})
-    if result.modified_count > 0:
+    if await update_clonebot(bot_id, channel=channel):
         await message.reply_text(_["C_P_I_4"].format(channel))
     else:
         await message.reply_text(_["C_P_I_6"])
@@ -60,7 +65,7 @@ async def set_channel(client: Client, message: Message, _):
 @language
 async def set_support(client: Client, message: Message, _):
 
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # premium check --------------
@@ -91,8 +96,7 @@ async def set_support(client: Client, message: Message, _):
     if support.startswith("@"):
         support = support[1:] 
 
-    result = clonebotdb.update_one({"bot_id": bot_id}, {"$set": {"support": support}})
-    if result.modified_count > 0:
+    if await update_clonebot(bot_id, support=support):
         await message.reply_text(_["C_P_I_3"].format(support))
     else:
         await message.reply_text(_["C_P_I_5"])
@@ -104,7 +108,7 @@ async def set_support(client: Client, message: Message, _):
 @language
 async def bot_info(client: Client, message: Message, _):
 
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # premium check --------------
@@ -135,15 +139,6 @@ async def bot_info(client: Client, message: Message, _):
     )
 
 
-def get_logging_status(bot_id):
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
-    return bot_data.get("logging", True)
-
-def get_log_channel(bot_id):
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
-    return bot_data.get("logchannel", "-100")
-
-
 @Client.on_message(filters.command("logstatus"))
 @language
 async def check_log_status(client, message, _):
@@ -180,7 +175,7 @@ async def check_log_status(client, message, _):
 @Client.on_message(filters.command("logger"))
 @language
 async def toggle_logging(client: Client, message: Message, _):
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     C_OWNER = get_owner_id_from_db(bot_id)
@@ -198,13 +193,7 @@ async def toggle_logging(client: Client, message: Message, _):
 
     logging_status = option == "enable"
 
-    result = clonebotdb.update_one(
-        {"bot_id": bot_id}, 
-        {"$set": {"logging": logging_status}}, 
-        upsert=True
-    )
-
-    if result.modified_count > 0 or result.upserted_id:
+    if await update_clonebot(bot_id, upsert=True, logging=logging_status):
         await message.reply_text(f"{'ᴇɴᴀʙʟᴇᴅ ʟᴏɢɢɪɴɢ.' if logging_status else 'ᴅɪsᴀʙʟᴇᴅ ʟᴏɢɢɪɴɢ.'}")
     else:
         await message.reply_text("Fᴀɪʟᴇᴅ ᴛᴏ ᴜᴘᴅᴀᴛᴇ ʟᴏɢɢɪɴɢ sᴛᴀᴛᴜs!")
@@ -214,7 +203,7 @@ async def toggle_logging(client: Client, message: Message, _):
 @Client.on_message(filters.command("setlogger"))
 @language
 async def set_log_channel(client: Client, message: Message, _):
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     C_OWNER = get_owner_id_from_db(bot_id)
@@ -237,13 +226,7 @@ async def set_log_channel(client: Client, message: Message, _):
     try:
         test_msg = await client.send_message(group_id, "Bᴏᴛ ʟᴏɢɢɪɴɢ ᴇɴᴀʙʟᴇᴅ sᴜᴄᴄᴇssғᴜʟʟʏ!")
         
-        result = clonebotdb.update_one(
-            {"bot_id": bot_id}, 
-            {"$set": {"logchannel": group_id}}, 
-            upsert=True
-        )
-
-        if result.modified_count > 0 or result.upserted_id:
+        if await update_clonebot(bot_id, upsert=True, logchannel=group_id):
             return await message.reply_text(f"Lᴏɢɢɪɴɢ ᴇɴᴀʙʟᴇᴅ ғᴏʀ `{group_id}`.")
         else:
             return await message.reply_text("Fᴀɪʟᴇᴅ ᴛᴏ sᴇᴛ ʟᴏɢ ɢʀᴏᴜᴘ!")
@@ -42,7 +42,7 @@ from config import BANNED_USERS, OWNER_ID
 )
 @language
 async def settings_mar(client, message: Message, _):
-    cname = (await client.get_me()).mention
+    cname = client.me.mention
     buttons = setting_markup(_)
     await message.reply_text(
         _["setting_1"].format(cname, message.chat.id, message.chat.title),
@@ -53,7 +53,7 @@ async def settings_mar(client, message: Message, _):
 @Client.on_callback_query(filters.regex("settings_helper") & ~BANNED_USERS)
 @languageCB
 async def settings_cb(client, CallbackQuery, _):
-    cname = (await client.get_me()).mention
+    cname = client.me.mention
     try:
         await CallbackQuery.answer(_["set_cb_5"])
     except:
@@ -72,7 +72,7 @@ async def settings_cb(client, CallbackQuery, _):
 @Client.on_callback_query(filters.regex("settingsback_helper") & ~BANNED_USERS)
 @languageCB
 async def settings_back_markup(client, CallbackQuery: CallbackQuery, _):
-    cname = (await client.get_me()).mention
+    cname = client.me.mention
     try:
         await CallbackQuery.answer()
     except:
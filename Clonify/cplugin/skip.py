@@ -4,12 +4,14 @@ from pyrogram.types import InlineKeyboardMarkup, Message
 import config
 from Clonify import YouTube, app
 from Clonify.core.call import PRO
+from Clonify.core.quotas import download_slot
 from Clonify.misc import db
 from Clonify.utils.database import get_loop
 from Clonify.utils.decorators import AdminRightsCheck
 from Clonify.utils.inline import close_markup, stream_markup, stream_markup2
 from Clonify.utils.stream.autoclear import auto_clean
-from Clonify.utils.thumbnails import get_thumb
+from Clonify.utils.mediacache import reply_photo
+from Clonify.utils.thumbcache import get_card
 from config import BANNED_USERS
 from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel
 
@@ -24,7 +26,7 @@ from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_supp
 @AdminRightsCheck
 async def skip(cli, message: Message, _, chat_id):
 
-    a = await cli.get_me()
+    a = cli.me
     C_BOT_OWNER_ID = get_owner_id_from_db(a.id)
 
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(a.id)
@@ -129,8 +131,9 @@ async def skip(cli, message: Message, _, chat_id):
         except:
             return await message.reply_text(_["call_6"])
         button = stream_markup2(_, chat_id)
-        img = await get_thumb(videoid)
-        run = await message.reply_photo(
+        img = await get_card(videoid, title, user)
+        run = await reply_photo(
+            message,
             photo=img,
             caption=_["stream_1"].format(
                 f"https://t.me/NOBITA_MUSIC_TG_BOT?start=info_{videoid}",
@@ -145,12 +148,13 @@ async def skip(cli, message: Message, _, chat_id):
     elif "vid_" in queued:
         mystic = await message.reply_text(_["call_7"], disable_web_page_preview=True)
         try:
-            file_path, direct = await YouTube.download(
-                videoid,
-                mystic,
-                videoid=True,
-                video=status,
-            )
+            async with download_slot(cli.me.id):
+                file_path, direct = await YouTube.download(
+                    videoid,
+                    mystic,
+                    videoid=True,
+                    video=status,
+                )
         except:
             return await mystic.edit_text(_["call_6"])
         try:
@@ -162,8 +166,9 @@ async def skip(cli, message: Message, _, chat_id):
         except:
             return await mystic.edit_text(_["call_6"])
         button = stream_markup(_, chat_id)
-        img = await get_thumb(videoid)
-        run = await message.reply_photo(
+        img = await get_card(videoid, title, user)
+        run = await reply_photo(
+            message,
             photo=img,
             caption=_["stream_1"].format(
                 f"https://t.me/NOBITA_MUSIC_TG_BOT?start=info_{videoid}",
@@ -182,7 +187,8 @@ async def skip(cli, message: Message, _, chat_id):
         except:
             return await message.reply_text(_["call_6"])
         button = stream_markup2(_, chat_id)
-        run = await message.reply_photo(
+        run = await reply_photo(
+            message,
             photo=config.STREAM_IMG_URL,
             caption=_["stream_2"].format(user),
             reply_markup=InlineKeyboardMarkup(button),
@@ -205,7 +211,8 @@ async def skip(cli, message: Message, _, chat_id):
             return await message.reply_text(_["call_6"])
         if videoid == "telegram":
             button = stream_markup2(_, chat_id)
-            run = await message.reply_photo(
+            run = await reply_photo(
+                message,
                 photo=(
                     config.TELEGRAM_AUDIO_URL
                     if str(streamtype) == "audio"
@@ -220,7 +227,8 @@ async def skip(cli, message: Message, _, chat_id):
             db[chat_id][0]["markup"] = "tg"
         elif videoid == "soundcloud":
             button = stream_markup2(_, chat_id)
-            run = await message.reply_photo(
+            run = await reply_photo(
+                message,
                 photo=(
                     config.SOUNCLOUD_IMG_URL
                     if str(streamtype) == "audio"
@@ -235,8 +243,9 @@ async def skip(cli, message: Message, _, chat_id):
             db[chat_id][0]["markup"] = "tg"
         else:
             button = stream_markup(_, chat_id)
-            img = await get_thumb(videoid)
-            run = await message.reply_photo(
+            img = await get_card(videoid, title, user)
+            run = await reply_photo(
+                message,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/NOBITA_MUSIC_TG_BOT?start=info_{videoid}",
@@ -20,7 +20,7 @@ checker = []
 )
 @AdminRightsCheck
 async def playback(client, message: Message, _, chat_id):
-    cname = (await client.get_me()).mention
+    cname = client.me.mention
     playing = db.get(chat_id)
     if not playing:
         return await client.send_message(message.chat.id, text=_["queue_2"])
@@ -25,6 +25,7 @@ from Clonify.utils.database import (
 from Clonify.utils.decorators.language import LanguageStart
 from Clonify.utils.formatters import get_readable_time
 from Clonify.utils.inline import help_pannel, private_panel, start_panel
+from Clonify.utils.mediacache import reply_video
 from config import BANNED_USERS, OWNER_ID, STREAMI_PICS
 from strings import get_string
 
@@ -38,7 +39,7 @@ from Clonify.cplugin.setinfo import get_logging_status, get_log_channel
 @Client.on_message(filters.command(["start"]) & filters.private & ~BANNED_USERS)
 @LanguageStart
 async def start_pm(client, message: Message, _):
-    a = await client.get_me()
+    a = client.me
     # await add_served_user_clone(message.from_user.id)
     bot_id = a.id
     await add_served_user_clone(message.from_user.id, bot_id)
@@ -69,7 +70,8 @@ async def start_pm(client, message: Message, _):
         name = message.text.split(None, 1)[1]
         if name[0:4] == "help":
             keyboard = help_pannel(_)
-            return await message.reply_video(
+            return await reply_video(
+                message,
                 random.choice(STREAMI_PICS),
                 caption=_["help_1"].format(C_SUPPORT_CHAT),
                 reply_markup=keyboard,
@@ -132,7 +134,8 @@ async def start_pm(client, message: Message, _):
         app_link = f"https://t.me/{app.username}"
 
         # out = private_panel(_)
-        await message.reply_video(
+        await reply_video(
+            message,
             random.choice(STREAMI_PICS),
             caption=_["c_start_2"].format(message.from_user.mention, a.mention, app_name, app_link, app_name, app_link, C_SUPPORT_CHANNEL, C_SUPPORT_CHAT),
             reply_markup=InlineKeyboardMarkup(out),
@@ -159,7 +162,7 @@ async def start_pm(client, message: Message, _):
 @Client.on_message(filters.command(["start"]) & filters.group & ~BANNED_USERS)
 @LanguageStart
 async def start_gp(client, message: Message, _):
-    a = await client.get_me()
+    a = client.me
     #Cloned Bot Support Chat and channel
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(a.id)
     C_SUPPORT_CHAT = f"https://t.me/TNCmeetup"
@@ -175,7 +178,8 @@ async def start_gp(client, message: Message, _):
                     ],
                 ]
     uptime = int(time.time() - _boot_)
-    await message.reply_video(
+    await reply_video(
+        message,
         random.choice(STREAMI_PICS),
         caption=_["start_1"].format(a.mention, get_readable_time(uptime)),
         reply_markup=InlineKeyboardMarkup(out),
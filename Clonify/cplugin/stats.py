@@ -10,37 +10,85 @@ from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from Clonify import app
+from Clonify.core.quotas import clone_usage
 from Clonify.core.userbot import assistants
 from Clonify.misc import SUDOERS, mongodb
 from Clonify.plugins import ALL_MODULES
+from Clonify.utils.database.clonedb import get_owner_id_from_db
 from Clonify.utils.database import (
-    get_served_chats_clone,
-    get_served_users_clone,
+    count_served_chats_clone,
+    count_served_users_clone,
     get_sudoers,
+    get_top_tracks,
+    get_top_users,
 )
 from Clonify.utils.decorators.language import language, languageCB
+from Clonify.utils.formatters import leaderboard_text
 from Clonify.utils.inline.stats import back_stats_buttons, stats_buttons
+from Clonify.utils.mediacache import edit_media, reply_photo
 from config import BANNED_USERS
 
 
 @Client.on_message(filters.command(["stats", "gstats"]) & ~BANNED_USERS)
 @language
 async def stats_global(client: Client, message: Message, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
 
     upl = stats_buttons(_, True if message.from_user.id in SUDOERS else False)
-    await message.reply_photo(
+    await reply_photo(
+        message,
         photo=config.STATS_IMG_URL,
         caption=_["gstats_2"].format(a.mention),
         reply_markup=upl,
     )
 
 
+async def _user_names(client, users: list) -> dict:
+    try:
+        found = await client.get_users([user["key"] for user in users])
+    except Exception:
+        return {}
+    return {user.id: user.first_name for user in found}
+
+
+@Client.on_message(filters.command(["top", "leaderboard"]) & filters.group & ~BANNED_USERS)
+async def top_played(client, message: Message):
+    if len(message.command) > 1 and message.command[1].lower() == "global":
+        scope, scope_id, title = "clone", client.me.id, client.me.mention
+    else:
+        scope, scope_id, title = "chat", message.chat.id, message.chat.title
+    tracks = await get_top_tracks(scope, scope_id)
+    if not tracks:
+        return await message.reply_text("» ɴᴏᴛʜɪɴɢ ʜᴀs ʙᴇᴇɴ ᴘʟᴀʏᴇᴅ ʜᴇʀᴇ ʏᴇᴛ.")
+    users = await get_top_users(scope, scope_id)
+    await message.reply_text(
+        leaderboard_text(title, tracks, users, await _user_names(client, users)),
+        disable_web_page_preview=True,
+    )
+
+
+@Client.on_message(filters.command(["quota", "usage"]) & ~BANNED_USERS)
+async def clone_quota_usage(client: Client, message: Message):
+    a = client.me
+    if message.from_user.id not in SUDOERS and message.from_user.id != get_owner_id_from_db(a.id):
+        return
+    usage = clone_usage(a.id)
+    quota = usage["quota"]
+    await message.reply_text(
+        f"<u><b>{a.mention} ᴜsᴀɢᴇ</b></u> (<code>{usage['tier']}</code>)\n\n"
+        f"<b>ᴠᴏɪᴄᴇ ᴄʜᴀᴛs :</b> {usage['calls']}/{quota['calls']}\n"
+        f"<b>ᴠɪᴅᴇᴏ ᴄʜᴀᴛs :</b> {usage['video']} ({'ᴀʟʟᴏᴡᴇᴅ' if quota['video'] else 'ᴅɪsᴀʙʟᴇᴅ'})\n"
+        f"<b>ǫᴜᴇᴜᴇᴅ ᴛʀᴀᴄᴋs :</b> {usage['queued']} (ᴍᴀx {quota['queue']} ᴘᴇʀ ᴄʜᴀᴛ)\n"
+        f"<b>ᴅᴏᴡɴʟᴏᴀᴅs :</b> {usage['downloads']}/{quota['downloads']}, {usage['waiting']} ᴡᴀɪᴛɪɴɢ\n"
+        f"<b>ʙʀᴏᴀᴅᴄᴀsᴛ ʀᴀᴛᴇ :</b> {quota['broadcast_rate']:g} ᴍsɢ/s"
+    )
+
+
 @Client.on_callback_query(filters.regex("stats_back") & ~BANNED_USERS)
 @languageCB
 async def home_stats(client, CallbackQuery, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
     upl = stats_buttons(_, True if CallbackQuery.from_user.id in SUDOERS else False)
     await CallbackQuery.edit_message_text(
@@ -52,7 +100,7 @@ async def home_stats(client, CallbackQuery, _):
 @Client.on_callback_query(filters.regex("TopOverall") & ~BANNED_USERS)
 @languageCB
 async def overall_stats(client, CallbackQuery, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
     await CallbackQuery.answer()
     upl = back_stats_buttons(_)
@@ -61,8 +109,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(a.mention))
-    served_chats = len(await get_served_chats_clone(bot_id))
-    served_users = len(await get_served_users_clone(bot_id))
+    served_chats = await count_served_chats_clone(bot_id)
+    served_users = await count_served_users_clone(bot_id)
     text = _["gstats_3"].format(
         a.mention,
         len(assistants),
@@ -76,9 +124,10 @@ async def overall_stats(client, CallbackQuery, _):
     )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
-        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+        await edit_media(CallbackQuery, med, reply_markup=upl)
     except MessageIdInvalid:
-        await CallbackQuery.message.reply_photo(
+        await reply_photo(
+            CallbackQuery.message,
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
 
@@ -86,7 +135,7 @@ async def overall_stats(client, CallbackQuery, _):
 @Client.on_callback_query(filters.regex("bot_stats_sudo"))
 @languageCB
 async def bot_stats(client, CallbackQuery, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
     if CallbackQuery.from_user.id not in SUDOERS:
         return await CallbackQuery.answer(_["gstats_4"], show_alert=True)
@@ -114,8 +163,8 @@ async def bot_stats(client, CallbackQuery, _):
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats_clone(bot_id))
-    served_users = len(await get_served_users_clone(bot_id))
+    served_chats = await count_served_chats_clone(bot_id)
+    served_users = await count_served_users_clone(bot_id)
     text = _["gstats_5"].format(
         a.mention,
         len(ALL_MODULES),
@@ -141,8 +190,9 @@ async def bot_stats(client, CallbackQuery, _):
     )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
-        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+        await edit_media(CallbackQuery, med, reply_markup=upl)
     except MessageIdInvalid:
-        await CallbackQuery.message.reply_photo(
+        await reply_photo(
+            CallbackQuery.message,
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
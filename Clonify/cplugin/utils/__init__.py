@@ -1,5 +1,4 @@
 import time
-from .active import *
 from .queue import *
 from .inline import *
 from .dossier import *
@@ -1,55 +0,0 @@
-from Clonify.misc import clonedb
-
-active = []
-stream = {}
-
-
-async def is_active_chat(chat_id: int) -> bool:
-    if chat_id not in active:
-        return False
-    else:
-        return True
-
-
-async def add_active_chat(chat_id: int):
-    if chat_id not in active:
-        active.append(chat_id)
-
-
-async def remove_active_chat(chat_id: int):
-    if chat_id in active:
-        active.remove(chat_id)
-
-
-async def get_active_chats() -> list:
-    return active
-
-
-async def is_streaming(chat_id: int) -> bool:
-    run = stream.get(chat_id)
-    if not run:
-        return False
-    return run
-
-
-async def iss_streaming(chat_id: int) -> bool:
-    run = stream.get(chat_id)
-    if not run:
-        return False
-    return True
-
-
-async def stream_on(chat_id: int):
-    stream[chat_id] = True
-
-
-async def stream_off(chat_id: int):
-    stream[chat_id] = False
-
-
-async def _clear_(chat_id):
-    try:
-        clonedb[chat_id] = []
-        await remove_active_chat(chat_id)
-    except:
-        return
@@ -5,6 +5,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from Clonify import YouTube, app
 from Clonify.core.call import PRO
+from Clonify.core.leader import node_job
 from Clonify.misc import SUDOERS, db
 from Clonify.utils.database import (
     get_active_chats,
@@ -28,7 +29,8 @@ from Clonify.utils.decorators.language import languageCB
 from Clonify.utils.formatters import seconds_to_min
 from Clonify.utils.inline import close_markup, stream_markup, stream_markup_timer
 from Clonify.utils.stream.autoclear import auto_clean
-from Clonify.utils.thumbnails import get_thumb
+from Clonify.utils.mediacache import reply_photo
+from Clonify.utils.thumbcache import get_card
 import config
 from config import (
     BANNED_USERS,
@@ -247,8 +249,9 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
             button = stream_markup(_, chat_id)
-            img = await get_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
+            img = await get_card(videoid, title, user)
+            run = await reply_photo(
+                CallbackQuery.message,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{app.username}?start=info_{videoid}",
@@ -283,8 +286,9 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 return await mystic.edit_text(_["call_6"])
             button = stream_markup(_, chat_id)
-            img = await get_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
+            img = await get_card(videoid, title, user)
+            run = await reply_photo(
+                CallbackQuery.message,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{app.username}?start=info_{videoid}",
@@ -304,7 +308,8 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
             button = stream_markup(_, chat_id)
-            run = await CallbackQuery.message.reply_photo(
+            run = await reply_photo(
+                CallbackQuery.message,
                 photo=STREAM_IMG_URL,
                 caption=_["stream_2"].format(user),
                 reply_markup=InlineKeyboardMarkup(button),
@@ -328,7 +333,8 @@ async def del_back_playlist(client, CallbackQuery, _):
                 return await CallbackQuery.message.reply_text(_["call_6"])
             if videoid == "telegram":
                 button = stream_markup(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                run = await reply_photo(
+                    CallbackQuery.message,
                     photo=TELEGRAM_AUDIO_URL
                     if str(streamtype) == "audio"
                     else TELEGRAM_VIDEO_URL,
@@ -341,7 +347,8 @@ async def del_back_playlist(client, CallbackQuery, _):
                 db[chat_id][0]["markup"] = "tg"
             elif videoid == "soundcloud":
                 button = stream_markup(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                run = await reply_photo(
+                    CallbackQuery.message,
                     photo=SOUNCLOUD_IMG_URL
                     if str(streamtype) == "audio"
                     else TELEGRAM_VIDEO_URL,
@@ -354,8 +361,9 @@ async def del_back_playlist(client, CallbackQuery, _):
                 db[chat_id][0]["markup"] = "tg"
             else:
                 button = stream_markup(_, chat_id)
-                img = await get_thumb(videoid)
-                run = await CallbackQuery.message.reply_photo(
+                img = await get_card(videoid, title, user)
+                run = await reply_photo(
+                    CallbackQuery.message,
                     photo=img,
                     caption=_["stream_1"].format(
                         f"https://t.me/{app.username}?start=info_{videoid}",
@@ -414,4 +422,4 @@ async def markup_timer():
                 continue
 
 
-asyncio.create_task(markup_timer())
+node_job("markup_timer", markup_timer)
@@ -15,14 +15,15 @@ from Clonify.utils import bot_sys_stats
 from Clonify.utils.database import (
     add_served_chat,
     add_served_user,
-    blacklisted_chats,
     get_lang,
+    is_blacklisted_chat,
     is_banned_user,
     is_on_off,
 )
 from Clonify.utils.decorators.language import LanguageStart
 from Clonify.utils.formatters import get_readable_time
 from Clonify.utils.inline import help_pannel, private_panel, start_panel
+from Clonify.utils.mediacache import reply_video
 from config import BANNED_USERS, STREAMI_PICS, GREET
 from strings import get_string
 
@@ -51,7 +52,8 @@ async def start_pm(client, message: Message, _):
         # Help menu
         if name[0:4] == "help":
             keyboard = help_pannel(_)
-            return await message.reply_video(
+            return await reply_video(
+                message,
                 random.choice(STREAMI_PICS),
                 caption=_["help_1"].format(config.SUPPORT_CHAT),
                 reply_markup=keyboard,
@@ -115,7 +117,8 @@ async def start_pm(client, message: Message, _):
     # Default private start
     else:
         out = private_panel(_)
-        await message.reply_video(
+        await reply_video(
+            message,
             random.choice(STREAMI_PICS),
             caption=_["start_2"].format(message.from_user.mention, app.mention),
             reply_markup=InlineKeyboardMarkup(out),
@@ -138,7 +141,8 @@ async def start_gp(client, message: Message, _):
     out = start_panel(_)
     uptime = int(time.time() - _boot_)
 
-    await message.reply_video(
+    await reply_video(
+        message,
         random.choice(STREAMI_PICS),
         caption=_["start_1"].format(app.mention, get_readable_time(uptime)),
         reply_markup=InlineKeyboardMarkup(out),
@@ -169,7 +173,7 @@ async def welcome(client, message: Message):
                     await message.reply_text(_["start_4"])
                     return await app.leave_chat(message.chat.id)
 
-                if message.chat.id in await blacklisted_chats():
+                if await is_blacklisted_chat(message.chat.id):
                     await message.reply_text(
                         _["start_5"].format(
                             app.mention,
@@ -1,29 +1,25 @@
 import asyncio
 
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.errors import FloodWait
 
 from Clonify import app
+from Clonify.core.broadcast import progress_text, set_broadcast_status, start_broadcast
 from Clonify.misc import SUDOERS
-from Clonify.utils.database import (
-    get_active_chats,
-    get_authuser_names,
-    get_client,
-    get_served_chats,
-    get_served_users,
-)
+from Clonify.utils.database import get_client
 from Clonify.utils.decorators.language import language
-from Clonify.utils.formatters import alpha_to_int
-from config import adminlist
 
-IS_BROADCASTING = False
+BROADCAST_COMMANDS = {
+    "pausebroadcast": "paused",
+    "resumebroadcast": "running",
+    "cancelbroadcast": "cancelled",
+}
 
 
 @app.on_message(filters.command("broadcast") & SUDOERS)
 @language
 async def braodcast_message(client, message, _):
-    global IS_BROADCASTING
+    query = None
     if message.reply_to_message:
         x = message.reply_to_message.id
         y = message.chat.id
@@ -31,88 +27,35 @@ async def braodcast_message(client, message, _):
         if len(message.command) < 2:
             return await message.reply_text(_["broad_2"])
         query = message.text.split(None, 1)[1]
-        if "-pin" in query:
-            query = query.replace("-pin", "")
-        if "-nobot" in query:
-            query = query.replace("-nobot", "")
-        if "-pinloud" in query:
-            query = query.replace("-pinloud", "")
-        if "-assistant" in query:
-            query = query.replace("-assistant", "")
-        if "-user" in query:
-            query = query.replace("-user", "")
-        if query == "":
+        for flag in ["-pinloud", "-pin", "-nobot", "-assistant", "-user"]:
+            query = query.replace(flag, "")
+        if query.strip() == "":
             return await message.reply_text(_["broad_8"])
 
-    IS_BROADCASTING = True
-    await message.reply_text(_["broad_1"])
-
+    kinds = []
     if "-nobot" not in message.text:
-        sent = 0
-        pin = 0
-        chats = []
-        schats = await get_served_chats()
-        for chat in schats:
-            chats.append(int(chat["chat_id"]))
-        for i in chats:
-            try:
-                m = (
-                    await app.forward_messages(i, y, x)
-                    if message.reply_to_message
-                    else await app.send_message(i, text=query)
-                )
-                if "-pin" in message.text:
-                    try:
-                        await m.pin(disable_notification=True)
-                        pin += 1
-                    except:
-                        continue
-                elif "-pinloud" in message.text:
-                    try:
-                        await m.pin(disable_notification=False)
-                        pin += 1
-                    except:
-                        continue
-                sent += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                continue
-        try:
-            await message.reply_text(_["broad_3"].format(sent, pin))
-        except:
-            pass
-
+        kinds.append("chats")
     if "-user" in message.text:
-        susr = 0
-        served_users = []
-        susers = await get_served_users()
-        for user in susers:
-            served_users.append(int(user["user_id"]))
-        for i in served_users:
-            try:
-                m = (
-                    await app.forward_messages(i, y, x)
-                    if message.reply_to_message
-                    else await app.send_message(i, text=query)
-                )
-                susr += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                pass
-        try:
-            await message.reply_text(_["broad_4"].format(susr))
-        except:
-            pass
+        kinds.append("users")
+    if "-pinloud" in message.text:
+        pin = "loud"
+    elif "-pin" in message.text:
+        pin = "silent"
+    else:
+        pin = None
+
+    report = await message.reply_text(_["broad_1"])
+    if kinds:
+        await start_broadcast(
+            app,
+            0,
+            kinds,
+            report,
+            text=query,
+            from_chat_id=y if message.reply_to_message else None,
+            message_id=x if message.reply_to_message else None,
+            pin=pin,
+        )
 
     if "-assistant" in message.text:
         aw = await message.reply_text(_["broad_5"])
@@ -143,27 +86,17 @@ async def braodcast_message(client, message, _):
             await aw.edit_text(text)
         except:
             pass
-    IS_BROADCASTING = False
 
 
-async def auto_clean():
-    while not await asyncio.sleep(10):
-        try:
-            served_chats = await get_active_chats()
-            for chat_id in served_chats:
-                if chat_id not in adminlist:
-                    adminlist[chat_id] = []
-                    async for user in app.get_chat_members(
-                        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
-                    ):
-                        if user.privileges.can_manage_video_chats:
-                            adminlist[chat_id].append(user.user.id)
-                    authusers = await get_authuser_names(chat_id)
-                    for user in authusers:
-                        user_id = await alpha_to_int(user)
-                        adminlist[chat_id].append(user_id)
-        except:
-            continue
-
+@app.on_message(
+    filters.command(["pausebroadcast", "resumebroadcast", "cancelbroadcast"])
+    & SUDOERS
+)
+async def broadcast_control(client, message):
+    status = BROADCAST_COMMANDS[message.command[0].lower()]
+    job_id = message.command[1] if len(message.command) > 1 else None
+    job = await set_broadcast_status(0, status, job_id)
+    if not job:
+        return await message.reply_text("» ɴᴏ ᴍᴀᴛᴄʜɪɴɢ ʙʀᴏᴀᴅᴄᴀsᴛ ғᴏᴜɴᴅ.")
+    await message.reply_text(progress_text(job))
 
-asyncio.create_task(auto_clean())
@@ -1,5 +1,6 @@
 import asyncio
 
+from Clonify.core.leader import node_job
 from Clonify.misc import db
 from Clonify.utils.database import get_active_chats, is_music_playing
 
@@ -21,4 +22,4 @@ async def timer():
             db[chat_id][0]["played"] += 1
 
 
-asyncio.create_task(timer())
+node_job("seeker_timer", timer)
@@ -3,6 +3,7 @@ from pyrogram.enums import ChatMembersFilter, ChatMemberStatus, ChatType
 from pyrogram.types import Message
 
 from Clonify import app
+from Clonify.utils.chatcache import get_chat_info
 from Clonify.utils.database import set_cmode
 from Clonify.utils.decorators.admins import AdminActual
 from config import BANNED_USERS
@@ -18,12 +19,14 @@ async def playmode_(client, message: Message, _):
         await set_cmode(message.chat.id, None)
         return await message.reply_text(_["cplay_7"])
     elif str(query) == "linked":
-        chat = await app.get_chat(message.chat.id)
-        if chat.linked_chat:
-            chat_id = chat.linked_chat.id
+        linked = (await get_chat_info(app, message.chat.id, full=True))[
+            "linked_chat"
+        ]
+        if linked:
+            chat_id = linked["id"]
             await set_cmode(message.chat.id, chat_id)
             return await message.reply_text(
-                _["cplay_3"].format(chat.linked_chat.title, chat.linked_chat.id)
+                _["cplay_3"].format(linked["title"], linked["id"])
             )
         else:
             return await message.reply_text(_["cplay_2"])
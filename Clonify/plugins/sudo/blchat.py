@@ -3,7 +3,12 @@ from pyrogram.types import Message
 
 from Clonify import app
 from Clonify.misc import SUDOERS
-from Clonify.utils.database import blacklist_chat, blacklisted_chats, whitelist_chat
+from Clonify.utils.database import (
+    blacklist_chat,
+    is_blacklisted_chat,
+    iter_blacklisted_chats,
+    whitelist_chat,
+)
 from Clonify.utils.decorators.language import language
 from config import BANNED_USERS
 
@@ -14,7 +19,7 @@ async def blacklist_chat_func(client, message: Message, _):
     if len(message.command) != 2:
         return await message.reply_text(_["black_1"])
     chat_id = int(message.text.strip().split()[1])
-    if chat_id in await blacklisted_chats():
+    if await is_blacklisted_chat(chat_id):
         return await message.reply_text(_["black_2"])
     blacklisted = await blacklist_chat(chat_id)
     if blacklisted:
@@ -35,7 +40,7 @@ async def white_funciton(client, message: Message, _):
     if len(message.command) != 2:
         return await message.reply_text(_["black_4"])
     chat_id = int(message.text.strip().split()[1])
-    if chat_id not in await blacklisted_chats():
+    if not await is_blacklisted_chat(chat_id):
         return await message.reply_text(_["black_5"])
     whitelisted = await whitelist_chat(chat_id)
     if whitelisted:
@@ -48,7 +53,9 @@ async def white_funciton(client, message: Message, _):
 async def all_chats(client, message: Message, _):
     text = _["black_7"]
     j = 0
-    for count, chat_id in enumerate(await blacklisted_chats(), 1):
+    count = 0
+    async for chat_id in iter_blacklisted_chats():
+        count += 1
         try:
             title = (await app.get_chat(chat_id)).title
         except:
@@ -1,24 +1,29 @@
-import asyncio
-
 from pyrogram import filters
-from pyrogram.errors import FloodWait
 from pyrogram.types import Message
 
+import config
 from Clonify import app
+from Clonify.core.broadcast import progress_text, set_broadcast_status, start_gban
 from Clonify.misc import SUDOERS
 from Clonify.utils import get_readable_time
 from Clonify.utils.database import (
     add_banned_user,
+    count_served_chats,
     get_banned_count,
-    get_banned_users,
-    get_served_chats,
     is_banned_user,
+    iter_banned_users,
     remove_banned_user,
 )
 from Clonify.utils.decorators.language import language
 from Clonify.utils.extraction import extract_user
 from config import BANNED_USERS
 
+GBAN_COMMANDS = {
+    "pausegban": "paused",
+    "resumegban": "running",
+    "cancelgban": "cancelled",
+}
+
 
 @app.on_message(filters.command(["gban", "globalban"]) & SUDOERS)
 @language
@@ -38,34 +43,21 @@ async def global_ban(client, message: Message, _):
         return await message.reply_text(_["gban_4"].format(user.mention))
     if user.id not in BANNED_USERS:
         BANNED_USERS.add(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
-    time_expected = get_readable_time(len(served_chats))
-    mystic = await message.reply_text(_["gban_5"].format(user.mention, time_expected))
-    number_of_chats = 0
-    for chat_id in served_chats:
-        try:
-            await app.ban_chat_member(chat_id, user.id)
-            number_of_chats += 1
-        except FloodWait as fw:
-            await asyncio.sleep(int(fw.value))
-        except:
-            continue
     await add_banned_user(user.id)
-    await message.reply_text(
-        _["gban_6"].format(
-            app.mention,
-            message.chat.title,
-            message.chat.id,
-            user.mention,
-            user.id,
-            message.from_user.mention,
-            number_of_chats,
-        )
+    time_expected = get_readable_time(
+        int(await count_served_chats() / config.BROADCAST_RATE)
+    )
+    mystic = await message.reply_text(_["gban_5"].format(user.mention, time_expected))
+    await start_gban(
+        app,
+        user.id,
+        mystic,
+        bot=app.mention,
+        chat_title=message.chat.title,
+        chat_id=message.chat.id,
+        user=user.mention,
+        by=message.from_user.mention,
     )
-    await mystic.delete()
 
 
 @app.on_message(filters.command(["ungban"]) & SUDOERS)
@@ -80,24 +72,12 @@ async def global_un(client, message: Message, _):
         return await message.reply_text(_["gban_7"].format(user.mention))
     if user.id in BANNED_USERS:
         BANNED_USERS.remove(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
-    time_expected = get_readable_time(len(served_chats))
-    mystic = await message.reply_text(_["gban_8"].format(user.mention, time_expected))
-    number_of_chats = 0
-    for chat_id in served_chats:
-        try:
-            await app.unban_chat_member(chat_id, user.id)
-            number_of_chats += 1
-        except FloodWait as fw:
-            await asyncio.sleep(int(fw.value))
-        except:
-            continue
     await remove_banned_user(user.id)
-    await message.reply_text(_["gban_9"].format(user.mention, number_of_chats))
-    await mystic.delete()
+    time_expected = get_readable_time(
+        int(await count_served_chats() / config.BROADCAST_RATE)
+    )
+    mystic = await message.reply_text(_["gban_8"].format(user.mention, time_expected))
+    await start_gban(app, user.id, mystic, unban=True, user=user.mention)
 
 
 @app.on_message(filters.command(["gbannedusers", "gbanlist"]) & SUDOERS)
@@ -109,8 +89,7 @@ async def gbanned_list(client, message: Message, _):
     mystic = await message.reply_text(_["gban_11"])
     msg = _["gban_12"]
     count = 0
-    users = await get_banned_users()
-    for user_id in users:
+    async for user_id in iter_banned_users():
         count += 1
         try:
             user = await app.get_users(user_id)
@@ -123,3 +102,13 @@ async def gbanned_list(client, message: Message, _):
         return await mystic.edit_text(_["gban_10"])
     else:
         return await mystic.edit_text(msg)
+
+
+@app.on_message(filters.command(["pausegban", "resumegban", "cancelgban"]) & SUDOERS)
+async def gban_control(client, message: Message):
+    status = GBAN_COMMANDS[message.command[0].lower()]
+    job_id = message.command[1] if len(message.command) > 1 else None
+    job = await set_broadcast_status(0, status, job_id, actions=("ban", "unban"))
+    if not job:
+        return await message.reply_text("» ɴᴏ ᴍᴀᴛᴄʜɪɴɢ ɢʟᴏʙᴀʟ ʙᴀɴ ғᴏᴜɴᴅ.")
+    await message.reply_text(progress_text(job))
@@ -4,7 +4,9 @@ from unidecode import unidecode
 
 from Clonify import app
 from Clonify.misc import SUDOERS
+from Clonify.utils.chatcache import get_chats_info
 from Clonify.utils.database import (
+    call_counts,
     get_active_chats,
     get_active_video_chats,
     remove_active_chat,
@@ -18,23 +20,18 @@ async def activevc(_, message: Message):
     served_chats = await get_active_chats()
     text = ""
     j = 0
+    chats = await get_chats_info(app, served_chats)
     for x in served_chats:
-        try:
-            title = (await app.get_chat(x)).title
-        except:
+        chat = chats[x]
+        if chat is None:
             await remove_active_chat(x)
             continue
-        try:
-            if (await app.get_chat(x)).username:
-                user = (await app.get_chat(x)).username
-                text += f"<b>{j + 1}.</b> <a href=https://t.me/{user}>{unidecode(title).upper()}</a>\n"
-            else:
-                text += (
-                    f"<b>{j + 1}.</b> {unidecode(title).upper()}\n"
-                )
-            j += 1
-        except:
-            continue
+        title = unidecode(chat["title"] or "").upper()
+        if chat["username"]:
+            text += f"<b>{j + 1}.</b> <a href=https://t.me/{chat['username']}>{title}</a>\n"
+        else:
+            text += f"<b>{j + 1}.</b> {title}\n"
+        j += 1
     if not text:
         await mystic.edit_text(f"» ɴᴏ ᴀᴄᴛɪᴠᴇ ᴠᴏɪᴄᴇ ᴄʜᴀᴛs ᴏɴ {app.mention}.")
     else:
@@ -50,23 +47,18 @@ async def activevi_(_, message: Message):
     served_chats = await get_active_video_chats()
     text = ""
     j = 0
+    chats = await get_chats_info(app, served_chats)
     for x in served_chats:
-        try:
-            title = (await app.get_chat(x)).title
-        except:
+        chat = chats[x]
+        if chat is None:
             await remove_active_video_chat(x)
             continue
-        try:
-            if (await app.get_chat(x)).username:
-                user = (await app.get_chat(x)).username
-                text += f"<b>{j + 1}.</b> <a href=https://t.me/{user}>{unidecode(title).upper()}</a> [<code>{x}</code>]\n"
-            else:
-                text += (
-                    f"<b>{j + 1}.</b> {unidecode(title).upper()} [<code>{x}</code>]\n"
-                )
-            j += 1
-        except:
-            continue
+        title = unidecode(chat["title"] or "").upper()
+        if chat["username"]:
+            text += f"<b>{j + 1}.</b> <a href=https://t.me/{chat['username']}>{title}</a> [<code>{x}</code>]\n"
+        else:
+            text += f"<b>{j + 1}.</b> {title} [<code>{x}</code>]\n"
+        j += 1
     if not text:
         await mystic.edit_text(f"» ɴᴏ ᴀᴄᴛɪᴠᴇ ᴠɪᴅᴇᴏ ᴄʜᴀᴛs ᴏɴ {app.mention}.")
     else:
@@ -77,6 +69,8 @@ async def activevi_(_, message: Message):
 
 @app.on_message(filters.command(["ac","av"]) & SUDOERS)
 async def start(client: Client, message: Message):
-    ac_audio = str(len(await get_active_chats()))
-    ac_video = str(len(await get_active_video_chats()))
-    await message.reply_text(f"✫ <b><u>ᴀᴄᴛɪᴠᴇ ᴄʜᴀᴛs ɪɴғᴏ</u></b> :\n\nᴠᴏɪᴄᴇ : {ac_audio}\nᴠɪᴅᴇᴏ  : {ac_video}", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton('✯ ᴄʟᴏsᴇ ✯', callback_data=f"close")]]))
+    counts = call_counts()
+    text = f"✫ <b><u>ᴀᴄᴛɪᴠᴇ ᴄʜᴀᴛs ɪɴғᴏ</u></b> :\n\nᴠᴏɪᴄᴇ : {counts['total']}\nᴠɪᴅᴇᴏ  : {counts['video']}\nᴄʟᴏɴᴇs : {counts['clones']}\n"
+    for number, load in sorted(counts["assistants"].items(), key=lambda x: str(x[0])):
+        text += f"\nᴀssɪsᴛᴀɴᴛ {number} : {load}"
+    await message.reply_text(text, reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton('✯ ᴄʟᴏsᴇ ✯', callback_data=f"close")]]))
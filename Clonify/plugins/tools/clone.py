@@ -1,23 +1,33 @@
-import re
 import logging
-import asyncio
-import importlib
-from sys import argv
-from pyrogram import idle
-from pyrogram import Client, filters
-from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+import time
+from pyrogram import filters
 from pyrogram.errors.exceptions.bad_request_400 import (
     AccessTokenExpired,
     AccessTokenInvalid,
 )
-from Clonify.utils.database import get_assistant
-from config import API_ID, API_HASH
 from Clonify import app
-from config import OWNER_ID
+from Clonify.core.clones import (
+    adopt_clone,
+    clone_status,
+    discard_clone,
+    reconcile_clones,
+    restart_clone,
+    start_clone,
+)
+from Clonify.core.shards import heartbeat_node, owner_of, owns
 from Clonify.misc import SUDOERS
-from Clonify.utils.database import get_assistant, clonebotdb
-from Clonify.utils.database.clonedb import has_user_cloned_any_bot
-from config import LOGGER_ID, CLONE_LOGGER
+from Clonify.utils.database import get_assistant
+from Clonify.utils.database.clonedb import (
+    add_clonebot,
+    delete_all_clonebots,
+    delete_clonebot,
+    find_clonebot,
+    get_clonebot,
+    get_clonebots,
+    get_user_clonebots,
+    has_user_cloned_any_bot,
+)
+from config import CLONE_LOGGER
 import requests
 from Clonify.utils.decorators.language import language
 import pyrogram.errors
@@ -25,9 +35,6 @@ import pyrogram.errors
 from Clonify.utils.database.clonedb import get_owner_id_from_db
 from config import SUPPORT_CHAT, OWNER_ID
 
-from datetime import datetime
-CLONES = set()
-
 C_BOT_DESC = "Wᴀɴᴛ ᴀ ʙᴏᴛ ʟɪᴋᴇ ᴛʜɪs? Cʟᴏɴᴇ ɪᴛ ɴᴏᴡ! ✅\n\nVɪsɪᴛ: @AyakaXMusicBot ᴛᴏ ɢᴇᴛ sᴛᴀʀᴛᴇᴅ!\n\n - Uᴘᴅᴀᴛᴇ: @TechNodeCoders\n - Oᴡɴᴇʀ: @SemxyCarders"
 
 C_BOT_COMMANDS = [
@@ -63,17 +70,9 @@ async def clone_txt(client, message, _):
         bot_token = message.text.split("/clone", 1)[1].strip()
         mi = await message.reply_text(_["C_B_H_2"])
         try:
-            ai = Client(
-                bot_token,
-                API_ID,
-                API_HASH,
-                bot_token=bot_token,
-                plugins=dict(root="Clonify.cplugin"), 
-            )
-            await ai.start()
-            bot = await ai.get_me()
-            bot_users = await ai.get_users(bot.username)
-            bot_id = bot_users.id
+            ai = await start_clone(bot_token)
+            bot = ai.me
+            bot_id = bot.id
             c_b_owner_fname = message.from_user.first_name
             c_bot_owner = message.from_user.id
 
@@ -81,13 +80,11 @@ async def clone_txt(client, message, _):
             await mi.edit_text(_["C_B_H_3"])
             return
         except Exception as e:
-            if "database is locked" in str(e).lower():
-                await message.reply_text(_["C_B_H_4"])
-            else:
-                await mi.edit_text(f"An error occurred: {str(e)}")
+            await mi.edit_text(f"An error occurred: {str(e)}")
             return
 
         await mi.edit_text(_["C_B_H_5"])
+        registered = False
         try:
 
             await app.send_message(
@@ -107,8 +104,9 @@ async def clone_txt(client, message, _):
                 "premium" : False,
                 "Date" : False,
             }
-            clonebotdb.insert_one(details)
-            CLONES.add(bot.id)
+            await add_clonebot(details)
+            registered = True
+            await adopt_clone(ai)
 
             def set_bot_commands():
                 url = f"https://api.telegram.org/bot{bot_token}/setMyCommands"
@@ -133,6 +131,8 @@ async def clone_txt(client, message, _):
             await mi.edit_text(_["C_B_H_6"].format(bot.username))
         except BaseException as e:
             logging.exception("Error while cloning bot.")
+            if not registered:
+                await discard_clone(bot_id)
             await mi.edit_text(
                 f"⚠️ <b>ᴇʀʀᴏʀ:</b>\n\n<code>{e}</code>\n\n**ᴋɪɴᴅʟʏ ғᴏᴡᴀʀᴅ ᴛʜɪs ᴍᴇssᴀɢᴇ ᴛᴏ @SemxyCarders ᴛᴏ ɢᴇᴛ ᴀssɪsᴛᴀɴᴄᴇ**"
             )
@@ -165,7 +165,7 @@ async def delete_cloned_bot(client, message, _):
             query_value = query_value[1:]
         await message.reply_text(_["C_B_H_9"])
 
-        cloned_bot = clonebotdb.find_one({"$or": [{"token": query_value}, {"username": query_value}]})
+        cloned_bot = find_clonebot(query_value)
         
         if cloned_bot:
 
@@ -181,8 +181,7 @@ async def delete_cloned_bot(client, message, _):
             if message.from_user.id not in OWNERS:
                 return await message.reply_text(_["NOT_C_OWNER"].format(SUPPORT_CHAT))
 
-            clonebotdb.delete_one({"_id": cloned_bot["_id"]})
-            CLONES.remove(cloned_bot["bot_id"])
+            await delete_clonebot(cloned_bot["bot_id"])
 
             await message.reply_text(_["C_B_H_10"])
             await app.send_message(
@@ -199,45 +198,21 @@ async def delete_cloned_bot(client, message, _):
 
 
 async def restart_bots():
-    global CLONES
     try:
         logging.info("Restarting all cloned bots........")
-        bots = list(clonebotdb.find())
-        botNumber = 1
-        for bot in bots:
-            bot_token = bot["token"]
-
-            url = f"https://api.telegram.org/bot{bot_token}/getMe"
-            response = requests.get(url)
-            if response.status_code != 200:
-                logging.error(f"Invalid or expired token for bot: {bot_token}")
-                clonebotdb.delete_one({"token": bot_token})
-                continue
-
-            ai = Client(
-                f"{bot_token}",
-                API_ID,
-                API_HASH,
-                bot_token=bot_token,
-                plugins=dict(root="Clonify.cplugin"),
-            )
-            await ai.start()
-            print(botNumber)
-            botNumber += 1
-
-            bot = await ai.get_me()
-            if bot.id not in CLONES:
-                try:
-                    CLONES.add(bot.id)
-                except Exception:
-                    pass
-
-            await asyncio.sleep(5)
-
-        await app.send_message(
-                CLONE_LOGGER, f"All Cloned Bots Started !"
+        await heartbeat_node()
+        report = await reconcile_clones()
+        text = (
+            f"**Cloned Bots Started:** `{report['started']}/{report['total']}`\n"
+            f"**Time Taken:** `{report['elapsed']:.1f}s`\n"
+            f"**Slowest Clone:** `{report['slowest']:.1f}s`"
+        )
+        if report["failed"]:
+            text += "\n\n**Failed:**\n" + "\n".join(
+                f"`{bot_id}`: {error}" for bot_id, error in report["failed"].items()
             )
-    except Exception as e:
+        await app.send_message(CLONE_LOGGER, text[:4096])
+    except Exception:
         logging.exception("Error while restarting bots.")
 
 # Zeo
@@ -247,9 +222,7 @@ async def delete_all_cloned_bots(client, message, _):
     try:
         await message.reply_text(_["C_B_H_14"])
 
-        clonebotdb.delete_many({})
-
-        CLONES.clear()
+        await delete_all_clonebots()
 
         await message.reply_text(_["C_B_H_15"])
     except Exception as e:
@@ -262,7 +235,7 @@ async def delete_all_cloned_bots(client, message, _):
 async def my_cloned_bots(client, message, _):
     try:
         user_id = message.from_user.id
-        cloned_bots = list(clonebotdb.find({"user_id": user_id}))
+        cloned_bots = get_user_clonebots(user_id)
         
         if not cloned_bots:
             await message.reply_text(_["C_B_H_16"])
@@ -286,7 +259,7 @@ async def my_cloned_bots(client, message, _):
 @language
 async def list_cloned_bots(client, message, _):
     try:
-        cloned_bots = list(clonebotdb.find())
+        cloned_bots = get_clonebots()
         if not cloned_bots:
             await message.reply_text(_["C_B_H_13"])
             return
@@ -328,9 +301,9 @@ async def list_cloned_bots(client, message, _):
 #total clone
 @app.on_message(filters.command("totalbots") & SUDOERS)
 @language
-async def list_cloned_bots(client, message, _):
+async def total_cloned_bots(client, message, _):
     try:
-        cloned_bots = list(clonebotdb.find())
+        cloned_bots = get_clonebots()
         if not cloned_bots:
             await message.reply_text("No bots have been cloned yet.")
             return
@@ -342,3 +315,62 @@ async def list_cloned_bots(client, message, _):
     except Exception as e:
         logging.exception(e)
         await message.reply_text("An error occurred while listing cloned bots.")
+
+
+def _ago(timestamp) -> str:
+    if not timestamp:
+        return "-"
+    seconds = int(time.time() - timestamp)
+    return f"{seconds // 60}m" if seconds >= 60 else f"{seconds}s"
+
+
+@app.on_message(filters.command("clonestatus") & SUDOERS)
+async def clone_status_table(client, message):
+    if not clone_status:
+        return await message.reply_text("No clone has been started on this node.")
+    lines = []
+    for bot_id, status in sorted(
+        clone_status.items(), key=lambda item: (item[1]["state"] == "running", item[0])
+    ):
+        bot = get_clonebot(bot_id) or {}
+        rtt = f"{status['rtt'] * 1000:.0f}ms" if status["rtt"] is not None else "-"
+        line = (
+            f"<code>{bot_id}</code> @{bot.get('username', '?')} <b>{status['state']}</b>"
+            f" | ᴘɪɴɢ {rtt} | ʟᴀsᴛ ᴜᴘᴅᴀᴛᴇ {_ago(status['last_update'])}"
+            f" | ᴇʀʀᴏʀs {status['error_rate']:.0%} | ʀᴇsᴛᴀʀᴛs {status['restarts']}"
+        )
+        if status["state"] == "failed":
+            line += f" | ʀᴇᴛʀʏ ɪɴ {max(0, int(status['retry_at'] - time.time()))}s"
+        if status["error"] and status["state"] != "running":
+            line += f"\n  └ {status['error'][:100]}"
+        lines.append(line)
+    running = len([s for s in clone_status.values() if s["state"] == "running"])
+    text = f"<b>Cʟᴏɴᴇs ʀᴜɴɴɪɴɢ:</b> {running}/{len(clone_status)}\n\n"
+    for line in lines:
+        if len(text) + len(line) > 4000:
+            await message.reply_text(text)
+            text = ""
+        text += line + "\n"
+    await message.reply_text(text)
+
+
+@app.on_message(filters.command("restartclone") & SUDOERS)
+async def restart_one_clone(client, message):
+    if len(message.command) < 2:
+        return await message.reply_text("Usage: /restartclone [bot id | @username]")
+    query = message.command[1].lstrip("@")
+    bot = get_clonebot(int(query)) if query.isdigit() else find_clonebot(query)
+    if not bot:
+        return await message.reply_text("No such cloned bot.")
+    if not owns(bot["bot_id"]):
+        return await message.reply_text(
+            f"@{bot['username']} runs on node <code>{owner_of(bot['bot_id'])}</code>."
+        )
+    mystic = await message.reply_text(f"Restarting @{bot['username']}...")
+    if await restart_clone(bot["bot_id"]):
+        return await mystic.edit_text(f"@{bot['username']} restarted.")
+    status = clone_status.get(bot["bot_id"], {})
+    await mystic.edit_text(
+        f"@{bot['username']} could not be restarted ({status.get('state')}): "
+        f"{status.get('error')}"
+    )
@@ -8,6 +8,7 @@ from Clonify.core.call import PRO
 from Clonify.utils import bot_sys_stats
 from Clonify.utils.decorators.language import language
 from Clonify.utils.inline import supp_markup
+from Clonify.utils.mediacache import reply_photo
 from config import BANNED_USERS
 from config import PING_IMG_URL
 
@@ -16,7 +17,8 @@ from config import PING_IMG_URL
 @language
 async def ping_com(client, message: Message, _):
     start = datetime.now()
-    response = await message.reply_photo(
+    response = await reply_photo(
+        message,
         photo=PING_IMG_URL,
         caption=_["ping_1"].format(app.mention),
     )
@@ -10,12 +10,21 @@ from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from Clonify import app
+from Clonify.core.cache import cache_stats
 from Clonify.core.userbot import assistants
 from Clonify.misc import SUDOERS, mongodb
 from Clonify.plugins import ALL_MODULES
-from Clonify.utils.database import get_served_chats, get_served_users, get_sudoers
+from Clonify.utils.database import (
+    count_served_chats,
+    count_served_users,
+    get_sudoers,
+    get_top_tracks,
+    get_top_users,
+)
 from Clonify.utils.decorators.language import language, languageCB
+from Clonify.utils.formatters import leaderboard_text
 from Clonify.utils.inline.stats import back_stats_buttons, stats_buttons
+from Clonify.utils.mediacache import edit_media, reply_photo
 from config import BANNED_USERS
 
 
@@ -23,13 +32,38 @@ from config import BANNED_USERS
 @language
 async def stats_global(client, message: Message, _):
     upl = stats_buttons(_, True if message.from_user.id in SUDOERS else False)
-    await message.reply_photo(
+    await reply_photo(
+        message,
         photo=config.STATS_IMG_URL,
         caption=_["gstats_2"].format(app.mention),
         reply_markup=upl,
     )
 
 
+async def _user_names(client, users: list) -> dict:
+    try:
+        found = await client.get_users([user["key"] for user in users])
+    except Exception:
+        return {}
+    return {user.id: user.first_name for user in found}
+
+
+@app.on_message(filters.command(["top", "leaderboard"]) & filters.group & ~BANNED_USERS)
+async def top_played(client, message: Message):
+    if len(message.command) > 1 and message.command[1].lower() == "global":
+        scope, scope_id, title = "global", 0, f"{app.mention} ɢʟᴏʙᴀʟ"
+    else:
+        scope, scope_id, title = "chat", message.chat.id, message.chat.title
+    tracks = await get_top_tracks(scope, scope_id)
+    if not tracks:
+        return await message.reply_text("» ɴᴏᴛʜɪɴɢ ʜᴀs ʙᴇᴇɴ ᴘʟᴀʏᴇᴅ ʜᴇʀᴇ ʏᴇᴛ.")
+    users = await get_top_users(scope, scope_id)
+    await message.reply_text(
+        leaderboard_text(title, tracks, users, await _user_names(client, users)),
+        disable_web_page_preview=True,
+    )
+
+
 @app.on_callback_query(filters.regex("stats_back") & ~BANNED_USERS)
 @languageCB
 async def home_stats(client, CallbackQuery, _):
@@ -50,8 +84,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(app.mention))
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await count_served_chats()
+    served_users = await count_served_users()
 
     text = _["gstats_3"].format(
         app.mention,
@@ -66,9 +100,10 @@ async def overall_stats(client, CallbackQuery, _):
     )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
-        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+        await edit_media(CallbackQuery, med, reply_markup=upl)
     except MessageIdInvalid:
-        await CallbackQuery.message.reply_photo(
+        await reply_photo(
+            CallbackQuery.message,
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
 
@@ -102,8 +137,8 @@ async def bot_stats(client, CallbackQuery, _):
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await count_served_chats()
+    served_users = await count_served_users()
 
     text = _["gstats_5"].format(
         app.mention,
@@ -130,8 +165,21 @@ async def bot_stats(client, CallbackQuery, _):
     )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
-        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+        await edit_media(CallbackQuery, med, reply_markup=upl)
     except MessageIdInvalid:
-        await CallbackQuery.message.reply_photo(
+        await reply_photo(
+            CallbackQuery.message,
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
+
+
+@app.on_message(filters.command("cachestats") & SUDOERS)
+async def cache_stats_cmd(client, message: Message):
+    text = "<b>ᴄᴀᴄʜᴇ sᴛᴀᴛs :</b>\n\n"
+    for name, stat in sorted(cache_stats().items()):
+        text += (
+            f"<b>{name}</b> : <code>{stat['size']}</code> ᴋᴇʏs, "
+            f"<code>{stat['hits']}</code>/<code>{stat['misses']}</code> ʜɪᴛ/ᴍɪss "
+            f"(<code>{stat['hit_rate'] * 100:.1f}%</code>)\n"
+        )
+    await message.reply_text(text)
@@ -0,0 +1,99 @@
+import asyncio
+
+from pyrogram.enums import ChatMembersFilter, ChatMemberStatus
+
+import config
+from Clonify import app
+from Clonify.core.cache import AsyncTTLCache
+from Clonify.utils.database import get_authuser_names
+from Clonify.utils.formatters import alpha_to_int
+from config import adminlist
+
+# chat_id -> {"admins": ids that can manage video chats, "all": admins + auth users}
+# "all" is the same list object kept in config.adminlist for older readers
+admincache = AsyncTTLCache("admins", ttl=config.ADMIN_CACHE_TTL)
+# chat_id -> error of the last failed fetch, e.g. ChatAdminRequired
+adminfailures = AsyncTTLCache("admin_failures", ttl=config.ADMIN_FAILURE_TTL)
+
+
+async def _load_admins(client, chat_id: int) -> dict:
+    admins = set()
+    async for member in client.get_chat_members(
+        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
+    ):
+        if member.privileges and member.privileges.can_manage_video_chats:
+            admins.add(member.user.id)
+    members = list(admins)
+    for user in await get_authuser_names(chat_id):
+        user_id = await alpha_to_int(user)
+        if user_id not in admins:
+            members.append(user_id)
+    adminlist[chat_id] = members
+    return {"admins": admins, "all": members}
+
+
+async def _chat_admins(client, chat_id: int) -> dict:
+    error = adminfailures.peek(chat_id)
+    if error is not None:
+        raise error
+    try:
+        return await admincache.get(
+            chat_id, lambda key: _load_admins(client or app, key)
+        )
+    except Exception as e:
+        adminfailures.set(chat_id, e)
+        raise
+
+
+async def get_admins(client, chat_id: int) -> list:
+    """Admins and auth users of ``chat_id``, fetched once per ADMIN_CACHE_TTL."""
+    try:
+        return (await _chat_admins(client, chat_id))["all"]
+    except Exception:
+        return adminlist.get(chat_id) or []
+
+
+async def is_chat_admin(client, chat_id: int, user_id: int) -> bool:
+    """Whether ``user_id`` really holds the manage-video-chats right."""
+    return user_id in (await _chat_admins(client, chat_id))["admins"]
+
+
+async def reload_admins(client, chat_id: int) -> list:
+    admincache.invalidate(chat_id)
+    adminfailures.invalidate(chat_id)
+    return (await _chat_admins(client, chat_id))["all"]
+
+
+def warm_admins(client, chat_id: int):
+    """Load the admins of ``chat_id`` in the background if they are not cached."""
+    if chat_id < 0 and chat_id not in admincache and chat_id not in adminfailures:
+        asyncio.ensure_future(get_admins(client, chat_id))
+
+
+async def admin_updated(client, update):
+    """Apply a ChatMemberUpdated event to the cached admins of its chat."""
+    # rights changed in this chat, a fetch that failed before may work now
+    adminfailures.invalidate(update.chat.id)
+    cached = admincache.peek(update.chat.id)
+    if cached is None:
+        return
+    member = update.new_chat_member or update.old_chat_member
+    if not member or not member.user:
+        return
+    user_id = member.user.id
+    new = update.new_chat_member
+    can_manage = bool(
+        new
+        and new.status in (ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR)
+        and new.privileges
+        and new.privileges.can_manage_video_chats
+    )
+    if can_manage:
+        cached["admins"].add(user_id)
+        if user_id not in cached["all"]:
+            cached["all"].append(user_id)
+    elif user_id in cached["admins"]:
+        cached["admins"].discard(user_id)
+        auth = [await alpha_to_int(u) for u in await get_authuser_names(update.chat.id)]
+        if user_id not in auth and user_id in cached["all"]:
+            cached["all"].remove(user_id)
@@ -1,4 +1,4 @@
-from Clonify import app
+from Clonify.utils.chatcache import get_chat_info
 from Clonify.utils.database import get_cmode
 
 
@@ -11,7 +11,7 @@ async def get_channeplayCB(_, command, CallbackQuery):
             except:
                 return
         try:
-            channel = (await app.get_chat(chat_id)).title
+            channel = (await get_chat_info(CallbackQuery._client, chat_id))["title"]
         except:
             try:
                 return await CallbackQuery.answer(_["cplay_4"], show_alert=True)
@@ -0,0 +1,65 @@
+import asyncio
+
+from Clonify import app
+from Clonify.core.cache import AsyncTTLCache
+
+CHAT_INFO_TTL = 3600
+FETCH_CONCURRENCY = 20
+
+# chat_id -> {"id", "title", "username", "type", "linked_chat", "full"}
+# "full" is False for entries seen on an update, which lack the linked chat
+chatinfo = AsyncTTLCache("chats", ttl=CHAT_INFO_TTL)
+
+
+def _info(chat, full: bool) -> dict:
+    linked = getattr(chat, "linked_chat", None)
+    return {
+        "id": chat.id,
+        "title": chat.title,
+        "username": chat.username,
+        "type": chat.type,
+        "linked_chat": {"id": linked.id, "title": linked.title} if linked else None,
+        "full": full,
+    }
+
+
+def remember_chat(chat):
+    """Refresh the cached title/username of ``chat`` from an incoming update."""
+    if chat is None or chat.id > 0:
+        return
+    cached = chatinfo.peek(chat.id)
+    if cached is None:
+        chatinfo.set(chat.id, _info(chat, False))
+    else:
+        cached["title"] = chat.title
+        cached["username"] = chat.username
+
+
+async def _load_chat(client, chat_id) -> dict:
+    return _info(await client.get_chat(chat_id), True)
+
+
+async def get_chat_info(client, chat_id, full: bool = False) -> dict:
+    """Cached metadata of ``chat_id``; raises like ``get_chat`` when it is gone."""
+    client = client or app
+    if full:
+        cached = chatinfo.peek(chat_id)
+        if cached is not None and not cached["full"]:
+            chatinfo.invalidate(chat_id)
+    return await chatinfo.get(chat_id, lambda key: _load_chat(client, key))
+
+
+async def get_chats_info(client, chat_ids, concurrency: int = FETCH_CONCURRENCY) -> dict:
+    """Metadata of many chats in one bounded parallel pass, None for failures."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(chat_id):
+        async with semaphore:
+            try:
+                return await get_chat_info(client, chat_id)
+            except Exception:
+                return None
+
+    chat_ids = list(chat_ids)
+    results = await asyncio.gather(*(fetch(chat_id) for chat_id in chat_ids))
+    return dict(zip(chat_ids, results))
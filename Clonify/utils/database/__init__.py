@@ -1,2 +1,4 @@
+from .active import *
 from .database import *
 from .clonedb import *
+from .stats import *
@@ -0,0 +1,74 @@
+from collections import defaultdict
+
+# chat_id -> {"assistant": int | None, "bot_id": int}, bot_id 0 is the main bot
+calls = {}
+calls_by_assistant = defaultdict(set)
+calls_by_bot = defaultdict(set)
+video_calls = set()
+
+
+def _drop(index, key, chat_id):
+    members = index.get(key)
+    if members is None:
+        return
+    members.discard(chat_id)
+    if not members:
+        del index[key]
+
+
+def register_call(chat_id: int, assistant: int = None, bot_id: int = 0):
+    """Add or move ``chat_id`` in the registry and every index over it."""
+    old = calls.get(chat_id)
+    if old is not None:
+        _drop(calls_by_assistant, old["assistant"], chat_id)
+        _drop(calls_by_bot, old["bot_id"], chat_id)
+    calls[chat_id] = {"assistant": assistant, "bot_id": bot_id}
+    calls_by_assistant[assistant].add(chat_id)
+    calls_by_bot[bot_id].add(chat_id)
+
+
+def mark_video(chat_id: int, video: bool = True):
+    if video:
+        video_calls.add(chat_id)
+    else:
+        video_calls.discard(chat_id)
+
+
+def unregister_call(chat_id: int):
+    call = calls.pop(chat_id, None)
+    if call is None:
+        return
+    _drop(calls_by_assistant, call["assistant"], chat_id)
+    _drop(calls_by_bot, call["bot_id"], chat_id)
+
+
+def active_calls(assistant: int = None, bot_id: int = None, video: bool = None) -> set:
+    """Chats currently in a call, optionally narrowed by owner or stream type."""
+    if assistant is not None:
+        chats = calls_by_assistant.get(assistant, set())
+    elif bot_id is not None:
+        chats = calls_by_bot.get(bot_id, set())
+    else:
+        chats = calls.keys()
+    if video is None:
+        return set(chats)
+    if video:
+        return video_calls.intersection(chats)
+    return set(chats).difference(video_calls)
+
+
+def assistant_load(assistant: int) -> int:
+    return len(calls_by_assistant.get(assistant, ()))
+
+
+def bot_load(bot_id: int) -> int:
+    return len(calls_by_bot.get(bot_id, ()))
+
+
+def call_counts() -> dict:
+    return {
+        "total": len(calls),
+        "video": len(video_calls),
+        "assistants": {k: len(v) for k, v in calls_by_assistant.items()},
+        "clones": len([k for k in calls_by_bot if k]),
+    }
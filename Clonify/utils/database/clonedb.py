@@ -1,9 +1,180 @@
-from Clonify.core.mongo import mongodb, pymongodb
+import asyncio
 from typing import Dict, List, Union
 
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+
+from Clonify.core.mongo import mongodb
+from Clonify.logging import LOGGER
+
 cloneownerdb = mongodb.cloneownerdb
-clonebotdb = pymongodb.clonebotdb
+clonebotdb = mongodb.clonebotdb
 clonebotnamedb = mongodb.clonebotnamedb
+clonesessiondb = mongodb.clonesessions
+
+# Clone registry, kept in memory and refreshed from clonebotdb
+clonebots = {}
+clonebots_by_user = {}
+clonebots_by_username = {}
+clonebots_by_token = {}
+_clone_oids = {}
+
+CLONE_POLL_INTERVAL = 5
+
+
+def _unindex_clonebot(bot_id):
+    bot = clonebots.pop(bot_id, None)
+    if not bot:
+        return
+    _clone_oids.pop(bot.get("_id"), None)
+    owned = clonebots_by_user.get(bot.get("user_id"))
+    if owned:
+        owned.discard(bot_id)
+        if not owned:
+            clonebots_by_user.pop(bot.get("user_id"), None)
+    if bot.get("username"):
+        clonebots_by_username.pop(bot["username"].lower(), None)
+    clonebots_by_token.pop(bot.get("token"), None)
+
+
+def _index_clonebot(bot: dict):
+    bot_id = bot["bot_id"]
+    _unindex_clonebot(bot_id)
+    clonebots[bot_id] = bot
+    _clone_oids[bot.get("_id")] = bot_id
+    clonebots_by_user.setdefault(bot.get("user_id"), set()).add(bot_id)
+    if bot.get("username"):
+        clonebots_by_username[bot["username"].lower()] = bot_id
+    if bot.get("token"):
+        clonebots_by_token[bot["token"]] = bot_id
+
+
+async def load_clonebots() -> int:
+    fresh = [bot async for bot in clonebotdb.find({"bot_id": {"$exists": True}})]
+    for bot_id in set(clonebots) - {bot["bot_id"] for bot in fresh}:
+        _unindex_clonebot(bot_id)
+    for bot in fresh:
+        _index_clonebot(bot)
+    return len(clonebots)
+
+
+async def _watch_changes():
+    async with clonebotdb.watch(full_document="updateLookup") as stream:
+        async for change in stream:
+            if change["operationType"] in ("insert", "update", "replace"):
+                bot = change.get("fullDocument")
+                if bot and "bot_id" in bot:
+                    _index_clonebot(bot)
+            elif change["operationType"] == "delete":
+                bot_id = _clone_oids.get(change["documentKey"]["_id"])
+                if bot_id is not None:
+                    _unindex_clonebot(bot_id)
+            elif change["operationType"] in ("drop", "invalidate"):
+                await load_clonebots()
+
+
+async def sync_clonebots():
+    while True:
+        try:
+            await load_clonebots()
+            await _watch_changes()
+        except OperationFailure:
+            # change streams need a replica set, fall back to polling
+            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER(__name__).warning(f"Clone registry watch dropped: {e}")
+            await asyncio.sleep(5)
+    while not await asyncio.sleep(CLONE_POLL_INTERVAL):
+        try:
+            await load_clonebots()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Clone registry reload failed: {e}")
+
+
+def get_clonebot(bot_id) -> Union[dict, None]:
+    return clonebots.get(bot_id)
+
+
+def get_clonebots() -> List[dict]:
+    return list(clonebots.values())
+
+
+def get_user_clonebots(user_id) -> List[dict]:
+    return [clonebots[x] for x in clonebots_by_user.get(user_id, ())]
+
+
+def find_clonebot(query: str) -> Union[dict, None]:
+    bot_id = clonebots_by_token.get(query) or clonebots_by_username.get(
+        query.lower()
+    )
+    return clonebots.get(bot_id)
+
+
+async def add_clonebot(details: dict):
+    """Register a clone, replacing the record left by an earlier clone of the same bot."""
+    bot = await clonebotdb.find_one_and_replace(
+        {"bot_id": details["bot_id"]},
+        details,
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    await clonesessiondb.delete_many(
+        {"bot_id": details["bot_id"], "token": {"$ne": details["token"]}}
+    )
+    _index_clonebot(bot)
+
+
+async def update_clonebot(bot_id, upsert: bool = False, **fields) -> bool:
+    result = await clonebotdb.update_one(
+        {"bot_id": bot_id}, {"$set": fields}, upsert=upsert
+    )
+    bot = clonebots.get(bot_id)
+    if bot:
+        bot.update(fields)
+    elif result.upserted_id:
+        _index_clonebot({"_id": result.upserted_id, "bot_id": bot_id, **fields})
+    return bool(result.modified_count or result.upserted_id)
+
+
+async def delete_clonebot(bot_id):
+    await clonebotdb.delete_one({"bot_id": bot_id})
+    await clonesessiondb.delete_many({"bot_id": bot_id})
+    _unindex_clonebot(bot_id)
+
+
+async def delete_clonebot_token(bot_token: str):
+    bot_id = clonebots_by_token.get(bot_token)
+    await clonebotdb.delete_one({"token": bot_token})
+    await clonesessiondb.delete_one({"token": bot_token})
+    if bot_id is not None:
+        _unindex_clonebot(bot_id)
+
+
+async def delete_all_clonebots():
+    await clonebotdb.delete_many({})
+    await clonesessiondb.delete_many({})
+    for bot_id in list(clonebots):
+        _unindex_clonebot(bot_id)
+
+
+# clone sessions, exported auth keys so clones start without logging in again
+async def get_clone_session(bot_token: str) -> Union[str, None]:
+    result = await clonesessiondb.find_one({"token": bot_token}, {"session": 1})
+    return result["session"] if result else None
+
+
+async def save_clone_session(bot_id, bot_token: str, session: str):
+    await clonesessiondb.update_one(
+        {"token": bot_token},
+        {"$set": {"bot_id": bot_id, "session": session}},
+        upsert=True,
+    )
+
+
+async def delete_clone_session(bot_token: str):
+    await clonesessiondb.delete_one({"token": bot_token})
 
 
 # clone bot owner
@@ -31,61 +202,48 @@ async def get_clonebot_username(bot_id):
         return False
 
 
-# new clone 
+# new clone
 
 # Function to get owner_id dynamically for a given bot_id
 def get_owner_id_from_db(bot_id):
-    # MongoDB query to find the bot data using bot_id
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
+    bot_data = clonebots.get(bot_id)
     if bot_data:
         return bot_data["user_id"]  # Assuming 'user_id' is the owner of the bot
     return None  # If no bot is found, return None
 
 #check premium -------------
 def check_bot_premium(bot_id):
-    bot_details = clonebotdb.find_one({"bot_id": bot_id})
+    bot_details = clonebots.get(bot_id)
 
     if bot_details:
-        if bot_details["premium"]:
-            return True 
+        if bot_details.get("premium"):
+            return True
         else:
             return False
     else:
         return None
 #check premium --------------
 
-"""
-# Function to get Support Chats dynamically for a given bot_id
-def get_cloned_support_chat(bot_id):
-    # MongoDB query to find the bot data using bot_id
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
-    if bot_data:
-        return bot_data["support"]
-    return None
 
-# Function to get Support Channel dynamically for a given bot_id
-def get_cloned_support_channel(bot_id):
-    # MongoDB query to find the bot data using bot_id
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
-    if bot_data:
-        return bot_data["channel"]
-    return None
-"""
+def get_logging_status(bot_id):
+    bot_data = clonebots.get(bot_id) or {}
+    return bot_data.get("logging", True)
+
+
+def get_log_channel(bot_id):
+    bot_data = clonebots.get(bot_id) or {}
+    return bot_data.get("logchannel", "-100")
+
 
 async def get_cloned_support_chat(bot_id: int) -> str:
-    bot_details = clonebotdb.find_one({"bot_id": bot_id})
+    bot_details = clonebots.get(bot_id) or {}
     return bot_details.get("support", "No support chat set.")
 
 async def get_cloned_support_channel(bot_id: int) -> str:
-    bot_details = clonebotdb.find_one({"bot_id": bot_id})
+    bot_details = clonebots.get(bot_id) or {}
     return bot_details.get("channel", "No channel set.")
 
 
 async def has_user_cloned_any_bot(user_id: int) -> bool:
     # Check if the user has cloned any bot (search by user_id)
-    cloned_bot = clonebotdb.find_one({"user_id": user_id})
-    
-    if cloned_bot:
-        return True
-    
-    return False
+    return bool(clonebots_by_user.get(user_id))
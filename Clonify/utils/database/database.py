@@ -2,7 +2,18 @@ import random
 from typing import Dict, List, Union
 
 from Clonify import userbot
+from Clonify.core.cache import AsyncTTLCache
 from Clonify.core.mongo import mongodb, pymongodb
+from Clonify.utils.database.active import (
+    assistant_load,
+    calls,
+    mark_video,
+    register_call,
+    unregister_call,
+    video_calls,
+)
+from Clonify.utils.database.flags import AUTOEND, flag_enabled, set_flag
+from Clonify.utils.database.writebehind import WriteBehind
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -30,83 +41,64 @@ videodb = mongodb.vipvideocalls
 chatsdbc = mongodb.chatsc  # for clone
 usersdbc = mongodb.tgusersdbc  # for clone
 
+# Membership writes are buffered and upserted in batches
+served_users = WriteBehind(usersdb, ["user_id"])
+served_chats = WriteBehind(chatsdb, ["chat_id"])
+served_users_clone = WriteBehind(usersdbc, ["user_id", "bot_id"])
+served_chats_clone = WriteBehind(chatsdbc, ["chat_id", "bot_id"])
+
+# Per-chat settings, bounded LRU caches in front of mongo
+assistantdict = AsyncTTLCache("assistant")
+count = AsyncTTLCache("upvotes")
+channelconnect = AsyncTTLCache("cplaymode")
+langm = AsyncTTLCache("language")
+nonadmin = AsyncTTLCache("nonadmin")
+playmode = AsyncTTLCache("playmode")
+playtype = AsyncTTLCache("playtype")
+skipmode = AsyncTTLCache("skipmode")
+suggestion = AsyncTTLCache("suggestion")
+
 # Shifting to memory [mongo sucks often]
-active = []
-activevideo = []
-assistantdict = {}
 autoend = {}
-count = {}
-channelconnect = {}
-langm = {}
 loop = {}
-maintenance = []
-nonadmin = {}
 pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
 privatechats = {}
 cleanmode = []
-suggestion = {}
 mute = {}
 audio = {}
 video = {}
 
-# Total Queries on bot
 
+def _field_loader(collection, field: str, default=None):
+    async def loader(chat_id):
+        doc = await collection.find_one({"chat_id": chat_id}, {field: 1})
+        if not doc:
+            return default
+        return doc.get(field, default)
 
-async def get_queries() -> int:
-    chat_id = 98324
-    mode = await queriesdb.find_one({"chat_id": chat_id})
-    if not mode:
-        return 0
-    return mode["mode"]
+    return loader
 
 
-async def set_queries(mode: int):
-    chat_id = 98324
-    queries = await queriesdb.find_one({"chat_id": chat_id})
-    if queries:
-        mode = queries["mode"] + mode
-    return await queriesdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
-
+def _exists_loader(collection, present: bool = True):
+    async def loader(chat_id):
+        doc = await collection.find_one({"chat_id": chat_id}, {"_id": 1})
+        return present if doc else not present
 
-async def get_userss(chat_id: int) -> Dict[str, int]:
-    ids = await userdb.find_one({"chat_id": chat_id})
-    if not ids:
-        return {}
-    return ids["vidid"]
+    return loader
 
 
-async def get_user_top(chat_id: int, name: str) -> Union[bool, dict]:
-    ids = await get_userss(chat_id)
-    if name in ids:
-        return ids[name]
-
-
-async def update_user_top(chat_id: int, name: str, vidid: dict):
-    ids = await get_userss(chat_id)
-    ids[name] = vidid
-    await userdb.update_one({"chat_id": chat_id}, {"$set": {"vidid": ids}}, upsert=True)
-
-
-async def get_topp_users() -> dict:
-    results = {}
-    async for chat in userdb.find({"chat_id": {"$gt": 0}}):
-        user_id = chat["chat_id"]
-        total = 0
-        for i in chat["vidid"]:
-            counts_ = chat["vidid"][i]["spot"]
-            if counts_ > 0:
-                total += counts_
-        results[user_id] = total
-    return results
-
+_load_assistant = _field_loader(assdb, "assistant")
+_load_upvotes = _field_loader(countdb, "mode", 5)
+_load_cmode = _field_loader(channeldb, "mode")
+_load_lang = _field_loader(langdb, "lang", "en")
+_load_nonadmin = _exists_loader(authdb)
+_load_playmode = _field_loader(playmodedb, "mode", "Direct")
+_load_playtype = _field_loader(playtypedb, "mode", "Everyone")
+_load_skipmode = _exists_loader(skipdb, present=False)
+_load_suggestion = _exists_loader(suggdb, present=False)
 
 async def get_assistant_number(chat_id: int) -> str:
-    assistant = assistantdict.get(chat_id)
+    assistant = assistantdict.peek(chat_id)
     return assistant
 
 
@@ -125,6 +117,7 @@ async def get_client(assistant: int):
 
 async def set_assistant_new(chat_id, number):
     number = int(number)
+    assistantdict.set(chat_id, number)
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": number}},
@@ -132,11 +125,15 @@ async def set_assistant_new(chat_id, number):
     )
 
 
+def _least_loaded(assistants: list) -> int:
+    return min(assistants, key=lambda n: (assistant_load(n), random.random()))
+
+
 async def set_assistant(chat_id):
     from Clonify.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
+    ran_assistant = _least_loaded(assistants)
+    assistantdict.set(chat_id, ran_assistant)
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": ran_assistant}},
@@ -149,35 +146,19 @@ async def set_assistant(chat_id):
 async def get_assistant(chat_id: int) -> str:
     from Clonify.core.userbot import assistants
 
-    assistant = assistantdict.get(chat_id)
-    if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
-            userbot = await set_assistant(chat_id)
-            return userbot
-        else:
-            got_assis = dbassistant["assistant"]
-            if got_assis in assistants:
-                assistantdict[chat_id] = got_assis
-                userbot = await get_client(got_assis)
-                return userbot
-            else:
-                userbot = await set_assistant(chat_id)
-                return userbot
-    else:
-        if assistant in assistants:
-            userbot = await get_client(assistant)
-            return userbot
-        else:
-            userbot = await set_assistant(chat_id)
-            return userbot
+    assistant = await assistantdict.get(chat_id, _load_assistant)
+    if assistant in assistants:
+        userbot = await get_client(assistant)
+        return userbot
+    userbot = await set_assistant(chat_id)
+    return userbot
 
 
 async def set_calls_assistant(chat_id):
     from Clonify.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
+    ran_assistant = _least_loaded(assistants)
+    assistantdict.set(chat_id, ran_assistant)
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": ran_assistant}},
@@ -189,23 +170,9 @@ async def set_calls_assistant(chat_id):
 async def group_assistant(self, chat_id: int) -> int:
     from Clonify.core.userbot import assistants
 
-    assistant = assistantdict.get(chat_id)
-    if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
-            assis = await set_calls_assistant(chat_id)
-        else:
-            assis = dbassistant["assistant"]
-            if assis in assistants:
-                assistantdict[chat_id] = assis
-                assis = assis
-            else:
-                assis = await set_calls_assistant(chat_id)
-    else:
-        if assistant in assistants:
-            assis = assistant
-        else:
-            assis = await set_calls_assistant(chat_id)
+    assis = await assistantdict.get(chat_id, _load_assistant)
+    if assis not in assistants:
+        assis = await set_calls_assistant(chat_id)
     if int(assis) == 1:
         return self.one
     elif int(assis) == 2:
@@ -219,65 +186,44 @@ async def group_assistant(self, chat_id: int) -> int:
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
-        user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
-    return mode
+    return await skipmode.get(chat_id, _load_skipmode)
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
+    skipmode.set(chat_id, True)
     user = await skipdb.find_one({"chat_id": chat_id})
     if user:
         return await skipdb.delete_one({"chat_id": chat_id})
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
+    skipmode.set(chat_id, False)
     user = await skipdb.find_one({"chat_id": chat_id})
     if not user:
         return await skipdb.insert_one({"chat_id": chat_id})
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
-        mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await count.get(chat_id, _load_upvotes)
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
+    count.set(chat_id, mode)
     await countdb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
 
 
 async def is_autoend() -> bool:
-    chat_id = 1234
-    user = await autoenddb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return flag_enabled(AUTOEND)
 
 
 async def autoend_on():
-    chat_id = 1234
-    await autoenddb.insert_one({"chat_id": chat_id})
+    await set_flag(AUTOEND, True)
 
 
 async def autoend_off():
-    chat_id = 1234
-    await autoenddb.delete_one({"chat_id": chat_id})
+    await set_flag(AUTOEND, False)
 
 
 async def get_loop(chat_id: int) -> int:
@@ -292,75 +238,44 @@ async def set_loop(chat_id: int, mode: int):
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
-        mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await channelconnect.get(chat_id, _load_cmode)
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
+    channelconnect.set(chat_id, mode)
     await channeldb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
 
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
-        mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await playtype.get(chat_id, _load_playtype)
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
+    playtype.set(chat_id, mode)
     await playtypedb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
-        mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await playmode.get(chat_id, _load_playmode)
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
+    playmode.set(chat_id, mode)
     await playmodedb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
-        lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
-    return mode
+    return await langm.get(chat_id, _load_lang)
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
+    langm.set(chat_id, lang)
     await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
 
 
@@ -396,45 +311,41 @@ async def mute_off(chat_id: int):
 
 
 async def get_active_chats() -> list:
-    return active
+    return list(calls)
 
 
 async def is_active_chat(chat_id: int) -> bool:
-    if chat_id not in active:
-        return False
-    else:
-        return True
+    return chat_id in calls
 
 
-async def add_active_chat(chat_id: int):
-    if chat_id not in active:
-        active.append(chat_id)
+async def add_active_chat(chat_id: int, assistant: int = None, bot_id: int = None):
+    call = calls.get(chat_id)
+    if call is not None:
+        if assistant is None:
+            assistant = call["assistant"]
+        if bot_id is None:
+            bot_id = call["bot_id"]
+    register_call(chat_id, assistant, bot_id or 0)
 
 
 async def remove_active_chat(chat_id: int):
-    if chat_id in active:
-        active.remove(chat_id)
+    unregister_call(chat_id)
 
 
 async def get_active_video_chats() -> list:
-    return activevideo
+    return list(video_calls)
 
 
 async def is_active_video_chat(chat_id: int) -> bool:
-    if chat_id not in activevideo:
-        return False
-    else:
-        return True
+    return chat_id in video_calls
 
 
 async def add_active_video_chat(chat_id: int):
-    if chat_id not in activevideo:
-        activevideo.append(chat_id)
+    mark_video(chat_id, True)
 
 
 async def remove_active_video_chat(chat_id: int):
-    if chat_id in activevideo:
-        activevideo.remove(chat_id)
+    mark_video(chat_id, False)
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
@@ -445,19 +356,11 @@ async def check_nonadmin_chat(chat_id: int) -> bool:
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    return await nonadmin.get(chat_id, _load_nonadmin)
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
+    nonadmin.set(chat_id, True)
     is_admin = await check_nonadmin_chat(chat_id)
     if is_admin:
         return
@@ -465,7 +368,7 @@ async def add_nonadmin_chat(chat_id: int):
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
+    nonadmin.set(chat_id, False)
     is_admin = await check_nonadmin_chat(chat_id)
     if not is_admin:
         return
@@ -473,63 +376,48 @@ async def remove_nonadmin_chat(chat_id: int):
 
 
 async def is_on_off(on_off: int) -> bool:
-    onoff = await onoffdb.find_one({"on_off": on_off})
-    if not onoff:
-        return False
-    return True
+    return flag_enabled(on_off)
 
 
 async def add_on(on_off: int):
-    is_on = await is_on_off(on_off)
-    if is_on:
-        return
-    return await onoffdb.insert_one({"on_off": on_off})
+    await set_flag(on_off, True)
 
 
 async def add_off(on_off: int):
-    is_off = await is_on_off(on_off)
-    if not is_off:
-        return
-    return await onoffdb.delete_one({"on_off": on_off})
+    await set_flag(on_off, False)
 
 
 async def is_maintenance():
-    if not maintenance:
-        get = await onoffdb.find_one({"on_off": 1})
-        if not get:
-            maintenance.clear()
-            maintenance.append(2)
-            return True
-        else:
-            maintenance.clear()
-            maintenance.append(1)
-            return False
-    else:
-        if 1 in maintenance:
-            return False
-        else:
-            return True
+    return not flag_enabled(1)
 
 
 async def maintenance_off():
-    maintenance.clear()
-    maintenance.append(2)
-    is_off = await is_on_off(1)
-    if not is_off:
-        return
-    return await onoffdb.delete_one({"on_off": 1})
+    await set_flag(1, False)
 
 
 async def maintenance_on():
-    maintenance.clear()
-    maintenance.append(1)
-    is_on = await is_on_off(1)
-    if is_on:
-        return
-    return await onoffdb.insert_one({"on_off": 1})
+    await set_flag(1, True)
+
+
+ITER_BATCH_SIZE = 1000
+
+
+async def iter_ids(collection, field: str, query: dict, batch_size: int = ITER_BATCH_SIZE):
+    """Yield ``field`` of every matching document without building a list."""
+    cursor = collection.find(query, {"_id": 0, field: 1}).batch_size(batch_size)
+    async for doc in cursor:
+        yield doc[field]
+
+
+async def count_docs(collection, query: dict = None, estimated: bool = False) -> int:
+    if estimated:
+        return await collection.estimated_document_count()
+    return await collection.count_documents(query or {})
 
 
 async def is_served_user(user_id: int) -> bool:
+    if (user_id,) in served_users:
+        return True
     user = await usersdb.find_one({"user_id": user_id})
     if not user:
         return False
@@ -537,27 +425,41 @@ async def is_served_user(user_id: int) -> bool:
 
 
 async def get_served_users() -> list:
-    users_list = []
-    async for user in usersdb.find({"user_id": {"$gt": 0}}):
-        users_list.append(user)
-    return users_list
+    return [{"user_id": user_id} async for user_id in iter_served_users()]
+
+
+def iter_served_users(batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(usersdb, "user_id", {"user_id": {"$gt": 0}}, batch_size)
+
+
+async def count_served_users(estimated: bool = False) -> int:
+    return await count_docs(usersdb, {"user_id": {"$gt": 0}}, estimated)
 
 
 async def add_served_user(user_id: int):
-    is_served = await is_served_user(user_id)
-    if is_served:
-        return
-    return await usersdb.insert_one({"user_id": user_id})
+    await served_users.add({"user_id": user_id})
+
+
+async def delete_served_user(user_id: int):
+    served_users.forget({"user_id": user_id})
+    await usersdb.delete_one({"user_id": user_id})
 
 
 async def get_served_chats() -> list:
-    chats_list = []
-    async for chat in chatsdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat)
-    return chats_list
+    return [{"chat_id": chat_id} async for chat_id in iter_served_chats()]
+
+
+def iter_served_chats(batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(chatsdb, "chat_id", {"chat_id": {"$lt": 0}}, batch_size)
+
+
+async def count_served_chats(estimated: bool = False) -> int:
+    return await count_docs(chatsdb, {"chat_id": {"$lt": 0}}, estimated)
 
 
 async def is_served_chat(chat_id: int) -> bool:
+    if (chat_id,) in served_chats:
+        return True
     chat = await chatsdb.find_one({"chat_id": chat_id})
     if not chat:
         return False
@@ -565,21 +467,24 @@ async def is_served_chat(chat_id: int) -> bool:
 
 
 async def add_served_chat(chat_id: int):
-    is_served = await is_served_chat(chat_id)
-    if is_served:
-        return
-    return await chatsdb.insert_one({"chat_id": chat_id})
+    await served_chats.add({"chat_id": chat_id})
 
 
 async def delete_served_chat(chat_id: int):
+    served_chats.forget({"chat_id": chat_id})
     await chatsdb.delete_one({"chat_id": chat_id})
 
 
 async def blacklisted_chats() -> list:
-    chats_list = []
-    async for chat in blacklist_chatdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat["chat_id"])
-    return chats_list
+    return [chat_id async for chat_id in iter_blacklisted_chats()]
+
+
+def iter_blacklisted_chats(batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(blacklist_chatdb, "chat_id", {"chat_id": {"$lt": 0}}, batch_size)
+
+
+async def is_blacklisted_chat(chat_id: int) -> bool:
+    return bool(await blacklist_chatdb.find_one({"chat_id": chat_id}, {"_id": 1}))
 
 
 async def blacklist_chat(chat_id: int) -> bool:
@@ -706,9 +611,11 @@ async def get_banned_users() -> list:
 
 
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    return await count_docs(blockeddb, {"user_id": {"$gt": 0}})
+
+
+def iter_banned_users(batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(blockeddb, "user_id", {"user_id": {"$gt": 0}}, batch_size)
 
 
 async def is_banned_user(user_id: int) -> bool:
@@ -736,10 +643,11 @@ async def remove_banned_user(user_id: int):
 
 
 async def get_private_served_chats() -> list:
-    chats_list = []
-    async for chat in privatedb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat)
-    return chats_list
+    return [{"chat_id": chat_id} async for chat_id in iter_private_served_chats()]
+
+
+def iter_private_served_chats(batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(privatedb, "chat_id", {"chat_id": {"$lt": 0}}, batch_size)
 
 
 async def is_served_private_chat(chat_id: int) -> bool:
@@ -767,26 +675,18 @@ async def remove_private_chat(chat_id: int):
 
 
 async def is_suggestion(chat_id: int) -> bool:
-    mode = suggestion.get(chat_id)
-    if not mode:
-        user = await suggdb.find_one({"chat_id": chat_id})
-        if not user:
-            suggestion[chat_id] = True
-            return True
-        suggestion[chat_id] = False
-        return False
-    return mode
+    return await suggestion.get(chat_id, _load_suggestion)
 
 
 async def suggestion_on(chat_id: int):
-    suggestion[chat_id] = True
+    suggestion.set(chat_id, True)
     user = await suggdb.find_one({"chat_id": chat_id})
     if user:
         return await suggdb.delete_one({"chat_id": chat_id})
 
 
 async def suggestion_off(chat_id: int):
-    suggestion[chat_id] = False
+    suggestion.set(chat_id, False)
     user = await suggdb.find_one({"chat_id": chat_id})
     if not user:
         return await suggdb.insert_one({"chat_id": chat_id})
@@ -812,21 +712,74 @@ async def cleanmode_on(chat_id: int):
         pass
 
 async def add_served_user_clone(user_id: int, bot_id: int):
-    is_served = await usersdbc.find_one({"user_id": user_id, "bot_id": bot_id})
-    if not is_served:
-        await usersdbc.insert_one({"user_id": user_id, "bot_id": bot_id})
+    await served_users_clone.add({"user_id": user_id, "bot_id": bot_id})
 
 
 async def get_served_users_clone(bot_id: int) -> list:
-    return [user async for user in usersdbc.find({"bot_id": bot_id})]
+    return [{"user_id": user_id} async for user_id in iter_served_users_clone(bot_id)]
+
+
+def iter_served_users_clone(bot_id: int, batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(usersdbc, "user_id", {"bot_id": bot_id}, batch_size)
+
+
+async def count_served_users_clone(bot_id: int) -> int:
+    return await count_docs(usersdbc, {"bot_id": bot_id})
+
+
+async def delete_served_user_clone(user_id: int, bot_id: int):
+    served_users_clone.forget({"user_id": user_id, "bot_id": bot_id})
+    await usersdbc.delete_one({"user_id": user_id, "bot_id": bot_id})
 
 
 async def add_served_chat_clone(chat_id: int, bot_id: int):
-    is_served = await chatsdbc.find_one({"chat_id": chat_id, "bot_id": bot_id})
-    if not is_served:
-        await chatsdbc.insert_one({"chat_id": chat_id, "bot_id": bot_id})
+    await served_chats_clone.add({"chat_id": chat_id, "bot_id": bot_id})
 
 
 async def get_served_chats_clone(bot_id: int) -> list:
-    return [chat async for chat in chatsdbc.find({"bot_id": bot_id})]
+    return [{"chat_id": chat_id} async for chat_id in iter_served_chats_clone(bot_id)]
+
+
+def iter_served_chats_clone(bot_id: int, batch_size: int = ITER_BATCH_SIZE):
+    return iter_ids(chatsdbc, "chat_id", {"bot_id": bot_id}, batch_size)
+
+
+async def count_served_chats_clone(bot_id: int) -> int:
+    return await count_docs(chatsdbc, {"bot_id": bot_id})
+
+
+async def delete_served_chat_clone(chat_id: int, bot_id: int):
+    served_chats_clone.forget({"chat_id": chat_id, "bot_id": bot_id})
+    await chatsdbc.delete_one({"chat_id": chat_id, "bot_id": bot_id})
+
+
+def _served_source(kind: str, bot_id: int):
+    if kind == "chats":
+        if bot_id:
+            return chatsdbc, "chat_id", {"bot_id": bot_id}
+        return chatsdb, "chat_id", {"chat_id": {"$lt": 0}}
+    if bot_id:
+        return usersdbc, "user_id", {"bot_id": bot_id}
+    return usersdb, "user_id", {"user_id": {"$gt": 0}}
+
+
+async def get_served_batch(
+    kind: str, bot_id: int = 0, after: int = None, limit: int = ITER_BATCH_SIZE
+) -> list:
+    """Next ``limit`` served chat or user ids above ``after``, in id order."""
+    collection, field, query = _served_source(kind, bot_id)
+    if after is not None:
+        query = {**query, field: {**query.get(field, {}), "$gt": after}}
+    cursor = collection.find(query, {"_id": 0, field: 1}).sort(field, 1).limit(limit)
+    return [doc[field] async for doc in cursor]
+
+
+async def delete_served(kind: str, target: int, bot_id: int = 0):
+    if kind == "chats":
+        if bot_id:
+            return await delete_served_chat_clone(target, bot_id)
+        return await delete_served_chat(target)
+    if bot_id:
+        return await delete_served_user_clone(target, bot_id)
+    return await delete_served_user(target)
 
@@ -0,0 +1,74 @@
+import asyncio
+
+from pymongo import ReturnDocument
+
+from Clonify.core.mongo import mongodb
+from Clonify.logging import LOGGER
+
+onoffdb = mongodb.onoffper
+autoenddb = mongodb.autoend
+flagsdb = mongodb.flags
+
+AUTOEND = "autoend"
+AUTOEND_ID = 1234
+FLAGS_POLL_INTERVAL = 5
+
+# Global on/off switches, loaded at boot and changed only through set_flag
+flags = set()
+flags_version = {"value": None}
+
+
+async def load_flags():
+    fresh = {doc["on_off"] async for doc in onoffdb.find({}, {"on_off": 1})}
+    if await autoenddb.find_one({"chat_id": AUTOEND_ID}, {"_id": 1}):
+        fresh.add(AUTOEND)
+    version = await flagsdb.find_one({"_id": "flags"})
+    flags.clear()
+    flags.update(fresh)
+    flags_version["value"] = version["version"] if version else 0
+
+
+def flag_enabled(flag) -> bool:
+    return flag in flags
+
+
+async def set_flag(flag, enabled: bool):
+    if enabled:
+        flags.add(flag)
+    else:
+        flags.discard(flag)
+    if flag == AUTOEND:
+        collection, query = autoenddb, {"chat_id": AUTOEND_ID}
+    else:
+        collection, query = onoffdb, {"on_off": flag}
+    # the local set may be stale, so only the stored value decides whether
+    # this call changed anything
+    if enabled:
+        result = await collection.update_one(query, {"$set": query}, upsert=True)
+        changed = result.upserted_id is not None
+    else:
+        result = await collection.delete_many(query)
+        changed = result.deleted_count > 0
+    if not changed:
+        return
+    version = await flagsdb.find_one_and_update(
+        {"_id": "flags"},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    if version["version"] != (flags_version["value"] or 0) + 1:
+        # another node changed a flag since our last sync
+        await load_flags()
+    else:
+        flags_version["value"] = version["version"]
+
+
+async def sync_flags():
+    while not await asyncio.sleep(FLAGS_POLL_INTERVAL):
+        try:
+            version = await flagsdb.find_one({"_id": "flags"})
+            if (version["version"] if version else 0) != flags_version["value"]:
+                await load_flags()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Flag sync failed: {e}")
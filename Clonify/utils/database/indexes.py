@@ -0,0 +1,139 @@
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from Clonify.core.mongo import mongodb
+from Clonify.logging import LOGGER
+
+# collection -> [(keys, options)], every hot-path lookup must be covered here
+INDEXES = {
+    "adminauth": [([("chat_id", 1)], {"unique": True})],
+    "assistants": [([("chat_id", 1)], {"unique": True})],
+    "authuser": [([("chat_id", 1)], {"unique": True})],
+    "autoend": [([("chat_id", 1)], {"unique": True})],
+    "blacklistChat": [([("chat_id", 1)], {"unique": True})],
+    "blockedusers": [([("user_id", 1)], {"unique": True})],
+    "broadcasts": [([("status", 1)], {})],
+    "chats": [([("chat_id", 1)], {"unique": True})],
+    "chatsc": [
+        ([("chat_id", 1), ("bot_id", 1)], {"unique": True}),
+        ([("bot_id", 1), ("chat_id", 1)], {}),
+    ],
+    "clonebotdb": [
+        ([("bot_id", 1)], {"unique": True}),
+        ([("user_id", 1)], {}),
+        ([("token", 1)], {"unique": True}),
+        ([("username", 1)], {}),
+    ],
+    "clonebotnamedb": [([("bot_id", 1)], {})],
+    "clonesessions": [
+        ([("token", 1)], {"unique": True}),
+        ([("bot_id", 1)], {}),
+    ],
+    "cloneownerdb": [([("bot_id", 1)], {})],
+    "cplaymode": [([("chat_id", 1)], {"unique": True})],
+    "fileids": [([("bot_id", 1), ("kind", 1), ("key", 1)], {"unique": True})],
+    "gban": [([("user_id", 1)], {"unique": True})],
+    "language": [([("chat_id", 1)], {"unique": True})],
+    "leases": [([("expires_at", 1)], {"expireAfterSeconds": 0})],
+    "nodes": [([("expires_at", 1)], {"expireAfterSeconds": 0})],
+    "onoffper": [([("on_off", 1)], {"unique": True})],
+    "playmode": [([("chat_id", 1)], {"unique": True})],
+    "playstats": [
+        ([("scope", 1), ("scope_id", 1), ("kind", 1), ("key", 1)], {"unique": True}),
+        ([("scope", 1), ("scope_id", 1), ("kind", 1), ("spot", -1)], {}),
+    ],
+    "playtypedb": [([("chat_id", 1)], {"unique": True})],
+    "privatechats": [([("chat_id", 1)], {"unique": True})],
+    "queries": [([("chat_id", 1)], {"unique": True})],
+    "skipmode": [([("chat_id", 1)], {"unique": True})],
+    "suggestion": [([("chat_id", 1)], {"unique": True})],
+    "sudoers": [([("sudo", 1)], {"unique": True})],
+    "tgusersdb": [([("user_id", 1)], {"unique": True})],
+    "tgusersdbc": [
+        ([("user_id", 1), ("bot_id", 1)], {"unique": True}),
+        ([("bot_id", 1), ("user_id", 1)], {}),
+    ],
+    "upcount": [([("chat_id", 1)], {"unique": True})],
+    "userstats": [([("chat_id", 1)], {"unique": True})],
+}
+
+
+# collections where a newer document supersedes an older one with the same
+# key, e.g. a bot cloned again with a fresh token
+KEEP_NEWEST = {"clonebotdb"}
+
+
+def register_index(collection: str, keys: list, **options):
+    specs = INDEXES.setdefault(collection, [])
+    if (keys, options) not in specs:
+        specs.append((keys, options))
+
+
+def _index_name(keys: list) -> str:
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+async def dedupe_collection(collection: str, keys: list) -> int:
+    """Keep one document for every duplicated key, delete the rest.
+
+    The oldest document is kept, or the newest for collections in KEEP_NEWEST.
+    """
+    coll = mongodb[collection]
+    removed = 0
+    group = {field: f"${field}" for field, _ in keys}
+    pipeline = [
+        {"$sort": {"_id": -1 if collection in KEEP_NEWEST else 1}},
+        {"$group": {"_id": group, "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}},
+    ]
+    async for dup in coll.aggregate(pipeline, allowDiskUse=True):
+        result = await coll.delete_many({"_id": {"$in": dup["ids"][1:]}})
+        removed += result.deleted_count
+    if removed:
+        LOGGER(__name__).info(f"{collection}: removed {removed} duplicate documents")
+    return removed
+
+
+async def _index_usage(coll) -> dict:
+    usage = {}
+    try:
+        async for stat in coll.aggregate([{"$indexStats": {}}]):
+            usage[stat["name"]] = stat["accesses"]["ops"]
+    except OperationFailure:
+        pass
+    return usage
+
+
+async def ensure_indexes():
+    for collection, specs in INDEXES.items():
+        coll = mongodb[collection]
+        try:
+            existing = await coll.index_information()
+        except Exception as e:
+            LOGGER(__name__).warning(f"{collection}: cannot read indexes: {e}")
+            continue
+        declared = {"_id_"}
+        for keys, options in specs:
+            name = _index_name(keys)
+            declared.add(name)
+            if name in existing:
+                continue
+            LOGGER(__name__).info(f"{collection}: creating missing index {name}")
+            try:
+                await coll.create_index(keys, name=name, **options)
+            except (DuplicateKeyError, OperationFailure) as e:
+                if not options.get("unique") or getattr(e, "code", None) != 11000:
+                    LOGGER(__name__).warning(f"{collection}: index {name} failed: {e}")
+                    continue
+                await dedupe_collection(collection, keys)
+                try:
+                    await coll.create_index(keys, name=name, **options)
+                except Exception as e:
+                    LOGGER(__name__).warning(f"{collection}: index {name} failed: {e}")
+        usage = await _index_usage(coll)
+        for name in existing:
+            if name in declared:
+                continue
+            LOGGER(__name__).warning(
+                f"{collection}: index {name} is not declared "
+                f"({usage.get(name, 'unknown')} ops since restart)"
+            )
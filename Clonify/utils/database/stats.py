@@ -0,0 +1,167 @@
+import asyncio
+import re
+from typing import Dict, List, Union
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from Clonify.core.mongo import mongodb
+from Clonify.logging import LOGGER
+
+queriesdb = mongodb.queries
+userdb = mongodb.userstats
+playstatsdb = mongodb.playstats
+
+QUERIES_ID = 98324
+STATS_FLUSH_INTERVAL = 10
+
+# Counters aggregated in memory and $inc'ed into mongo by stats_flusher
+pending_queries = {"count": 0}
+pending_plays = {}
+track_titles = {}
+
+_valid_vidid = re.compile(r"^[\w-]+$")
+
+
+# Total Queries on bot
+
+
+async def get_queries() -> int:
+    mode = await queriesdb.find_one({"chat_id": QUERIES_ID})
+    stored = mode["mode"] if mode else 0
+    return stored + pending_queries["count"]
+
+
+async def set_queries(mode: int):
+    pending_queries["count"] += mode
+
+
+def record_play(chat_id: int, user_id: int, vidid: str, title: str, bot_id: int = 0):
+    if not user_id or not vidid or not _valid_vidid.match(str(vidid)):
+        return
+    track_titles[vidid] = title
+    scopes = [("global", 0), ("chat", chat_id)]
+    if bot_id:
+        scopes.append(("clone", bot_id))
+    for scope, scope_id in scopes:
+        for kind, key in (("track", vidid), ("user", user_id)):
+            entry = (scope, scope_id, kind, key)
+            pending_plays[entry] = pending_plays.get(entry, 0) + 1
+
+
+async def flush_stats():
+    queries, pending_queries["count"] = pending_queries["count"], 0
+    plays = pending_plays.copy()
+    pending_plays.clear()
+    titles = track_titles.copy()
+    track_titles.clear()
+    try:
+        if queries:
+            await queriesdb.update_one(
+                {"chat_id": QUERIES_ID}, {"$inc": {"mode": queries}}, upsert=True
+            )
+            queries = 0
+        if plays:
+            ops = []
+            for (scope, scope_id, kind, key), n in plays.items():
+                update = {"$inc": {"spot": n}}
+                if kind == "track" and key in titles:
+                    update["$set"] = {"title": titles[key]}
+                ops.append(
+                    UpdateOne(
+                        {"scope": scope, "scope_id": scope_id, "kind": kind, "key": key},
+                        update,
+                        upsert=True,
+                    )
+                )
+            try:
+                await playstatsdb.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                # the other ops were applied, retrying them would count twice
+                entries = list(plays)
+                plays = {
+                    entries[err["index"]]: plays[entries[err["index"]]]
+                    for err in e.details["writeErrors"]
+                }
+                raise
+            plays = {}
+    except Exception as e:
+        LOGGER(__name__).warning(f"Stats flush failed, retrying later: {e}")
+        pending_queries["count"] += queries
+        for entry, n in plays.items():
+            pending_plays[entry] = pending_plays.get(entry, 0) + n
+        for vidid, title in titles.items():
+            track_titles.setdefault(vidid, title)
+
+
+async def stats_flusher():
+    while not await asyncio.sleep(STATS_FLUSH_INTERVAL):
+        await flush_stats()
+
+
+async def _leaderboard(scope: str, scope_id: int, kind: str, limit: int) -> List[dict]:
+    cursor = (
+        playstatsdb.find(
+            {"scope": scope, "scope_id": scope_id, "kind": kind},
+            {"_id": 0, "key": 1, "spot": 1, "title": 1},
+        )
+        .sort("spot", -1)
+        .limit(limit)
+    )
+    return [entry async for entry in cursor]
+
+
+async def get_top_tracks(
+    scope: str = "global", scope_id: int = 0, limit: int = 10
+) -> List[dict]:
+    return await _leaderboard(scope, scope_id, "track", limit)
+
+
+async def get_top_users(
+    scope: str = "global", scope_id: int = 0, limit: int = 10
+) -> List[dict]:
+    return await _leaderboard(scope, scope_id, "user", limit)
+
+
+async def get_userss(chat_id: int) -> Dict[str, int]:
+    ids = await userdb.find_one({"chat_id": chat_id}, {"vidid": 1})
+    if not ids:
+        return {}
+    return ids.get("vidid", {})
+
+
+async def get_user_top(chat_id: int, name: str) -> Union[bool, dict]:
+    ids = await userdb.find_one({"chat_id": chat_id}, {f"vidid.{name}": 1})
+    if ids:
+        return ids.get("vidid", {}).get(name)
+
+
+async def update_user_top(chat_id: int, name: str, vidid: dict):
+    await userdb.update_one(
+        {"chat_id": chat_id}, {"$set": {f"vidid.{name}": vidid}}, upsert=True
+    )
+
+
+async def get_topp_users() -> dict:
+    """Total plays per user from the per-user ``userstats`` documents.
+
+    New plays are counted in ``playstats`` only, use ``get_top_users`` there.
+    """
+    pipeline = [
+        {"$match": {"chat_id": {"$gt": 0}}},
+        {
+            "$project": {
+                "chat_id": 1,
+                "total": {
+                    "$sum": {
+                        "$map": {
+                            "input": {"$objectToArray": {"$ifNull": ["$vidid", {}]}},
+                            "as": "track",
+                            "in": {"$max": [0, {"$ifNull": ["$$track.v.spot", 0]}]},
+                        }
+                    }
+                },
+            }
+        },
+    ]
+    return {doc["chat_id"]: doc["total"] async for doc in userdb.aggregate(pipeline)}
@@ -0,0 +1,87 @@
+import asyncio
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from Clonify.logging import LOGGER
+
+FLUSH_INTERVAL = 5
+FLUSH_SIZE = 500
+SEEN_LIMIT = 1000000
+
+buffers = []
+
+
+class WriteBehind:
+    def __init__(self, collection, fields, max_items=FLUSH_SIZE):
+        self.collection = collection
+        self.fields = tuple(fields)
+        self.max_items = max_items
+        self.seen = set()
+        self.pending = {}
+        self.lock = asyncio.Lock()
+        buffers.append(self)
+
+    def key(self, doc: dict) -> tuple:
+        return tuple(doc[field] for field in self.fields)
+
+    def __contains__(self, key) -> bool:
+        return key in self.seen
+
+    async def add(self, doc: dict):
+        key = self.key(doc)
+        if key in self.seen:
+            return
+        if len(self.seen) >= SEEN_LIMIT:
+            # upserts are idempotent, forgetting only costs a repeat write
+            self.seen.clear()
+        self.seen.add(key)
+        self.pending[key] = doc
+        if len(self.pending) >= self.max_items:
+            await self.flush()
+
+    def forget(self, doc: dict):
+        key = self.key(doc)
+        self.seen.discard(key)
+        self.pending.pop(key, None)
+
+    async def flush(self):
+        async with self.lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, {}
+            ops = [
+                UpdateOne(dict(doc), {"$setOnInsert": doc}, upsert=True)
+                for doc in batch.values()
+            ]
+            try:
+                await self.collection.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                # duplicate keys mean another writer got there first
+                errors = [
+                    x for x in e.details.get("writeErrors", []) if x["code"] != 11000
+                ]
+                if errors:
+                    LOGGER(__name__).warning(
+                        f"{self.collection.name}: {len(errors)} buffered writes failed"
+                    )
+                    # unseen again so the next add() of these retries the write
+                    keys = list(batch)
+                    for x in errors:
+                        self.seen.discard(keys[x["index"]])
+            except Exception as e:
+                LOGGER(__name__).warning(
+                    f"{self.collection.name}: flush failed, retrying later: {e}"
+                )
+                batch.update(self.pending)
+                self.pending = batch
+
+
+async def flush_all():
+    for buffer in buffers:
+        await buffer.flush()
+
+
+async def write_behind_flusher():
+    while not await asyncio.sleep(FLUSH_INTERVAL):
+        await flush_all()
@@ -0,0 +1,112 @@
+import asyncio
+
+from pyrogram.types import CallbackQuery
+
+from Clonify.misc import SUDOERS
+from Clonify.utils.admincache import warm_admins
+from Clonify.utils.chatcache import get_chat_info, remember_chat
+from Clonify.utils.database import (
+    get_cmode,
+    get_lang,
+    get_playmode,
+    get_playtype,
+    is_active_chat,
+    is_maintenance,
+    is_nonadmin_chat,
+)
+from config import adminlist
+from strings import get_string
+
+
+class ChatContext:
+    """Everything the decorators need to know about one update's chat."""
+
+    def __init__(self, chat_id, user_id):
+        self.chat_id = chat_id
+        self.user_id = user_id
+        self.language = "en"
+        self._ = None
+        self.maintenance = False
+        self.cmode = None
+        self.playmode = "Direct"
+        self.playtype = "Everyone"
+        self.nonadmin = False
+        self.active = False
+        self.target_chat_id = chat_id
+        self.channel = None
+        self.channel_error = None
+        self.channel_resolved = False
+
+    @property
+    def is_sudo(self) -> bool:
+        return self.user_id in SUDOERS
+
+    @property
+    def is_admin(self) -> bool:
+        return self.is_sudo or self.user_id in (adminlist.get(self.chat_id) or [])
+
+    @property
+    def blocked_by_maintenance(self) -> bool:
+        return self.maintenance and not self.is_sudo
+
+
+async def _lang_pack(chat_id):
+    try:
+        language = await get_lang(chat_id)
+        return language, get_string(language)
+    except:
+        return "en", get_string("en")
+
+
+async def get_context(client, update, channel: bool = None) -> ChatContext:
+    """Resolve the chat settings of ``update`` once and keep them on it.
+
+    ``channel`` asks for the linked channel-play target as well; by default
+    it follows the ``c`` prefix of the command.
+    """
+    message = update.message if isinstance(update, CallbackQuery) else update
+    if channel is None:
+        command = getattr(message, "command", None)
+        channel = bool(command) and command[0][:1] == "c"
+    ctx = getattr(update, "context", None)
+    if ctx is None:
+        chat_id = message.chat.id
+        user = update.from_user
+        ctx = ChatContext(chat_id, user.id if user else None)
+        (
+            (ctx.language, ctx._),
+            not_maintenance,
+            ctx.cmode,
+            ctx.playmode,
+            ctx.playtype,
+            ctx.nonadmin,
+            ctx.active,
+        ) = await asyncio.gather(
+            _lang_pack(chat_id),
+            is_maintenance(),
+            get_cmode(chat_id),
+            get_playmode(chat_id),
+            get_playtype(chat_id),
+            is_nonadmin_chat(chat_id),
+            is_active_chat(chat_id),
+        )
+        ctx.maintenance = not_maintenance is False
+        warm_admins(client, chat_id)
+        remember_chat(message.chat)
+        try:
+            update.context = ctx
+        except AttributeError:
+            pass
+    if channel and not ctx.channel_resolved:
+        ctx.channel_resolved = True
+        if ctx.cmode is None:
+            ctx.channel_error = "setting_7"
+        else:
+            try:
+                chat = await get_chat_info(client, ctx.cmode)
+                ctx.target_chat_id = ctx.cmode
+                ctx.channel = chat["title"]
+                ctx.active = await is_active_chat(ctx.target_chat_id)
+            except:
+                ctx.channel_error = "cplay_4"
+    return ctx
@@ -10,19 +10,12 @@ from pyrogram.errors import (
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from Clonify import YouTube, app
-from Clonify.misc import SUDOERS
-from Clonify.utils.database import (
-    get_assistant,
-    get_cmode,
-    get_lang,
-    get_playmode,
-    get_playtype,
-    is_active_chat,
-    is_maintenance,
-)
+from Clonify.core.quotas import admit_play, quota_text
+from Clonify.utils.admincache import get_admins
+from Clonify.utils.database import get_assistant, set_queries
+from Clonify.utils.decorators.context import get_context
 from Clonify.utils.inline import botplaylist_markup
-from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
-from strings import get_string
+from config import PLAYLIST_IMG_URL, SUPPORT_CHAT
 
 links = {}
 clinks = {}
@@ -30,8 +23,8 @@ clinks = {}
 
 def PlayWrapper(command):
     async def wrapper(client, message):
-        language = await get_lang(message.chat.id)
-        _ = get_string(language)
+        ctx = await get_context(client, message)
+        _ = ctx._
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
                 [
@@ -45,12 +38,11 @@ def PlayWrapper(command):
             )
             return await message.reply_text(_["general_3"], reply_markup=upl)
 
-        if await is_maintenance() is False:
-            if message.from_user.id not in SUDOERS:
-                return await message.reply_text(
-                    text=f"{app.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ <a href={SUPPORT_CHAT}>sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ</a> ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
-                    disable_web_page_preview=True,
-                )
+        if ctx.blocked_by_maintenance:
+            return await message.reply_text(
+                text=f"{app.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ <a href={SUPPORT_CHAT}>sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ</a> ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
+                disable_web_page_preview=True,
+            )
 
         try:
             await message.delete()
@@ -78,28 +70,17 @@ def PlayWrapper(command):
                     caption=_["play_18"],
                     reply_markup=InlineKeyboardMarkup(buttons),
                 )
-        if message.command[0][0] == "c":
-            chat_id = await get_cmode(message.chat.id)
-            if chat_id is None:
-                return await message.reply_text(_["setting_7"])
-            try:
-                chat = await app.get_chat(chat_id)
-            except:
-                return await message.reply_text(_["cplay_4"])
-            channel = chat.title
-        else:
-            chat_id = message.chat.id
-            channel = None
-        playmode = await get_playmode(message.chat.id)
-        playty = await get_playtype(message.chat.id)
-        if playty != "Everyone":
-            if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
-                if not admins:
+        if ctx.channel_error:
+            return await message.reply_text(_[ctx.channel_error])
+        chat_id = ctx.target_chat_id
+        channel = ctx.channel
+        playmode = ctx.playmode
+        if ctx.playtype != "Everyone":
+            if not ctx.is_sudo:
+                if not await get_admins(client, message.chat.id):
                     return await message.reply_text(_["admin_13"])
-                else:
-                    if message.from_user.id not in admins:
-                        return await message.reply_text(_["play_4"])
+                elif not ctx.is_admin:
+                    return await message.reply_text(_["play_4"])
         if message.command[0][0] == "v":
             video = True
         else:
@@ -108,13 +89,13 @@ def PlayWrapper(command):
             else:
                 video = True if message.command[0][1] == "v" else None
         if message.command[0][-1] == "e":
-            if not await is_active_chat(chat_id):
+            if not ctx.active:
                 return await message.reply_text(_["play_16"])
             fplay = True
         else:
             fplay = None
 
-        if not await is_active_chat(chat_id):
+        if not ctx.active:
             userbot = await get_assistant(chat_id)
             try:
                 try:
@@ -181,6 +162,7 @@ def PlayWrapper(command):
                 except:
                     pass
 
+        await set_queries(1)
         return await command(
             client,
             message,
@@ -197,9 +179,9 @@ def PlayWrapper(command):
 
 def CPlayWrapper(command):
     async def wrapper(client, message):
-        i = await client.get_me()
-        language = await get_lang(message.chat.id)
-        _ = get_string(language)
+        i = client.me
+        ctx = await get_context(client, message)
+        _ = ctx._
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
                 [
@@ -213,12 +195,11 @@ def CPlayWrapper(command):
             )
             return await message.reply_text(_["general_3"], reply_markup=upl)
 
-        if await is_maintenance() is False:
-            if message.from_user.id not in SUDOERS:
-                return await message.reply_text(
-                    text=f"{i.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ <a href={SUPPORT_CHAT}>sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ</a> ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
-                    disable_web_page_preview=True,
-                )
+        if ctx.blocked_by_maintenance:
+            return await message.reply_text(
+                text=f"{i.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ <a href={SUPPORT_CHAT}>sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ</a> ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
+                disable_web_page_preview=True,
+            )
 
         try:
             await message.delete()
@@ -246,28 +227,17 @@ def CPlayWrapper(command):
                     caption=_["play_18"],
                     reply_markup=InlineKeyboardMarkup(buttons),
                 )
-        if message.command[0][0] == "c":
-            chat_id = await get_cmode(message.chat.id)
-            if chat_id is None:
-                return await message.reply_text(_["setting_7"])
-            try:
-                chat = await client.get_chat(chat_id)
-            except:
-                return await message.reply_text(_["cplay_4"])
-            channel = chat.title
-        else:
-            chat_id = message.chat.id
-            channel = None
-        playmode = await get_playmode(message.chat.id)
-        playty = await get_playtype(message.chat.id)
-        if playty != "Everyone":
-            if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
-                if not admins:
+        if ctx.channel_error:
+            return await message.reply_text(_[ctx.channel_error])
+        chat_id = ctx.target_chat_id
+        channel = ctx.channel
+        playmode = ctx.playmode
+        if ctx.playtype != "Everyone":
+            if not ctx.is_sudo:
+                if not await get_admins(client, message.chat.id):
                     return await message.reply_text(_["admin_13"])
-                else:
-                    if message.from_user.id not in admins:
-                        return await message.reply_text(_["play_4"])
+                elif not ctx.is_admin:
+                    return await message.reply_text(_["play_4"])
         if message.command[0][0] == "v":
             video = True
         else:
@@ -276,13 +246,18 @@ def CPlayWrapper(command):
             else:
                 video = True if message.command[0][1] == "v" else None
         if message.command[0][-1] == "e":
-            if not await is_active_chat(chat_id):
+            if not ctx.active:
                 return await message.reply_text(_["play_16"])
             fplay = True
         else:
             fplay = None
 
-        if not await is_active_chat(chat_id):
+        # refuse over-quota plays before the assistant joins anything
+        over = admit_play(i.id, chat_id, video)
+        if over:
+            return await message.reply_text(quota_text(over, i.id, i.mention))
+
+        if not ctx.active:
             userbot = await get_assistant(chat_id)
             try:
                 try:
@@ -349,6 +324,7 @@ def CPlayWrapper(command):
                 except:
                     pass
 
+        await set_queries(1)
         return await command(
             client,
             message,
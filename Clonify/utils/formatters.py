@@ -183,3 +183,14 @@ formats = [
     "f4a",
     "f4b",
   ]
+
+
+def leaderboard_text(title: str, tracks: list, users: list, names: dict) -> str:
+    text = f"<u><b>{title}</b></u>\n\n<b>ᴛᴏᴘ ᴛʀᴀᴄᴋs :</b>\n"
+    for i, track in enumerate(tracks, 1):
+        text += f"{i}. {str(track.get('title') or track['key'])[:35]} - <code>{track['spot']}</code>\n"
+    text += "\n<b>ᴛᴏᴘ ᴜsᴇʀs :</b>\n"
+    for i, user in enumerate(users, 1):
+        name = names.get(user["key"], user["key"])
+        text += f"{i}. <a href='tg://user?id={user['key']}'>{name}</a> - <code>{user['spot']}</code>\n"
+    return text
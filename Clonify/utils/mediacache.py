@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import os
+import time
+from functools import partial
+
+from pyrogram.errors import (
+    FileIdInvalid,
+    FileReferenceEmpty,
+    FileReferenceExpired,
+    FileReferenceInvalid,
+    MediaEmpty,
+)
+
+from Clonify.core.cache import AsyncTTLCache
+from Clonify.logging import LOGGER
+from Clonify.misc import mongodb
+
+fileiddb = mongodb.fileids
+
+# raised when a recorded file_id no longer resolves for this bot; pyrogram
+# itself raises ValueError for a file_id of the wrong media type
+STALE_ERRORS = (
+    FileIdInvalid,
+    FileReferenceEmpty,
+    FileReferenceExpired,
+    FileReferenceInvalid,
+    MediaEmpty,
+    ValueError,
+)
+
+# (bot_id, kind, key) -> file_id, or None when the bot never sent the asset as
+# that kind; a URL sent as a photo and as a video has two file_ids
+file_ids = AsyncTTLCache("fileids", ttl=86400)
+# path -> (mtime, size, sha1) so unchanged files are hashed once
+_hashes = {}
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def media_key(media):
+    """URL for remote assets, content hash for local files, None otherwise."""
+    if not isinstance(media, str):
+        return None
+    if media.startswith(("http://", "https://")):
+        return media
+    if not os.path.isfile(media):
+        # already a file_id
+        return None
+    stat = os.stat(media)
+    cached = _hashes.get(media)
+    if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+        return cached[2]
+    loop = asyncio.get_running_loop()
+    digest = await loop.run_in_executor(None, _hash_file, media)
+    _hashes[media] = (stat.st_mtime, stat.st_size, f"sha1:{digest}")
+    return _hashes[media][2]
+
+
+async def _load(entry):
+    bot_id, kind, key = entry
+    doc = await fileiddb.find_one({"bot_id": bot_id, "kind": kind, "key": key})
+    return doc["file_id"] if doc else None
+
+
+async def get_file_id(bot_id: int, kind: str, key: str):
+    return await file_ids.get((bot_id, kind, key), _load)
+
+
+async def save_file_id(bot_id: int, kind: str, key: str, file_id: str):
+    file_ids.set((bot_id, kind, key), file_id)
+    await fileiddb.update_one(
+        {"bot_id": bot_id, "kind": kind, "key": key},
+        {"$set": {"file_id": file_id, "updated": time.time()}},
+        upsert=True,
+    )
+
+
+async def delete_file_id(bot_id: int, kind: str, key: str):
+    file_ids.invalidate((bot_id, kind, key))
+    await fileiddb.delete_one({"bot_id": bot_id, "kind": kind, "key": key})
+
+
+def _sent_file_id(message, kind: str):
+    if not message or message is True:
+        return None
+    # Telegram may store a sent video as an animation, or anything as a document
+    media = (
+        getattr(message, kind, None)
+        or message.photo
+        or message.video
+        or message.animation
+        or message.document
+    )
+    return media.file_id if media else None
+
+
+async def send_media(client, send, kind: str, media, **kwargs):
+    """
+    Call ``send(media, **kwargs)`` with ``media`` replaced by the file_id this
+    bot got the last time it sent the same URL or file as ``kind`` (photo,
+    video, animation), and record the
+    file_id after the first upload. A stale file_id is dropped and the
+    original media is sent instead.
+    """
+    key = await media_key(media)
+    if key is None:
+        return await send(media, **kwargs)
+    bot_id = client.me.id
+    file_id = await get_file_id(bot_id, kind, key)
+    if file_id:
+        try:
+            return await send(file_id, **kwargs)
+        except STALE_ERRORS as e:
+            LOGGER(__name__).info(f"Dropping stale file_id of {key} for {bot_id}: {e}")
+            await delete_file_id(bot_id, kind, key)
+    sent = await send(media, **kwargs)
+    file_id = _sent_file_id(sent, kind)
+    if file_id:
+        try:
+            await save_file_id(bot_id, kind, key, file_id)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not save file_id of {key}: {e}")
+    return sent
+
+
+async def send_photo(client, chat_id, photo, **kwargs):
+    return await send_media(
+        client, partial(client.send_photo, chat_id), "photo", photo, **kwargs
+    )
+
+
+async def reply_photo(message, photo, **kwargs):
+    return await send_media(message._client, message.reply_photo, "photo", photo, **kwargs)
+
+
+async def reply_video(message, video, **kwargs):
+    return await send_media(message._client, message.reply_video, "video", video, **kwargs)
+
+
+async def edit_media(query, media, **kwargs):
+    """``query.edit_message_media`` for an InputMedia whose ``media`` may be cached."""
+
+    async def edit(value, **kwargs):
+        media.media = value
+        return await query.edit_message_media(media=media, **kwargs)
+
+    # InputMediaPhoto -> "photo", InputMediaVideo -> "video", ...
+    kind = type(media).__name__[len("InputMedia"):].lower()
+    return await send_media(query._client, edit, kind, media.media, **kwargs)
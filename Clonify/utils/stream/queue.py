@@ -2,6 +2,7 @@ import asyncio
 from typing import Union
 
 from Clonify.misc import db
+from Clonify.utils.database.stats import record_play
 from Clonify.utils.formatters import check_duration, seconds_to_min
 from config import autoclean, time_to_seconds
 
@@ -17,6 +18,7 @@ async def put_queue(
     user_id,
     stream,
     forceplay: Union[bool, str] = None,
+    bot_id: int = 0,
 ):
     title = title.title()
     try:
@@ -45,6 +47,7 @@ async def put_queue(
     else:
         db[chat_id].append(put)
     autoclean.append(file)
+    record_play(original_chat_id, user_id, vidid, title, bot_id)
 
 
 async def put_queue_index(
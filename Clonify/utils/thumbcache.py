@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import config
+from Clonify.core.cache import AsyncTTLCache
+from Clonify.logging import LOGGER
+from Clonify.utils.thumbnails import get_thumb, preload
+
+# third-party for downloading remote thumbnails
+try:
+    import requests
+except Exception:
+    requests = None
+
+CARD_DIR = "./thumbnails/cards"
+CARD_TTL = 86400
+
+# (vidid, style, title, artist) -> path of the rendered card
+cards = AsyncTTLCache("thumbnails", ttl=CARD_TTL)
+# path -> size of every card on disk, least recently used first
+_disk = OrderedDict()
+_disk_size = {"bytes": 0, "loaded": False}
+_pool = {"executor": None}
+
+
+# ------------------------------
+# Helper: Download provider thumbnail
+# ------------------------------
+def download_provider_thumbnail(url: str, vidid: str) -> str:
+    """
+    Download provider thumbnail (URL) into ./downloads/{vidid}.jpg.
+    Returns the local path (or './downloads/default.jpg' on failure).
+    """
+    try:
+        os.makedirs("./downloads", exist_ok=True)
+        out_path = f"./downloads/{vidid}.jpg"
+
+        # if file already exists, return it
+        if os.path.isfile(out_path):
+            return out_path
+
+        if not url or not isinstance(url, str):
+            return "./downloads/default.jpg"
+
+        # if it's already a local path
+        if os.path.isfile(url):
+            return url
+
+        # if requests not available, just return default (caller will use fallback)
+        if requests is None:
+            print("[thumbnail-download] requests not available, skipping download")
+            return "./downloads/default.jpg"
+
+        # Basic safety: accept http/https only
+        if not (url.startswith("http://") or url.startswith("https://")):
+            return "./downloads/default.jpg"
+
+        # stream download (small image)
+        r = requests.get(url, timeout=8, stream=True)
+        if r.status_code == 200:
+            with open(out_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=8192):
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            # verify saved
+            if os.path.isfile(out_path):
+                return out_path
+        else:
+            print(f"[thumbnail-download] HTTP {r.status_code} for {url}")
+    except Exception as e:
+        print(f"[thumbnail-download] error downloading {url}: {e}")
+    return "./downloads/default.jpg"
+
+
+# ------------------------------
+# Thumbnail Generator (safe)
+# ------------------------------
+def safe_generate_thumbnail(vidid: str,
+                            title: str = "Unknown",
+                            artist: str = "Unknown",
+                            provider_thumb: Optional[str] = None,
+                            output_path: Optional[str] = None,
+                            style: str = "A") -> str:
+    """
+    Generate a thumbnail synchronously and return the file path.
+    Flow:
+      1) If provider_thumb is a URL -> attempt to download it into ./downloads/{vidid}.jpg
+      2) Use local ./downloads/{vidid}.jpg (if exists) as album_art_path to produce card via get_thumb()
+      3) If generation fails, fallback to provider_thumb (URL) or configured images or local default
+    """
+    try:
+        os.makedirs("./thumbnails", exist_ok=True)
+    except Exception:
+        pass
+
+    # Step 1: ensure we have a local album_art_path
+    album_art_path = f"./downloads/{vidid}.jpg"
+    # If provider provided and is remote URL, try download (will return default path on failure)
+    if provider_thumb and isinstance(provider_thumb, str) and (provider_thumb.startswith("http://") or provider_thumb.startswith("https://")):
+        try:
+            dl_path = download_provider_thumbnail(provider_thumb, vidid)
+            if dl_path and os.path.isfile(dl_path):
+                album_art_path = dl_path
+        except Exception as e:
+            print(f"[safe_generate_thumbnail] download failed: {e}")
+
+    # If provider_thumb is local path and exists, use it
+    if provider_thumb and isinstance(provider_thumb, str) and os.path.isfile(provider_thumb):
+        album_art_path = provider_thumb
+
+    # If local album_art_path missing, fall back to local default (downloads/default.jpg)
+    if not os.path.isfile(album_art_path):
+        if os.path.isfile("./downloads/default.jpg"):
+            album_art_path = "./downloads/default.jpg"
+        else:
+            # ensure downloads exists and create a tiny default if not present
+            try:
+                os.makedirs("./downloads", exist_ok=True)
+                from PIL import Image
+                tiny = "./downloads/default.jpg"
+                if not os.path.isfile(tiny):
+                    Image.new("RGB", (640, 360), (44, 9, 8)).save(tiny)
+                album_art_path = tiny
+            except Exception:
+                album_art_path = "./downloads/default.jpg"
+
+    # Step 2: call your generator (get_thumb)
+    output_path = output_path or f"./thumbnails/{vidid}.png"
+    try:
+        # get_thumb signature in your thumbnails.py:
+        # get_thumb(album_art_path, song_title=..., artist_name=..., output_path=..., style="A", reference_image=None)
+        ret = get_thumb(
+            album_art_path,
+            song_title=title,
+            artist_name=artist,
+            output_path=output_path,
+            style=style
+        )
+        # Some implementations may return the path, others may not
+        if isinstance(ret, str) and os.path.isfile(ret):
+            return ret
+        if os.path.isfile(output_path):
+            return output_path
+    except Exception as e:
+        print(f"[safe_generate_thumbnail] get_thumb() failed: {e}")
+
+    # Step 3: fallback chain (try provider_thumb first)
+    if provider_thumb:
+        try:
+            if os.path.isfile(provider_thumb):
+                return provider_thumb
+            if provider_thumb.startswith("http://") or provider_thumb.startswith("https://"):
+                return provider_thumb
+        except Exception:
+            pass
+
+    # Step 4: try configured images in config
+    for candidate in (
+        getattr(config, "TELEGRAM_AUDIO_URL", None),
+        getattr(config, "SOUNCLOUD_IMG_URL", None),
+        getattr(config, "STREAM_IMG_URL", None),
+        getattr(config, "TELEGRAM_VIDEO_URL", None),
+        getattr(config, "SUPPORT_CHAT", None),
+    ):
+        if not candidate:
+            continue
+        if isinstance(candidate, str) and os.path.isfile(candidate):
+            return candidate
+        if isinstance(candidate, str) and (candidate.startswith("http://") or candidate.startswith("https://")):
+            return candidate
+
+    # Step 5: local downloads/default.jpg
+    if os.path.isfile("./downloads/default.jpg"):
+        return "./downloads/default.jpg"
+
+    # Step 6: create minimal fallback thumbnail
+    try:
+        from PIL import Image
+        tiny_path = "./thumbnails/fallback_default.png"
+        if not os.path.isfile(tiny_path):
+            Image.new("RGB", (640, 360), (44, 9, 8)).save(tiny_path)
+        return tiny_path
+    except Exception as e:
+        print(f"[safe_generate_thumbnail] final fallback failed: {e}")
+        return "./downloads/default.jpg"
+
+
+def _executor() -> ProcessPoolExecutor:
+    if _pool["executor"] is None:
+        _pool["executor"] = ProcessPoolExecutor(
+            max_workers=config.THUMB_WORKERS, initializer=preload
+        )
+    return _pool["executor"]
+
+
+def _card_path(vidid: str, style: str, title: str, artist: str) -> str:
+    digest = hashlib.sha1(f"{style}\0{title}\0{artist}".encode()).hexdigest()[:16]
+    name = "".join(c for c in str(vidid) if c.isalnum() or c in "-_")[:64]
+    return os.path.join(CARD_DIR, f"{name}_{style}_{digest}.png")
+
+
+def _load_disk():
+    _disk_size["loaded"] = True
+    os.makedirs(CARD_DIR, exist_ok=True)
+    entries = []
+    for entry in os.scandir(CARD_DIR):
+        if entry.is_file() and entry.name.endswith(".png"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, entry.path, stat.st_size))
+    for _, path, size in sorted(entries):
+        _disk[path] = size
+        _disk_size["bytes"] += size
+
+
+def _touch(path: str):
+    if path in _disk:
+        _disk.move_to_end(path)
+
+
+def _store(path: str):
+    size = os.path.getsize(path)
+    _disk_size["bytes"] += size - _disk.pop(path, 0)
+    _disk[path] = size
+    budget = config.THUMB_CACHE_MB * 1024 * 1024
+    while _disk_size["bytes"] > budget and len(_disk) > 1:
+        old, old_size = _disk.popitem(last=False)
+        _disk_size["bytes"] -= old_size
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+async def _render(key, provider_thumb):
+    vidid, style, title, artist = key
+    path = _card_path(vidid, style, title, artist)
+    if path in _disk and os.path.isfile(path):
+        _touch(path)
+        return path
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        _executor(),
+        safe_generate_thumbnail,
+        vidid,
+        title,
+        artist,
+        provider_thumb,
+        path,
+        style,
+    )
+    if result == path and os.path.isfile(path):
+        _store(path)
+    return result
+
+
+async def get_card(
+    vidid: str, title: str, artist: str, provider_thumb: str = None, style: str = "A"
+) -> str:
+    """Now-playing card for a track, rendered once per node in a worker process.
+
+    Falls back like ``safe_generate_thumbnail`` when rendering fails; fallbacks
+    are not cached so the next play tries again.
+    """
+    if not _disk_size["loaded"]:
+        _load_disk()
+    key = (str(vidid), style, str(title), str(artist))
+    path = cards.peek(key)
+    if path is not None:
+        if os.path.isfile(path):
+            _touch(path)
+            return path
+        cards.invalidate(key)
+    try:
+        result = await cards.get(key, lambda k: _render(k, provider_thumb))
+    except Exception as e:
+        LOGGER(__name__).warning(f"Thumbnail render failed for {vidid}: {e}")
+        return config.YOUTUBE_IMG_URL
+    if result != _card_path(*key):
+        cards.invalidate(key)
+    return result
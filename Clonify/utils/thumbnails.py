@@ -12,6 +12,7 @@ Usage:
 If reference_image is provided, key colors will be sampled from it for a perfect match.
 """
 
+from functools import lru_cache
 from typing import Optional, Union
 from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageFilter
 import os
@@ -25,6 +26,10 @@ WIDGET = (1400, 625)          # inner rounded card size
 WIDGET_POS = (25, 75)         # widget top-left on canvas
 RADIUS = 70                   # widget corner radius
 ART_SIZE = (620, 630)         # left album art area (exact from screenshot)
+TEXT_X = WIDGET_POS[0] + ART_SIZE[0] + 70   # left edge of the text block
+BAR_W = 620                   # progress bar width
+BAR_H = 14                    # progress bar height
+ICON_Y = WIDGET_POS[1] + 330  # playback controls row
 
 # ---------------------------
 # DEFAULT COLORS (sampled approximate)
@@ -53,6 +58,7 @@ _FONT_PATHS = [
 ]
 
 
+@lru_cache(maxsize=None)
 def load_font(size: int, bold: bool = False):
     # prefer a Bold file when bold=True
     for p in _FONT_PATHS:
@@ -73,6 +79,13 @@ def load_font(size: int, bold: bool = False):
         raise RuntimeError("No usable font found")
 
 
+# every size the styles ask for, including the title/artist shrink steps
+FONT_SIZES = {
+    True: sorted({56, 70} | set(range(90, 14, -6))),
+    False: sorted({34, 36, 40, 42} | set(range(50, 8, -4))),
+}
+
+
 # ---------------------------
 # Utilities
 # ---------------------------
@@ -81,6 +94,8 @@ def ensure_dir(path: str) -> None:
     os.makedirs(d, exist_ok=True)
 
 
+# cached images below are shared between renders, never draw on them
+@lru_cache(maxsize=16)
 def rounded_mask(size, radius):
     m = Image.new("L", size, 0)
     d = ImageDraw.Draw(m)
@@ -88,9 +103,13 @@ def rounded_mask(size, radius):
     return m
 
 
+@lru_cache(maxsize=16)
+def _solid(size, color):
+    return Image.new("RGB", size, color)
+
+
 def tint_image(img: Image.Image, tint_color=RED_TINT, strength=0.65) -> Image.Image:
-    overlay = Image.new("RGB", img.size, tint_color)
-    return Image.blend(img.convert("RGB"), overlay, strength)
+    return Image.blend(img.convert("RGB"), _solid(img.size, tint_color), strength)
 
 
 def mmss(sec: Union[int, float]) -> str:
@@ -192,6 +211,7 @@ def draw_next(draw: ImageDraw.Draw, x, y, scale=1.0, fill=(255, 255, 255)):
 # ---------------------------
 # Placeholder art (if no album provided)
 # ---------------------------
+@lru_cache(maxsize=8)
 def placeholder_art(size):
     w, h = size
     base = Image.new("RGB", (w, h), (30, 10, 10))
@@ -209,6 +229,62 @@ def placeholder_art(size):
 # ---------------------------
 # Style A: Pixel-accurate player (main)
 # ---------------------------
+def _palette():
+    return (BG_COLOR, WIDGET_COLOR, RED_TINT, TITLE_COLOR, ARTIST_COLOR,
+            ALBUM_COLOR, PROG_BG, PROG_FG, ICON_COLOR)
+
+
+@lru_cache(maxsize=8)
+def _style_a_layers(palette):
+    """
+    Static parts of style A for one palette, built once per process.
+    Returns the background (canvas + rounded widget) and the controls layer
+    (playback icons, speaker/bluetooth, volume bar) with its paste position.
+    """
+    bg_color, widget_color, _, _, _, _, prog_bg, prog_fg, icon_color = palette
+
+    base = Image.new("RGB", CANVAS, bg_color)
+    base.paste(_solid(WIDGET, widget_color), WIDGET_POS, rounded_mask(WIDGET, RADIUS))
+
+    controls = Image.new("RGBA", CANVAS, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(controls)
+    center_x = TEXT_X + BAR_W // 2
+
+    # draw prev / pause / next using the vector routines
+    draw_prev(draw, center_x - 150, ICON_Y, scale=1.2, fill=icon_color)
+    draw_pause(draw, center_x - 12, ICON_Y, scale=1.2, fill=icon_color)
+    draw_next(draw, center_x + 120, ICON_Y, scale=1.2, fill=icon_color)
+
+    # bluetooth + speaker icons (simple vector approximations)
+    # speaker (left of bluetooth)
+    sp_x = TEXT_X + BAR_W + 28
+    sp_y = ICON_Y
+    # small speaker triangle + rectangle
+    draw.polygon([(sp_x - 26, sp_y - 14), (sp_x - 6, sp_y - 14), (sp_x + 2, sp_y - 4), (sp_x + 2, sp_y + 4), (sp_x - 6, sp_y + 14), (sp_x - 26, sp_y + 14)], fill=icon_color)
+    # bluetooth (approx) to the right of speaker
+    bt_x = sp_x + 32
+    bt_y = sp_y
+    # simplified bluetooth: two crossing triangles/lines
+    draw.line((bt_x - 4, bt_y - 20, bt_x + 14, bt_y), fill=icon_color, width=4)
+    draw.line((bt_x + 14, bt_y, bt_x - 4, bt_y + 20), fill=icon_color, width=4)
+    draw.line((bt_x - 4, bt_y - 20, bt_x - 4, bt_y + 20), fill=icon_color, width=2)
+
+    # bottom volume bar (near bottom right area)
+    vol_y = WIDGET_POS[1] + WIDGET[1] - 120
+    vol_x = TEXT_X
+    vol_w = 560
+    vol_h = 14
+    draw.rounded_rectangle((vol_x, vol_y, vol_x + vol_w, vol_y + vol_h), radius=8, fill=prog_bg)
+    vol_level = int(vol_w * 0.72)
+    draw.rounded_rectangle((vol_x, vol_y, vol_x + vol_level, vol_y + vol_h), radius=8, fill=prog_fg)
+    # little end blocks as in screenshot
+    draw.rectangle((vol_x - 14, vol_y + 2, vol_x - 6, vol_y + vol_h - 2), fill=icon_color)
+    draw.rectangle((vol_x + vol_w + 6, vol_y + 2, vol_x + vol_w + 14, vol_y + vol_h - 2), fill=icon_color)
+
+    box = controls.getbbox()
+    return base, controls.crop(box), box[:2]
+
+
 def generate_style_a(album_art_path,
                      song_title,
                      artist_name,
@@ -239,11 +315,9 @@ def generate_style_a(album_art_path,
             PROG_FG = sampled["PROG_FG"]
             ICON_COLOR = sampled["ICON_COLOR"]
 
-    # prepare canvas and widget (rounded)
-    canvas = Image.new("RGB", CANVAS, BG_COLOR)
-    widget = Image.new("RGB", WIDGET, WIDGET_COLOR)
-    mask_w = rounded_mask(WIDGET, RADIUS)
-    canvas.paste(widget, WIDGET_POS, mask_w)
+    # canvas and widget (rounded) come prebuilt for the current palette
+    base, controls, controls_pos = _style_a_layers(_palette())
+    canvas = base.copy()
 
     # load album art (if None, use placeholder)
     art = _open_album_art(album_art_path)
@@ -265,7 +339,7 @@ def generate_style_a(album_art_path,
     f_time = load_font(34)
 
     # text block measured from screenshot
-    right_x = WIDGET_POS[0] + ART_SIZE[0] + 70
+    right_x = TEXT_X
     y = WIDGET_POS[1] + 30
 
     # album label (small)
@@ -297,8 +371,8 @@ def generate_style_a(album_art_path,
     y += getattr(artist_font, "size", 40) + 60
 
     # progress bar
-    bar_w = 620
-    bar_h = 14
+    bar_w = BAR_W
+    bar_h = BAR_H
     bx, by = right_x, y
     # bg
     draw.rounded_rectangle((bx, by, bx + bar_w, by + bar_h), radius=10, fill=PROG_BG)
@@ -316,40 +390,8 @@ def generate_style_a(album_art_path,
     draw.text((bx, y_time), mmss(current_seconds), font=f_time, fill=ARTIST_COLOR)
     draw.text((bx + bar_w - 110, y_time), "-" + mmss(total_seconds), font=f_time, fill=ARTIST_COLOR)
 
-    # playback controls row
-    icon_center_y = WIDGET_POS[1] + 330
-    center_x = bx + bar_w // 2
-
-    # draw prev / pause / next using the vector routines
-    draw_prev(draw, center_x - 150, icon_center_y, scale=1.2, fill=ICON_COLOR)
-    draw_pause(draw, center_x - 12, icon_center_y, scale=1.2, fill=ICON_COLOR)
-    draw_next(draw, center_x + 120, icon_center_y, scale=1.2, fill=ICON_COLOR)
-
-    # bluetooth + speaker icons (simple vector approximations)
-    # speaker (left of bluetooth)
-    sp_x = bx + bar_w + 28
-    sp_y = icon_center_y
-    # small speaker triangle + rectangle
-    draw.polygon([(sp_x - 26, sp_y - 14), (sp_x - 6, sp_y - 14), (sp_x + 2, sp_y - 4), (sp_x + 2, sp_y + 4), (sp_x - 6, sp_y + 14), (sp_x - 26, sp_y + 14)], fill=ICON_COLOR)
-    # bluetooth (approx) to the right of speaker
-    bt_x = sp_x + 32
-    bt_y = sp_y
-    # simplified bluetooth: two crossing triangles/lines
-    draw.line((bt_x - 4, bt_y - 20, bt_x + 14, bt_y), fill=ICON_COLOR, width=4)
-    draw.line((bt_x + 14, bt_y, bt_x - 4, bt_y + 20), fill=ICON_COLOR, width=4)
-    draw.line((bt_x - 4, bt_y - 20, bt_x - 4, bt_y + 20), fill=ICON_COLOR, width=2)
-
-    # bottom volume bar (near bottom right area)
-    vol_y = WIDGET_POS[1] + WIDGET[1] - 120
-    vol_x = right_x
-    vol_w = 560
-    vol_h = 14
-    draw.rounded_rectangle((vol_x, vol_y, vol_x + vol_w, vol_y + vol_h), radius=8, fill=PROG_BG)
-    vol_level = int(vol_w * 0.72)
-    draw.rounded_rectangle((vol_x, vol_y, vol_x + vol_level, vol_y + vol_h), radius=8, fill=PROG_FG)
-    # little end blocks as in screenshot
-    draw.rectangle((vol_x - 14, vol_y + 2, vol_x - 6, vol_y + vol_h - 2), fill=ICON_COLOR)
-    draw.rectangle((vol_x + vol_w + 6, vol_y + 2, vol_x + vol_w + 14, vol_y + vol_h - 2), fill=ICON_COLOR)
+    # playback controls, speaker/bluetooth and volume bar sit on top
+    canvas.paste(controls, controls_pos, controls)
 
     ensure_dir(output_path)
     canvas.save(output_path, quality=95)
@@ -379,14 +421,21 @@ def generate_style_b(album_art_path, song_title, artist_name, album_label,
     return output_path
 
 
-def generate_style_c(album_art_path, song_title, artist_name, album_label,
-                     current_seconds, total_seconds, output_path, reference_image: Optional[str] = None):
+@lru_cache(maxsize=1)
+def _style_c_background():
     w, h = CANVAS
     img = Image.new("RGB", (w, h), (30, 30, 30))
     draw = ImageDraw.Draw(img)
     for yy in range(h):
         g = int(30 + (120 - 30) * (yy / max(1, h - 1)))
         draw.line((0, yy, w, yy), fill=(g, int(g * 0.6), int(g * 0.4)))
+    return img
+
+
+def generate_style_c(album_art_path, song_title, artist_name, album_label,
+                     current_seconds, total_seconds, output_path, reference_image: Optional[str] = None):
+    img = _style_c_background().copy()
+    draw = ImageDraw.Draw(img)
     art = _open_album_art(album_art_path)
     if art is None:
         art = placeholder_art((520, 520))
@@ -440,6 +489,20 @@ def generate_thumbnail(style: str = "A",
     )
 
 
+def preload():
+    """
+    Build every static layer and open every font size up front, so the first
+    render in a fresh (worker) process costs the same as the rest.
+    """
+    for bold, sizes in FONT_SIZES.items():
+        for size in sizes:
+            load_font(size, bold=bold)
+    _style_a_layers(_palette())
+    _style_c_background()
+    rounded_mask(ART_SIZE, 28)
+    placeholder_art(ART_SIZE)
+
+
 # Backwards compatibility wrapper used by your codebase
 def get_thumb(album_art_path,
               song_title="Unknown Title",
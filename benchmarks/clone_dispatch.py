@@ -0,0 +1,68 @@
+"""Per-clone memory of the shared handler table against a plugin tree per clone.
+
+Run from the repository root with the bot's environment loaded:
+
+    python -m benchmarks.clone_dispatch [clones]
+"""
+import asyncio
+import gc
+import sys
+import tracemalloc
+
+from pyrogram import Client
+
+from Clonify.core.clones import CLONE_PLUGINS, attach_handlers, clone_handlers
+
+API_HASH = "0" * 32
+
+
+def _client(i: int, **kwargs) -> Client:
+    return Client(
+        f"bench_{i}", 1, API_HASH, bot_token=f"{i}:bench", in_memory=True, **kwargs
+    )
+
+
+async def _measure(count: int, build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clients = [await build(i) for i in range(count)]
+    # add_handler applies its changes in tasks, let them run
+    await asyncio.sleep(0.1)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del clients
+    return used / count
+
+
+async def _shared(i: int) -> Client:
+    client = _client(i, workers=4)
+    attach_handlers(client)
+    return client
+
+
+async def _plugins(i: int) -> Client:
+    client = _client(i, plugins=dict(root=CLONE_PLUGINS))
+    client.load_plugins()
+    return client
+
+
+async def _bare(i: int) -> Client:
+    return _client(i, workers=4)
+
+
+async def main(count: int):
+    # import every plugin up front so neither side pays for it
+    handlers = sum(len(group) for group in clone_handlers().values())
+    bare = await _measure(count, _bare)
+    shared = await _measure(count, _shared)
+    plugins = await _measure(count, _plugins)
+    print(f"{count} simulated clones, {handlers} handlers")
+    print(f"bare client          {bare / 1024:10.1f} KiB/clone")
+    print(f"shared handler table {(shared - bare) / 1024:10.1f} KiB/clone on top")
+    print(f"plugin tree          {(plugins - bare) / 1024:10.1f} KiB/clone on top")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
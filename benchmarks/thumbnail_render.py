@@ -0,0 +1,72 @@
+"""Renders per second of the now-playing card with and without the static layers.
+
+"cold" clears the font, mask and layer caches before every render, which is
+what each render paid before they existed; "warm" reuses them.
+
+Run from the repository root:
+
+    python -m benchmarks.thumbnail_render [renders] [style]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+from Clonify.utils import thumbnails
+
+CACHED = (
+    thumbnails.load_font,
+    thumbnails.rounded_mask,
+    thumbnails._solid,
+    thumbnails.placeholder_art,
+    thumbnails._style_a_layers,
+    thumbnails._style_c_background,
+)
+
+
+def _clear():
+    for func in CACHED:
+        func.cache_clear()
+
+
+def _run(count: int, style: str, art: str, out: str, cold: bool) -> float:
+    if not cold:
+        thumbnails.preload()
+    start = time.perf_counter()
+    for i in range(count):
+        if cold:
+            _clear()
+        thumbnails.generate_thumbnail(
+            style=style,
+            album_art_path=art,
+            song_title=f"Benchmark Track Number {i} With A Long Title",
+            artist_name="Some Artist",
+            current_seconds=i,
+            total_seconds=count,
+            output_path=out,
+        )
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int, style: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        art = os.path.join(tmp, "art.jpg")
+        out = os.path.join(tmp, "card.png")
+        Image.effect_mandelbrot((1280, 720), (-2, -1.2, 1, 1.2), 64).convert(
+            "RGB"
+        ).save(art)
+        cold = _run(count, style, art, out, cold=True)
+        warm = _run(count, style, art, out, cold=False)
+    print(f"style {style}, {count} renders")
+    print(f"cold (rebuild every render) {cold:8.2f} renders/s")
+    print(f"warm (static layers)        {warm:8.2f} renders/s")
+    print(f"speedup                     {warm / cold:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        sys.argv[2].upper() if len(sys.argv) > 2 else "A",
+    )
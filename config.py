@@ -99,6 +99,34 @@ votemode = {}
 autoclean = []
 confirmer = {}
 
+# ====================================================
+# Settings Cache
+# ====================================================
+# Entries kept per cache namespace before least recently used ones are evicted.
+CACHE_MAXSIZE = int(getenv("CACHE_MAXSIZE", 50000))
+# Seconds a cached chat setting is trusted before it is read from mongo again.
+CACHE_TTL = int(getenv("CACHE_TTL", 600))
+# Seconds before a chat's admin list is refetched; member updates keep it fresh meanwhile.
+ADMIN_CACHE_TTL = int(getenv("ADMIN_CACHE_TTL", 3600))
+# Seconds a failed admin fetch (e.g. the bot is not an admin) is remembered before retrying.
+ADMIN_FAILURE_TTL = int(getenv("ADMIN_FAILURE_TTL", 120))
+
+# ====================================================
+# Broadcast
+# ====================================================
+# Messages per second a single bot may send while broadcasting.
+BROADCAST_RATE = float(getenv("BROADCAST_RATE", 20))
+# Recipients a broadcast sends to concurrently.
+BROADCAST_CONCURRENCY = int(getenv("BROADCAST_CONCURRENCY", 10))
+
+# ====================================================
+# Thumbnails
+# ====================================================
+# Disk budget of rendered now-playing cards, oldest used cards go first.
+THUMB_CACHE_MB = int(getenv("THUMB_CACHE_MB", 256))
+# Worker processes rendering cards off the event loop.
+THUMB_WORKERS = int(getenv("THUMB_WORKERS", 2))
+
 # ====================================================
 # Image & Media URLs
 # ====================================================
@@ -144,6 +172,52 @@ if SUPPORT_CHAT and not re.match(r"(?:http|https)://", SUPPORT_CHAT):
         "[ERROR] - Invalid SUPPORT_CHAT URL. It must start with https://"
     )
 
+# ====================================================
+# Clone Bots
+# ====================================================
+# Clones validated and started at the same time on boot.
+CLONE_START_CONCURRENCY = int(getenv("CLONE_START_CONCURRENCY", 10))
+# Minimum seconds between two clone logins, keeps Telegram from flood-waiting us.
+CLONE_START_INTERVAL = float(getenv("CLONE_START_INTERVAL", 0.5))
+# Where clone sessions live: "mongo" keeps auth keys in the database so any
+# node can resume a clone without logging in again, "memory" keeps nothing.
+CLONE_SESSION_STORE = getenv("CLONE_SESSION_STORE", "mongo").lower()
+# Update worker tasks per clone, clones share one handler table.
+CLONE_WORKERS = int(getenv("CLONE_WORKERS", 4))
+# Per-clone quotas, premium clones get the PREMIUM_ tier.
+CLONE_MAX_CALLS = int(getenv("CLONE_MAX_CALLS", 5))
+CLONE_PREMIUM_MAX_CALLS = int(getenv("CLONE_PREMIUM_MAX_CALLS", 25))
+CLONE_VIDEO = getenv("CLONE_VIDEO", "True").lower() == "true"
+CLONE_PREMIUM_VIDEO = getenv("CLONE_PREMIUM_VIDEO", "True").lower() == "true"
+CLONE_MAX_QUEUE = int(getenv("CLONE_MAX_QUEUE", 15))
+CLONE_PREMIUM_MAX_QUEUE = int(getenv("CLONE_PREMIUM_MAX_QUEUE", 50))
+# Downloads a clone runs at once, the rest wait their turn.
+CLONE_DOWNLOADS = int(getenv("CLONE_DOWNLOADS", 2))
+CLONE_PREMIUM_DOWNLOADS = int(getenv("CLONE_PREMIUM_DOWNLOADS", 5))
+CLONE_BROADCAST_RATE = float(getenv("CLONE_BROADCAST_RATE", 5))
+CLONE_PREMIUM_BROADCAST_RATE = float(getenv("CLONE_PREMIUM_BROADCAST_RATE", 15))
+# Seconds between supervisor health checks of running clones.
+CLONE_HEALTH_INTERVAL = int(getenv("CLONE_HEALTH_INTERVAL", 60))
+CLONE_PING_TIMEOUT = int(getenv("CLONE_PING_TIMEOUT", 15))
+# Failed pings in a row before a clone is restarted.
+CLONE_MAX_ERRORS = int(getenv("CLONE_MAX_ERRORS", 3))
+# First retry delay of a clone that failed to start, doubled up to the max.
+CLONE_RESTART_BACKOFF = int(getenv("CLONE_RESTART_BACKOFF", 30))
+CLONE_MAX_BACKOFF = int(getenv("CLONE_MAX_BACKOFF", 1800))
+
+# ====================================================
+# Multi-node Deployment
+# ====================================================
+# Unique name of this process; leases and shard ownership are keyed by it.
+NODE_ID = getenv("NODE_ID", None)
+# Seconds a node keeps a singleton job lease without renewing it.
+LEASE_TTL = int(getenv("LEASE_TTL", 15))
+# Seconds a node counts as alive after its last heartbeat, clones are
+# sharded across the live nodes.
+NODE_TTL = int(getenv("NODE_TTL", 30))
+# Seconds between two reconciliations of running clones with the registry.
+CLONE_SYNC_INTERVAL = int(getenv("CLONE_SYNC_INTERVAL", 5))
+
 # ====================================================
 # Emojis / Greetings
 # ====================================================